@@ -0,0 +1,90 @@
+"""Latência de digitação do editor SQL em documentos grandes.
+
+Mede o tempo de colar um script de migração grande e o de cada tecla
+digitada no meio dele (o realce só reanalisa as linhas afetadas).
+Executar a partir da raiz do projeto:
+
+    python benchmarks/highlighter_benchmark.py [linhas] [teclas]
+"""
+import os
+import sys
+from statistics import median, quantiles
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QTextEdit
+from PyQt6.QtGui import QTextCursor
+from sql_editor import SqlEditor
+from sql_highlighter import SqlHighlighter
+
+STATEMENTS = [
+    "CREATE TABLE pedido_{i} (id INT PRIMARY KEY, cliente_id INT NOT NULL, total NUMERIC(12, 2));",
+    "INSERT INTO pedido_{i} (id, cliente_id, total) VALUES ({i}, {i}, 10.5); -- carga inicial",
+    "/* índice para a busca por cliente */ CREATE INDEX ix_pedido_{i} ON pedido_{i} (cliente_id);",
+    "UPDATE pedido_{i} SET total = total * 1.1 WHERE cliente_id IN (SELECT id FROM cliente WHERE nome LIKE 'A%');",
+    "ALTER TABLE pedido_{i} ADD CONSTRAINT fk_pedido_{i} FOREIGN KEY (cliente_id) REFERENCES cliente (id);",
+]
+
+
+def migration_script(lines):
+    return "\n".join(STATEMENTS[i % len(STATEMENTS)].format(i=i) for i in range(lines))
+
+
+def time_paste(editor, script):
+    started = perf_counter()
+    editor.setPlainText(script)
+    QApplication.processEvents()
+    return perf_counter() - started
+
+
+def time_keystrokes(editor, line, text):
+    """Tempo de cada caractere inserido no início da linha (inclui o realce)"""
+    cursor = QTextCursor(editor.document().findBlockByNumber(line))
+    editor.setTextCursor(cursor)
+    times = []
+    for char in text:
+        started = perf_counter()
+        editor.insertPlainText(char)
+        QApplication.processEvents()
+        times.append(perf_counter() - started)
+    return times
+
+
+def report(name, times):
+    cuts = quantiles(times, n=20)
+    print(f"  {name}: mediana {median(times) * 1000:.2f} ms · p95 {cuts[18] * 1000:.2f} ms · "
+          f"máx {max(times) * 1000:.2f} ms")
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    keys = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    app = QApplication.instance() or QApplication([])
+    script = migration_script(lines)
+    typed = ("SELECT id, total FROM pedido_1 WHERE total > 100 " * (keys // 49 + 1))[:keys]
+
+    print(f"Script de {lines} linhas, {keys} teclas digitadas no meio do documento")
+    editor = SqlEditor()
+    editor.resize(900, 700)
+    editor.show()
+    print(f"  colar (QPlainTextEdit + realce): {time_paste(editor, script):.2f} s")
+    report("tecla", time_keystrokes(editor, lines // 2, typed))
+    # Abrir um comentário muda o estado de todas as linhas seguintes (pior caso)
+    report("abrir/fechar /* */", time_keystrokes(editor, lines // 2, "/*") + time_keystrokes(editor, lines // 2, "*/"))
+
+    # Referência: o QTextEdit usado antes, com o mesmo realce
+    old_editor = QTextEdit()
+    old_editor.setAcceptRichText(False)
+    highlighter = SqlHighlighter(old_editor.document())
+    old_editor.resize(900, 700)
+    old_editor.show()
+    print(f"  colar (QTextEdit + realce): {time_paste(old_editor, script):.2f} s")
+    report("tecla (QTextEdit)", time_keystrokes(old_editor, lines // 2, typed))
+    highlighter.setDocument(None)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
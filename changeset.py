@@ -0,0 +1,381 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPlainTextEdit, QDialogButtonBox
+from PyQt6.QtGui import QColor, QFont, QFontDatabase
+from PyQt6.QtCore import Qt, QModelIndex, pyqtSignal
+from sqlalchemy import and_, bindparam, delete, insert, literal, update
+from sqlalchemy import types as sqltypes
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BindParameter
+from result_model import ResultTableModel, format_value
+from result_store import NUMERIC_KINDS, kind_of
+
+# Linhas de cada lote exibidas com valores na pré-visualização do SQL
+PREVIEW_ROWS_PER_BATCH = 20
+
+DELETED_COLOR = QColor("#f8d7da")
+INSERTED_COLOR = QColor("#d4edda")
+MODIFIED_COLOR = QColor("#fff3cd")
+
+TRUE_TEXTS = ("1", "true", "t", "sim", "s", "yes", "y")
+FALSE_TEXTS = ("0", "false", "f", "não", "nao", "n", "no")
+
+
+#######################################################################
+# CONVERSÃO DO TEXTO DIGITADO
+#######################################################################
+
+def column_kind(column_type):
+    """Tipo lógico (o mesmo do ResultStore) de uma coluna refletida"""
+    if isinstance(column_type, sqltypes.JSON):
+        # O tipo JSON serializa o valor: o texto digitado precisa virar objeto antes
+        return "json"
+    try:
+        return kind_of(column_type.python_type)
+    except NotImplementedError:
+        return "text"
+
+
+def edit_text(value, kind=None):
+    """Texto colocado no editor da célula (sem formatação regional)"""
+    if value is None:
+        return "NULL"
+    if kind == "json":
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "0x" + bytes(value).hex()
+    return str(value)
+
+
+def parse_input(text, kind):
+    """Converte o texto digitado no valor nativo da coluna (ValueError se inválido)"""
+    if text == "NULL":
+        return None
+    text_value = text.strip()
+    if kind == "int":
+        return int(text_value)
+    if kind == "float":
+        return float(text_value.replace(",", "."))
+    if kind == "decimal":
+        try:
+            return Decimal(text_value.replace(",", "."))
+        except InvalidOperation:
+            raise ValueError(f"número inválido: {text}")
+    if kind == "bool":
+        if text_value.lower() in TRUE_TEXTS:
+            return True
+        if text_value.lower() in FALSE_TEXTS:
+            return False
+        raise ValueError(f"valor lógico inválido: {text}")
+    if kind == "datetime":
+        return datetime.fromisoformat(text_value)
+    if kind == "date":
+        return date.fromisoformat(text_value)
+    if kind == "time":
+        return time.fromisoformat(text_value)
+    if kind == "bytes":
+        return bytes.fromhex(text_value[2:] if text_value.lower().startswith("0x") else text_value)
+    if kind == "json":
+        try:
+            return json.loads(text_value)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}")
+    return text
+
+
+def with_values(statement, values):
+    """Cópia da instrução com os parâmetros trocados por literais (pré-visualização)"""
+    def replace(element):
+        if isinstance(element, BindParameter) and element.key in values:
+            return literal(values[element.key], element.type)
+        return None
+    return visitors.replacement_traverse(statement, {}, replace)
+
+
+#######################################################################
+# ALTERAÇÕES PENDENTES
+#######################################################################
+
+class Changeset:
+    """Alterações pendentes de uma tabela, identificadas pela chave primária.
+
+    Na gravação viram lotes executemany agrupados por instrução, todos
+    numa única transação.
+    """
+
+    def __init__(self, table, key_columns):
+        self.table = table
+        self.key_columns = list(key_columns)
+        self.updates = {}   # Chave -> {coluna: novo valor}
+        self.inserts = []   # Novas linhas {coluna: valor}
+        self.deletes = {}   # Chave -> None (mantém a ordem)
+        self.positions = {c.name: i for i, c in enumerate(table.columns)}
+
+    def __len__(self):
+        return sum(len(v) for v in self.updates.values()) + len(self.inserts) + len(self.deletes)
+
+    def set_value(self, key, column, value, original):
+        """Registra o novo valor de uma célula (voltar ao original desfaz a alteração)"""
+        pending = self.updates.setdefault(key, {})
+        if value == original and type(value) is type(original):
+            pending.pop(column, None)
+        else:
+            pending[column] = value
+        if not pending:
+            del self.updates[key]
+
+    def delete(self, key):
+        self.updates.pop(key, None)
+        self.deletes[key] = None
+
+    def key_params(self, key):
+        return {f"k{self.positions[c]}": v for c, v in zip(self.key_columns, key)}
+
+    def value_params(self, values):
+        return {f"v{self.positions[c]}": v for c, v in values.items()}
+
+    def statements(self):
+        """Lotes (instrução, lista de parâmetros) na ordem de execução: DELETE, UPDATE, INSERT"""
+        table = self.table
+        where = and_(*(table.c[c] == bindparam(f"k{self.positions[c]}") for c in self.key_columns))
+        batches = []
+        if self.deletes:
+            batches.append((delete(table).where(where), [self.key_params(k) for k in self.deletes]))
+
+        # Uma instrução por conjunto de colunas alteradas
+        groups = {}
+        for key, values in self.updates.items():
+            groups.setdefault(tuple(sorted(values, key=self.positions.get)), []).append(
+                {**self.key_params(key), **self.value_params(values)})
+        for columns, params in groups.items():
+            statement = update(table).where(where).values({c: bindparam(f"v{self.positions[c]}") for c in columns})
+            batches.append((statement, params))
+
+        groups = {}
+        for values in self.inserts:
+            filled = {c: v for c, v in values.items() if v is not None}
+            groups.setdefault(tuple(sorted(filled, key=self.positions.get)), []).append(self.value_params(filled))
+        for columns, params in groups.items():
+            statement = insert(table).values({c: bindparam(f"v{self.positions[c]}") for c in columns})
+            batches.append((statement, params))
+        return batches
+
+    def preview(self, dialect):
+        """SQL que será executado, com os valores das primeiras linhas de cada lote"""
+        lines = ["BEGIN;"]
+        for statement, params in self.statements():
+            lines.append(f"-- {len(params)} linhas (executemany):")
+            lines.append(f"{statement.compile(dialect=dialect)};")
+            for values in params[:PREVIEW_ROWS_PER_BATCH]:
+                try:
+                    rendered = with_values(statement, values).compile(dialect=dialect,
+                                                                      compile_kwargs={"literal_binds": True})
+                    lines.append(f"--   {rendered}")
+                except Exception:
+                    lines.append(f"--   {values}")
+            if len(params) > PREVIEW_ROWS_PER_BATCH:
+                lines.append(f"--   ... mais {len(params) - PREVIEW_ROWS_PER_BATCH} linhas")
+            lines.append("")
+        lines.append("COMMIT;")
+        return "\n".join(lines)
+
+    def apply(self, engine):
+        """Grava tudo numa transação; desfaz se uma linha mudou ou sumiu no servidor"""
+        with engine.begin() as conn:
+            for statement, params in self.statements():
+                result = conn.execute(statement, params)
+                if statement.is_insert:
+                    continue
+                reliable = (conn.dialect.supports_sane_multi_rowcount if len(params) > 1
+                            else conn.dialect.supports_sane_rowcount)
+                if reliable and result.rowcount >= 0 and result.rowcount != len(params):
+                    raise ValueError(f"{result.rowcount} de {len(params)} linhas encontradas: "
+                                     f"os dados foram alterados por outra sessão")
+
+
+#######################################################################
+# MODELO EDITÁVEL
+#######################################################################
+
+class EditableTableModel(ResultTableModel):
+    """ResultTableModel com modo de edição: as alterações ficam num Changeset
+    e são exibidas por cima dos valores carregados até serem gravadas."""
+
+    edit_error = pyqtSignal(str)
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.changeset = None    # Definido apenas no modo de edição
+        self.key_indexes = []
+        self.kinds = []
+
+    def set_store(self, store):
+        self.changeset = None
+        super().set_store(store)
+        self.changed.emit()
+
+    def start_editing(self, changeset, columns):
+        """Entra no modo de edição; `columns` são as colunas refletidas da tabela"""
+        self.beginResetModel()
+        self.changeset = changeset
+        names = [c["name"] for c in columns]
+        self.key_indexes = [names.index(c) for c in changeset.key_columns]
+        self.kinds = [column_kind(c["type"]) for c in columns]
+        self.endResetModel()
+        self.changed.emit()
+
+    def stop_editing(self):
+        self.beginResetModel()
+        self.changeset = None
+        self.endResetModel()
+        self.changed.emit()
+
+    def base_rows(self):
+        return self.store.row_count if self.store is not None else 0
+
+    def is_inserted(self, row):
+        return self.changeset is not None and row >= self.base_rows()
+
+    def row_key(self, row):
+        return tuple(self.native_value(row, i) for i in self.key_indexes)
+
+    def column_name(self, col):
+        return self.store.columns[col].name
+
+    def current_value(self, row, col):
+        """Valor exibido: pendente (se houver) ou o carregado"""
+        if self.is_inserted(row):
+            return self.changeset.inserts[row - self.base_rows()].get(self.column_name(col))
+        pending = self.changeset.updates.get(self.row_key(row), {}) if self.changeset else {}
+        if self.column_name(col) in pending:
+            return pending[self.column_name(col)]
+        return self.native_value(row, col)
+
+    def is_modified(self, row, col):
+        if self.changeset is None or self.is_inserted(row):
+            return False
+        return self.column_name(col) in self.changeset.updates.get(self.row_key(row), {})
+
+    def is_truncated(self, row, col):
+        """Células LOB lidas só em parte não podem ser editadas"""
+        sizes = self.store.lob_sizes.get(col)
+        if sizes is None or self.is_inserted(row):
+            return False
+        value = self.native_value(row, col)
+        if value is None:
+            return False
+        # Bytes nos binários, caracteres no texto (como lob_size)
+        return len(value) < sizes[self.store_row(row)]
+
+    def rowCount(self, parent=QModelIndex()):
+        rows = super().rowCount(parent)
+        if parent.isValid() or self.changeset is None:
+            return rows
+        return rows + len(self.changeset.inserts)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.changeset is None or not index.isValid() or self.is_truncated(index.row(), index.column()):
+            return flags
+        if not self.is_inserted(index.row()) and self.row_key(index.row()) in self.changeset.deletes:
+            return flags
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if self.changeset is None or not index.isValid():
+            return super().data(index, role)
+        row, col = index.row(), index.column()
+        inserted = self.is_inserted(row)
+        deleted = not inserted and self.row_key(row) in self.changeset.deletes
+        modified = self.is_modified(row, col)
+
+        if role == Qt.ItemDataRole.EditRole:
+            return edit_text(self.current_value(row, col), self.kinds[col])
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if deleted:
+                return DELETED_COLOR
+            if inserted:
+                return INSERTED_COLOR
+            return MODIFIED_COLOR if modified else None
+        if role == Qt.ItemDataRole.FontRole and deleted:
+            font = QFont()
+            font.setStrikeOut(True)
+            return font
+        if not inserted and not modified:
+            return super().data(index, role)
+
+        value = self.current_value(row, col)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_value(value, self.kinds[col], self.locale)
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.kinds[col] in NUMERIC_KINDS:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role == Qt.ItemDataRole.ForegroundRole and value is None:
+            return QColor(Qt.GlobalColor.gray)
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not self.flags(index) & Qt.ItemFlag.ItemIsEditable:
+            return False
+        row, col = index.row(), index.column()
+        try:
+            native = parse_input(value, self.kinds[col])
+        except ValueError as e:
+            self.edit_error.emit(f"{self.column_name(col)}: {e}")
+            return False
+
+        if self.is_inserted(row):
+            self.changeset.inserts[row - self.base_rows()][self.column_name(col)] = native
+        else:
+            self.changeset.set_value(self.row_key(row), self.column_name(col), native,
+                                     self.native_value(row, col))
+        self.dataChanged.emit(index, index)
+        self.changed.emit()
+        return True
+
+    def insert_row(self):
+        """Adiciona uma nova linha vazia ao fim; retorna a posição"""
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.changeset.inserts.append({})
+        self.endInsertRows()
+        self.changed.emit()
+        return row
+
+    def delete_rows(self, rows):
+        """Marca as linhas para exclusão (linhas novas são simplesmente removidas)"""
+        for row in sorted(set(rows), reverse=True):
+            if self.is_inserted(row):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.changeset.inserts[row - self.base_rows()]
+                self.endRemoveRows()
+            else:
+                self.changeset.delete(self.row_key(row))
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        self.changed.emit()
+
+
+class ChangesetPreviewDialog(QDialog):
+    """Mostra o SQL das alterações pendentes e pede confirmação para gravar"""
+
+    def __init__(self, sql, count, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Salvar Alterações")
+        self.resize(760, 480)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"{count} alterações serão gravadas numa única transação:"))
+        preview = QPlainTextEdit(readOnly=True)
+        preview.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        preview.setPlainText(sql)
+        layout.addWidget(preview, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, Qt
+from sqlalchemy import types as sqltypes
+
+# Linhas medidas por amostra (início do resultado, área visível e cada bloco novo)
+SAMPLE_ROWS = 100
+# Limites de largura das colunas em pixels
+MIN_WIDTH = 40
+MAX_WIDTH = 400
+# Espaço extra para margens e indicador de ordenação
+PADDING = 24
+# Chaves (tabelas/consultas) com larguras guardadas; as menos usadas saem primeiro
+WIDTH_CACHE_SIZE = 64
+
+# Larguras típicas (em caracteres) por tipo refletido
+TYPE_WIDTHS = [
+    (sqltypes.Boolean, 5),
+    (sqltypes.SmallInteger, 6),
+    (sqltypes.BigInteger, 20),
+    (sqltypes.Integer, 11),
+    (sqltypes.DateTime, 19),
+    (sqltypes.Date, 10),
+    (sqltypes.Time, 8),
+    (sqltypes.Uuid, 36),
+    (sqltypes.Float, 15),
+]
+
+
+def type_width_chars(column_type):
+    """Largura estimada em caracteres a partir do tipo da coluna"""
+    for type_class, chars in TYPE_WIDTHS:
+        if isinstance(column_type, type_class):
+            return chars
+    if isinstance(column_type, sqltypes.Numeric):
+        return (getattr(column_type, "precision", None) or 12) + 2
+    length = getattr(column_type, "length", None)
+    if isinstance(column_type, sqltypes.String) and length:
+        return min(length, 40)
+    return 0
+
+
+class ColumnWidthEstimator(QObject):
+    """Dimensiona as colunas de uma grade medindo apenas uma amostra das linhas.
+
+    As larguras ficam em cache (LRU) por chave (tabela ou consulta) e só
+    crescem conforme novos blocos de linhas chegam ao modelo.
+    """
+
+    def __init__(self, view, sample_rows=SAMPLE_ROWS, cache_size=WIDTH_CACHE_SIZE):
+        super().__init__(view)
+        self.view = view
+        self.sample_rows = sample_rows
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.key = None
+        self.widths = []
+        self.applying = False
+        view.model().rowsInserted.connect(self.on_rows_inserted)
+        view.horizontalHeader().sectionResized.connect(self.on_section_resized)
+
+    def fit(self, key=None, column_types=None):
+        """Calcula (ou reaproveita do cache) as larguras do resultado atual"""
+        model = self.view.model()
+        self.key = key
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None and len(cached) == model.columnCount():
+            self.widths = list(cached)
+        else:
+            metrics = self.view.fontMetrics()
+            self.widths = []
+            for col in range(model.columnCount()):
+                header = str(model.headerData(col, Qt.Orientation.Horizontal))
+                width = metrics.horizontalAdvance(header)
+                if column_types:
+                    width = max(width, metrics.horizontalAdvance("0" * type_width_chars(column_types[col])))
+                self.widths.append(width + PADDING)
+            self.measure_rows(self.sample_range())
+        self.apply()
+
+    def sample_range(self):
+        """Linhas amostradas: as primeiras N e as que estão visíveis"""
+        rows = set(range(min(self.sample_rows, self.view.model().rowCount())))
+        first = self.view.rowAt(0)
+        if first >= 0:
+            last = self.view.rowAt(self.view.viewport().height() - 1)
+            last = self.view.model().rowCount() - 1 if last < 0 else last
+            rows.update(range(first, min(last + 1, first + self.sample_rows)))
+        return sorted(rows)
+
+    def measure_rows(self, rows):
+        """Alarga as colunas conforme o texto exibido nas linhas informadas"""
+        model = self.view.model()
+        metrics = self.view.fontMetrics()
+        changed = False
+        for col in range(len(self.widths)):
+            widest = max((metrics.horizontalAdvance(model.data(model.index(row, col)) or "")
+                          for row in rows), default=0) + PADDING
+            widest = max(MIN_WIDTH, min(widest, MAX_WIDTH))
+            if widest > self.widths[col]:
+                self.widths[col] = widest
+                changed = True
+        return changed
+
+    def apply(self):
+        """Aplica as larguras na grade e atualiza o cache"""
+        self.applying = True
+        header = self.view.horizontalHeader()
+        for col, width in enumerate(self.widths):
+            header.resizeSection(col, max(MIN_WIDTH, min(width, MAX_WIDTH)))
+        self.applying = False
+        self.remember()
+
+    def on_rows_inserted(self, parent, first, last):
+        """Bloco novo no modelo: mede só uma amostra das linhas recebidas"""
+        if not self.widths or len(self.widths) != self.view.model().columnCount():
+            return
+        if self.measure_rows(range(first, min(last + 1, first + self.sample_rows))):
+            self.apply()
+
+    def on_section_resized(self, col, old_width, new_width):
+        """Mantém no cache as larguras ajustadas manualmente pelo usuário"""
+        if self.applying or col >= len(self.widths):
+            return
+        self.widths[col] = new_width
+        self.remember()
+
+    def remember(self):
+        """Guarda as larguras atuais no cache da chave, descartando as menos usadas"""
+        if self.key is None:
+            return
+        self.cache[self.key] = list(self.widths)
+        self.cache.move_to_end(self.key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
@@ -0,0 +1,145 @@
+import re
+from contextlib import ExitStack
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import DBAPIError
+from workers import start_worker
+
+# Driver e parâmetros extras de cada tipo de banco
+DRIVERS = {
+    "PostgreSQL": ("postgresql+psycopg2", {}),
+    "SQL Server": ("mssql+pyodbc", {"driver": "ODBC Driver 17 for SQL Server"}),
+    "MySQL": ("mysql+pymysql", {}),
+}
+
+# Conexões mais antigas que isso são recriadas pelo pool (segundos), antes
+# que firewalls descartem a sessão TCP ociosa
+POOL_RECYCLE_SECONDS = 1800
+# Intervalo do keep-alive das conexões ociosas (segundos)
+KEEPALIVE_INTERVAL = 240
+
+# Comandos que podem ser repetidos com segurança após uma queda de conexão
+READ_ONLY_KEYWORDS = ("select", "with", "show", "explain", "values", "describe", "desc")
+WRITE_KEYWORDS = re.compile(r"\b(insert|update|delete|merge|into|create|alter|drop|truncate|grant|revoke|"
+                            r"exec|execute|call|lock|for\s+update|nextval|setval)\b", re.IGNORECASE)
+
+
+def connection_url(db_type, host, port, db_name, username, password):
+    """Monta a URL de conexão (caracteres especiais na senha são escapados)"""
+    drivername, query = DRIVERS[db_type]
+    return URL.create(drivername, username=username or None, password=password or None,
+                      host=host or None, port=int(port) if port else None,
+                      database=db_name or None, query=query)
+
+
+def create_db_engine(db_type, host, port, db_name, username, password):
+    """Cria o engine SQLAlchemy para os parâmetros informados.
+
+    O pool testa a conexão antes de entregá-la (pre-ping) e recicla as
+    antigas, então sessões derrubadas enquanto ociosas são refeitas sem erro.
+    """
+    return create_engine(connection_url(db_type, host, port, db_name, username, password),
+                         pool_pre_ping=True, pool_recycle=POOL_RECYCLE_SECONDS)
+
+
+def favorite_password(favorite, crypto):
+    """Senha do favorito decriptografada (vazia se ausente ou inválida)"""
+    if not favorite.get("password"):
+        return ""
+    try:
+        return crypto.decrypt(favorite["password"])
+    except Exception:
+        return ""
+
+
+def favorite_engine(favorite, crypto):
+    """Cria o engine de um favorito salvo"""
+    return create_db_engine(favorite["db_type"], favorite["host"], favorite["port"], favorite["db_name"],
+                            favorite["username"], favorite_password(favorite, crypto))
+
+
+def dispose_after(generator, *engines):
+    """Repassa um gerador de trabalho e libera os engines quando ele termina,
+    falha ou é cancelado (os pools não ficam com conexões abertas)"""
+    try:
+        return (yield from generator)
+    finally:
+        for engine in engines:
+            engine.dispose()
+
+
+#######################################################################
+# RECONEXÃO E KEEP-ALIVE
+#######################################################################
+
+def is_read_only_sql(sql):
+    """Indica se o comando só lê dados (pode ser repetido após reconectar)"""
+    words = sql.lstrip("( \n\t").split(None, 1)
+    if not words or words[0].lower() not in READ_ONLY_KEYWORDS:
+        return False
+    # SELECT INTO, CTEs com DML, SELECT FOR UPDATE, sequências...
+    return WRITE_KEYWORDS.search(sql) is None
+
+
+def run_with_reconnect(fn, retry):
+    """Executa `fn`; se a conexão caiu durante a execução e `retry` for verdadeiro,
+    executa de novo numa conexão nova. Retorna (resultado, reconectou)."""
+    try:
+        return fn(), False
+    except DBAPIError as e:
+        # O SQLAlchemy invalida o pool ao detectar a desconexão
+        if not retry or not e.connection_invalidated:
+            raise
+    return fn(), True
+
+
+def ping_idle_connections(engine):
+    """Usa cada conexão ociosa do pool com um SELECT 1 (mantém a sessão TCP ativa)"""
+    with ExitStack() as stack:
+        connections = [stack.enter_context(engine.connect()) for _ in range(max(1, engine.pool.checkedin()))]
+        for conn in connections:
+            conn.exec_driver_sql("SELECT 1")
+    return len(connections)
+
+
+class ConnectionKeepAlive(QObject):
+    """Envia o keep-alive periodicamente numa thread de trabalho"""
+
+    failed = pyqtSignal(object)   # Exceção do último keep-alive
+    restored = pyqtSignal()       # Keep-alive voltou a funcionar após falha
+
+    def __init__(self, interval=KEEPALIVE_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.engine = None
+        self.worker = None
+        self.failing = False
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval * 1000)
+        self.timer.timeout.connect(self.ping)
+
+    def set_engine(self, engine):
+        """Troca o engine mantido vivo (None desliga)"""
+        self.engine = engine
+        self.failing = False
+        if engine is None:
+            self.timer.stop()
+        else:
+            self.timer.start()
+
+    def ping(self):
+        if self.engine is None or self.worker is not None:
+            return
+        self.worker = start_worker(ping_idle_connections, self.engine,
+                                   on_finished=self.on_finished, on_error=self.on_error)
+
+    def on_finished(self, _):
+        self.worker = None
+        if self.failing:
+            self.failing = False
+            self.restored.emit()
+
+    def on_error(self, error):
+        self.worker = None
+        self.failing = True
+        self.failed.emit(error)
@@ -0,0 +1,283 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton,
+                             QTreeWidget, QTreeWidgetItem, QMessageBox)
+from PyQt6.QtGui import QColor
+from sqlalchemy import text, inspect
+from connection import dispose_after, favorite_engine
+from workers import start_worker
+
+# Faixas iniciais da chave, subdivisões de uma faixa divergente e
+# linhas a partir das quais a faixa é subdividida em vez de lida
+INITIAL_CHUNKS = 64
+SPLIT_FACTOR = 16
+ROW_FETCH_LIMIT = 500
+DIFF_WORKERS = 4
+# Diferenças exibidas no máximo (a contagem continua)
+MAX_REPORTED_ROWS = 10000
+
+ONLY_SOURCE = "somente na origem"
+ONLY_TARGET = "somente no destino"
+CHANGED = "diferente"
+DIFF_COLORS = {ONLY_SOURCE: QColor("darkgreen"), ONLY_TARGET: QColor("red"), CHANGED: QColor("darkorange")}
+
+
+#######################################################################
+# HASH POR FAIXA DA CHAVE
+#######################################################################
+
+def chunk_hash_query(dialect_name, table, key, columns):
+    """SELECT com a contagem e o hash das linhas de uma faixa, calculados no servidor.
+
+    Retorna None para dialetos sem função de agregação adequada (hash local).
+    """
+    where = f"WHERE {key} >= :lo AND {key} < :hi"
+    if dialect_name == "postgresql":
+        return (f"SELECT count(*), md5(string_agg(md5(ROW({', '.join(columns)})::text), '' ORDER BY {key})) "
+                f"FROM {table} {where}")
+    if dialect_name == "mssql":
+        return f"SELECT COUNT(*), CHECKSUM_AGG(BINARY_CHECKSUM({', '.join(columns)})) FROM {table} {where}"
+    if dialect_name == "mysql":
+        # ISNULL() diferencia NULL de texto vazio (CONCAT_WS ignora NULLs)
+        parts = ", ".join(f"{c}, ISNULL({c})" for c in columns)
+        return f"SELECT COUNT(*), BIT_XOR(CRC32(CONCAT_WS('|', {parts}))) FROM {table} {where}"
+    return None
+
+
+class TableSide:
+    """Uma das tabelas comparadas: engine, nomes já citados e consultas"""
+
+    def __init__(self, engine, table_name, column_names, key):
+        quote = engine.dialect.identifier_preparer.quote
+        self.engine = engine
+        self.table = quote(table_name)
+        self.key = quote(key)
+        self.columns = [quote(c) for c in column_names]
+        self.hash_query = chunk_hash_query(engine.dialect.name, self.table, self.key, self.columns)
+        self.rows_query = (f"SELECT {', '.join(self.columns)} FROM {self.table} "
+                           f"WHERE {self.key} >= :lo AND {self.key} < :hi ORDER BY {self.key}")
+
+    def key_range(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text(f"SELECT MIN({self.key}), MAX({self.key}) FROM {self.table}")).first()
+
+    def chunk_hash(self, lo, hi):
+        """(contagem, hash) das linhas com chave em [lo, hi)"""
+        with self.engine.connect() as conn:
+            if self.hash_query is not None:
+                count, digest = conn.execute(text(self.hash_query), {"lo": lo, "hi": hi}).first()
+                return count, str(digest) if digest is not None else None
+            # Sem agregação no servidor: hash calculado localmente
+            digest, count = hashlib.md5(), 0
+            for row in conn.execute(text(self.rows_query), {"lo": lo, "hi": hi}):
+                digest.update(repr(tuple(row)).encode("utf-8"))
+                count += 1
+            return count, digest.hexdigest() if count else None
+
+    def rows(self, lo, hi):
+        """Linhas da faixa indexadas pela chave (primeira coluna)"""
+        with self.engine.connect() as conn:
+            return {row[0]: tuple(row) for row in conn.execute(text(self.rows_query), {"lo": lo, "hi": hi})}
+
+
+def integer_key(engine, table_name):
+    """Chave primária inteira de uma coluna, exigida para dividir a tabela em faixas"""
+    inspector = inspect(engine)
+    key = inspector.get_pk_constraint(table_name).get("constrained_columns") or []
+    columns = inspector.get_columns(table_name)
+    types = {c["name"]: c["type"] for c in columns}
+    if len(key) != 1:
+        raise ValueError(f"{table_name}: a comparação exige chave primária de uma única coluna")
+    try:
+        is_integer = types[key[0]].python_type is int
+    except NotImplementedError:
+        is_integer = False
+    if not is_integer:
+        raise ValueError(f"{table_name}: a chave primária {key[0]} não é inteira")
+    return key[0], [c["name"] for c in columns]
+
+
+def split_range(lo, hi, parts):
+    """Divide [lo, hi) em até `parts` faixas contíguas"""
+    step = max(1, -(-(hi - lo) // parts))
+    return [(start, min(start + step, hi)) for start in range(lo, hi, step)]
+
+
+def diff_rows(source_rows, target_rows):
+    """Compara as linhas de uma faixa pela chave"""
+    differences = []
+    for key in sorted(source_rows.keys() | target_rows.keys()):
+        a, b = source_rows.get(key), target_rows.get(key)
+        if b is None:
+            differences.append((ONLY_SOURCE, key, a, None))
+        elif a is None:
+            differences.append((ONLY_TARGET, key, None, b))
+        elif a != b:
+            differences.append((CHANGED, key, a, b))
+    return differences
+
+
+def compare_tables(source_engine, target_engine, source_table, target_table=None):
+    """Compara os dados de duas tabelas por hashes de faixas da chave primária.
+
+    Só as faixas com hash diferente são subdivididas, e só faixas pequenas
+    são lidas linha a linha. Gerador: produz dicionários de progresso com
+    as diferenças encontradas; retorna o resumo final.
+    """
+    target_table = target_table or source_table
+    if source_engine.dialect.name != target_engine.dialect.name:
+        raise ValueError("Os hashes só são comparáveis entre bancos do mesmo tipo")
+    key, source_columns = integer_key(source_engine, source_table)
+    target_key, target_columns = integer_key(target_engine, target_table)
+    if key != target_key:
+        raise ValueError(f"Chaves primárias diferentes: {key} e {target_key}")
+    columns = [key] + [c for c in source_columns if c in target_columns and c != key]
+    source = TableSide(source_engine, source_table, columns, key)
+    target = TableSide(target_engine, target_table, columns, key)
+
+    bounds = [b for b in (*source.key_range(), *target.key_range()) if b is not None]
+    summary = {"columns": columns, "hash_queries": 0, "rows_fetched": 0, "differences": 0,
+               "ignored_columns": sorted(set(source_columns) ^ set(target_columns))}
+    if not bounds:
+        return summary
+
+    # Os dois lados de cada faixa são consultados ao mesmo tempo
+    sides = ThreadPoolExecutor(max_workers=2 * DIFF_WORKERS)
+
+    def compare_chunk(lo, hi):
+        a, b = sides.submit(source.chunk_hash, lo, hi), sides.submit(target.chunk_hash, lo, hi)
+        (count_a, hash_a), (count_b, hash_b) = a.result(), b.result()
+        if count_a == count_b and hash_a == hash_b:
+            return lo, hi, None
+        if max(count_a, count_b) <= ROW_FETCH_LIMIT or hi - lo <= 1:
+            source_rows, target_rows = source.rows(lo, hi), target.rows(lo, hi)
+            return lo, hi, (len(source_rows) + len(target_rows), diff_rows(source_rows, target_rows))
+        return lo, hi, split_range(lo, hi, SPLIT_FACTOR)
+
+    lo, hi = min(bounds), max(bounds) + 1
+    pool = ThreadPoolExecutor(max_workers=DIFF_WORKERS)
+    try:
+        pending = {pool.submit(compare_chunk, a, b) for a, b in split_range(lo, hi, INITIAL_CHUNKS)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_lo, chunk_hi, outcome = future.result()
+                summary["hash_queries"] += 2
+                differences = []
+                if isinstance(outcome, list):
+                    pending |= {pool.submit(compare_chunk, a, b) for a, b in outcome}
+                elif outcome is not None:
+                    fetched, differences = outcome
+                    summary["rows_fetched"] += fetched
+                    summary["differences"] += len(differences)
+                yield {"range": (chunk_lo, chunk_hi), "pending": len(pending), "columns": columns,
+                       "differences": differences, "hash_queries": summary["hash_queries"],
+                       "rows_fetched": summary["rows_fetched"]}
+    finally:
+        # Cancelamento: descarta as faixas que ainda não começaram
+        pool.shutdown(cancel_futures=True)
+        sides.shutdown(cancel_futures=True)
+    return summary
+
+
+#######################################################################
+# DIÁLOGO
+#######################################################################
+
+class DataDiffDialog(QDialog):
+    """Compara os dados de uma tabela da conexão atual com a de um favorito"""
+
+    def __init__(self, engine, table_name, favorites, crypto, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Comparar Dados - {table_name}")
+        self.resize(900, 600)
+        self.engine = engine
+        self.table_name = table_name
+        self.favorites = favorites
+        self.crypto = crypto
+        self.worker = None
+        self.columns = []
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Destino:"))
+        self.target_combo = QComboBox()
+        self.target_combo.addItems([f"{f['name']} ({f['db_type']} - {f['host']}/{f['db_name']})" for f in favorites])
+        top_layout.addWidget(self.target_combo, 1)
+        top_layout.addWidget(QLabel("Tabela:"))
+        self.target_table = QLineEdit(table_name)
+        top_layout.addWidget(self.target_table)
+        self.compare_btn = QPushButton("Comparar")
+        self.compare_btn.clicked.connect(self.compare)
+        top_layout.addWidget(self.compare_btn)
+        layout.addLayout(top_layout)
+
+        self.status = QLabel(f"Origem: {table_name} na conexão atual")
+        layout.addWidget(self.status)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Chave", "Diferença", "Colunas", "Origem", "Destino"])
+        self.tree.setColumnWidth(1, 140)
+        self.tree.setColumnWidth(2, 160)
+        self.tree.setColumnWidth(3, 220)
+        layout.addWidget(self.tree, 1)
+
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        layout.addWidget(close_btn)
+
+    def compare(self):
+        """Compara as tabelas numa thread de trabalho"""
+        if not self.favorites:
+            QMessageBox.warning(self, "Aviso", "Cadastre o banco de destino como favorito.")
+            return
+        try:
+            target = favorite_engine(self.favorites[self.target_combo.currentIndex()], self.crypto)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível criar a conexão de destino:\n{str(e)}")
+            return
+        self.tree.clear()
+        self.reported = 0
+        self.compare_btn.setEnabled(False)
+        self.status.setText("Comparando...")
+        # O engine do destino é liberado ao fim da comparação (concluída, com erro ou cancelada)
+        comparison = compare_tables(self.engine, target, self.table_name,
+                                    self.target_table.text().strip() or self.table_name)
+        self.worker = start_worker(dispose_after, comparison, target,
+                                   on_progress=self.on_progress, on_finished=self.on_finished,
+                                   on_error=self.on_error)
+
+    def on_progress(self, progress):
+        self.status.setText(f"Comparando... {progress['hash_queries']} hashes, "
+                            f"{progress['rows_fetched']} linhas lidas, {progress['pending']} faixas pendentes")
+        for change, key, source_row, target_row in progress["differences"]:
+            if self.reported >= MAX_REPORTED_ROWS:
+                return
+            self.reported += 1
+            changed = ""
+            if change == CHANGED:
+                changed = ", ".join(name for name, a, b in zip(progress["columns"], source_row, target_row) if a != b)
+            item = QTreeWidgetItem([str(key), change, changed,
+                                    "" if source_row is None else str(source_row),
+                                    "" if target_row is None else str(target_row)])
+            item.setForeground(1, DIFF_COLORS[change])
+            self.tree.addTopLevelItem(item)
+
+    def on_finished(self, summary):
+        self.worker = None
+        self.compare_btn.setEnabled(True)
+        message = (f"{summary['differences']} linhas diferentes — {summary['hash_queries']} hashes, "
+                   f"{summary['rows_fetched']} linhas lidas")
+        if summary["ignored_columns"]:
+            message += f" (colunas ignoradas: {', '.join(summary['ignored_columns'])})"
+        self.status.setText(message)
+
+    def on_error(self, error):
+        self.worker = None
+        self.compare_btn.setEnabled(True)
+        self.status.setText(f"Erro ao comparar: {error}")
+
+    def done(self, result):
+        if self.worker:
+            self.worker.cancel()
+        super().done(result)
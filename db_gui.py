@@ -3,15 +3,19 @@ import json
 import os
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QLabel, QLineEdit, QPushButton, QTextEdit, QComboBox,
-                            QTableWidget, QTableWidgetItem, QMessageBox, QTabWidget, QHBoxLayout,
-                            QListWidget, QDialog, QFormLayout, QDialogButtonBox, QMenu)
+                            QLabel, QLineEdit, QPushButton, QComboBox,
+                            QMessageBox, QTabWidget, QHBoxLayout, QTabBar,
+                            QListWidget, QDialog, QMenu)
 from PyQt6.QtGui import QAction
 from PyQt6.QtCore import Qt
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from crypto import SimpleCrypto
 from addFavorite import AddFavoriteDialog
+from connection import create_db_engine
+from selection_stats import SelectionStatsLabel
+from schema_diff import SchemaDiffDialog
+from workspace import Workspace
 
 class DatabaseApp(QMainWindow):
     def __init__(self):
@@ -24,13 +28,12 @@ class DatabaseApp(QMainWindow):
         self.files_dir = Path(os.getcwd()) / "files"
         self.files_dir.mkdir(exist_ok=True)
         self.favorites_file = self.files_dir / "db_gui_favorites.json"
+        self.slow_log_file = self.files_dir / "slow_queries.log"
         
         # Inicialização de variáveis
         self.favorites = []
         self.crypto = SimpleCrypto()
         self.bd_list = ["PostgreSQL", "SQL Server", "MySQL"]
-        self.engine = None
-        self.current_db_type = None
         
         # Carrega favoritos e inicializa UI
         self.load_favorites()
@@ -47,15 +50,22 @@ class DatabaseApp(QMainWindow):
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
         
-        # Cria as abas principais
+        # Cria as abas principais; cada conexão aberta ganha uma aba própria (fechável)
         self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.tabCloseRequested.connect(self.close_workspace)
         layout.addWidget(self.tabs)
         
         # Configura cada uma das abas
         self.setup_connection_tab()    # Aba de conexão com o banco
-        self.setup_query_tab()        # Aba para execução de queries
-        self.setup_explorer_tab()     # Aba para explorar tabelas
         self.setup_favorites_tab()    # Aba de favoritos
+        for index in range(self.tabs.count()):
+            for side in (QTabBar.ButtonPosition.LeftSide, QTabBar.ButtonPosition.RightSide):
+                self.tabs.tabBar().setTabButton(index, side, None)
+        
+        # Barra de status com estatísticas da seleção nas grades
+        self.selection_stats = SelectionStatsLabel(self)
+        self.statusBar().addPermanentWidget(self.selection_stats)
 
     #######################################################################
     # SEÇÃO: ABA DE CONEXÃO
@@ -114,205 +124,35 @@ class DatabaseApp(QMainWindow):
         password = self.password_input.text()
         
         try:
-            # Cria a string de conexão de acordo com o tipo de banco
-            if db_type == "PostgreSQL":
-                connection_string = f"postgresql+psycopg2://{username}:{password}@{host}:{port}/{db_name}"
-            elif db_type == "SQL Server":
-                connection_string = f"mssql+pyodbc://{username}:{password}@{host}:{port}/{db_name}?driver=ODBC+Driver+17+for+SQL+Server"
-            elif db_type == "MySQL":
-                connection_string = f'mysql+pymysql://{username}:{password}@{host}:{port}/{db_name}'
-            
-            # Tenta estabelecer a conexão
-            self.engine = create_engine(connection_string)
-            with self.engine.connect() as conn:
+            # Cada conexão abre uma nova área de trabalho; as anteriores continuam abertas
+            engine = create_db_engine(db_type, host, port, db_name, username, password)
+            with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))  # Testa a conexão
-                
-            # Atualiza a interface com o status da conexão
-            self.current_db_type = db_type
-            self.connection_status.setText(f"Conectado a {db_type} - {db_name}")
-            self.connection_status.setStyleSheet("color: green;")
-            
-            # Habilita as abas que dependem da conexão
-            self.tabs.setTabEnabled(1, True)  # Aba de consulta
-            self.tabs.setTabEnabled(2, True)  # Aba de exploração
-            
-            # Carrega a lista de tabelas
-            self.load_tables_list()
-            
-        except SQLAlchemyError as e:
-            # Exibe mensagens de erro em caso de falha
+        except (SQLAlchemyError, ValueError) as e:
+            # Exibe mensagens de erro em caso de falha (inclui porta inválida)
             self.connection_status.setText(f"Erro de conexão: {str(e)}")
             self.connection_status.setStyleSheet("color: red;")
             QMessageBox.critical(self, "Erro de Conexão", f"Não foi possível conectar ao banco de dados:\n{str(e)}")
-
-    #######################################################################
-    # SEÇÃO: ABA DE CONSULTA SQL
-    #######################################################################
-    
-    def setup_query_tab(self):
-        """Configura a aba para execução de consultas SQL"""
-        query_tab = QWidget()
-        layout = QVBoxLayout(query_tab)
-        
-        # Editor de texto para escrever queries
-        self.sql_editor = QTextEdit(placeholderText="Digite sua consulta SQL aqui...")
-        layout.addWidget(self.sql_editor)
-        
-        # Botão para executar a consulta
-        execute_btn = QPushButton("Executar Consulta")
-        execute_btn.clicked.connect(self.execute_query)
-        layout.addWidget(execute_btn)
-        
-        # Tabela para exibir resultados
-        self.results_table = QTableWidget()
-        layout.addWidget(self.results_table)
-        
-        # Label para status da consulta
-        self.query_status = QLabel("")
-        layout.addWidget(self.query_status)
-        
-        self.tabs.addTab(query_tab, "Consulta SQL")
-        self.tabs.setTabEnabled(1, False)  # Inicialmente desabilitada
-
-    def execute_query(self):
-        """Executa a consulta SQL e exibe os resultados"""
-        # Verifica se há uma conexão ativa
-        if not self.engine:
-            QMessageBox.warning(self, "Aviso", "Conecte-se a um banco de dados primeiro!")
             return
         
-        query = self.sql_editor.toPlainText().strip()
-        
-        # Verifica se o usuário digitou algo
-        if not query:
-            QMessageBox.warning(self, "Aviso", "Digite uma consulta SQL!")
-            return
-        
-        try:
-            with self.engine.connect() as conn:
-                result = conn.execute(text(query))
-                
-                # Processa resultados para consultas SELECT
-                if query.lower().startswith("select"):
-                    rows = result.fetchall()
-                    columns = result.keys()
-                    
-                    # Configura a tabela de resultados
-                    self.results_table.setRowCount(len(rows))
-                    self.results_table.setColumnCount(len(columns))
-                    self.results_table.setHorizontalHeaderLabels(columns)
-                    
-                    # Preenche a tabela com os resultados
-                    for row_idx, row in enumerate(rows):
-                        for col_idx, col in enumerate(row):
-                            self.results_table.setItem(row_idx, col_idx, QTableWidgetItem(str(col)))
-                    
-                    self.query_status.setText(f"{len(rows)} linhas retornadas")
-                else:
-                    # Para outros tipos de comando (INSERT, UPDATE, etc)
-                    self.query_status.setText("Comando executado com sucesso")
-                    
-        except SQLAlchemyError as e:
-            # Tratamento de erros na consulta
-            self.query_status.setText(f"Erro na consulta: {str(e)}")
-            QMessageBox.critical(self, "Erro na Consulta", f"Erro ao executar a consulta:\n{str(e)}")
-
-    #######################################################################
-    # SEÇÃO: ABA DE EXPLORAÇÃO DE TABELAS
-    #######################################################################
-    
-    def setup_explorer_tab(self):
-        """Configura a aba para explorar tabelas do banco"""
-        explorer_tab = QWidget()
-        layout = QVBoxLayout(explorer_tab)
-        
-        # Layout superior com combobox e botão de atualização
-        top_layout = QHBoxLayout()
-        
-        self.tables_list = QComboBox()
-        self.tables_list.currentTextChanged.connect(self.load_table_data)
-        top_layout.addWidget(QLabel("Tabelas:"))
-        top_layout.addWidget(self.tables_list, 1)  # Stretch factor 1
+        workspace = Workspace(engine, db_type, self.favorites, self.crypto, self.slow_log_file)
+        self.selection_stats.watch(workspace.results_table)
+        self.selection_stats.watch(workspace.table_data)
+        self.tabs.setCurrentIndex(self.tabs.addTab(workspace, workspace.title))
+        workspace.load_tables_list()
         
-        refresh_btn = QPushButton("Atualizar")
-        refresh_btn.clicked.connect(self.load_tables_list)
-        top_layout.addWidget(refresh_btn)
-        
-        layout.addLayout(top_layout)
-        
-        # Tabela para exibir os dados
-        self.table_data = QTableWidget()
-        self.table_data.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        layout.addWidget(self.table_data, 1)  # Stretch factor 1
-        
-        self.tabs.addTab(explorer_tab, "Explorar")
-        self.tabs.setTabEnabled(2, False)  # Inicialmente desabilitada
-
-    def load_tables_list(self):
-        """Carrega a lista de tabelas do banco conectado"""
-        if not self.engine:
-            QMessageBox.warning(self, "Aviso", "Nenhuma conexão com banco de dados estabelecida")
-            return
-        
-        try:
-            inspector = inspect(self.engine)
-            tables = inspector.get_table_names()
-            
-            # Atualiza o combobox de tabelas
-            self.tables_list.blockSignals(True)  # Evita eventos durante atualização
-            self.tables_list.clear()
-            
-            if not tables:
-                self.tables_list.addItem("Nenhuma tabela encontrada")
-            else:
-                self.tables_list.addItems(tables)
-                if tables:
-                    self.load_table_data(tables[0])  # Carrega dados da primeira tabela
-            
-            self.tables_list.blockSignals(False)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Falha ao carregar tabelas:\n{str(e)}")
-            self.tables_list.clear()
-            self.tables_list.addItem("Erro ao carregar tabelas")
+        # Atualiza a interface com o status da conexão
+        self.connection_status.setText(f"Conectado a {db_type} - {db_name}")
+        self.connection_status.setStyleSheet("color: green;")
 
-    def load_table_data(self, table_name):
-        """Carrega os dados de uma tabela específica"""
-        # Verifica se há uma tabela válida selecionada
-        if (not table_name or not self.engine or 
-            table_name in ["Nenhuma tabela encontrada", "Erro ao carregar tabelas"]):
-            self.table_data.clear()
-            self.table_data.setRowCount(0)
-            self.table_data.setColumnCount(0)
+    def close_workspace(self, index):
+        """Fecha a aba de uma conexão e libera o engine"""
+        workspace = self.tabs.widget(index)
+        if not isinstance(workspace, Workspace) or not workspace.close_workspace():
             return
-        
-        try:
-            with self.engine.connect() as conn:
-                # Limita a 100 registros para demonstração
-                query = text(f'SELECT * FROM "{table_name}" LIMIT 100')
-                result = conn.execute(query)
-                
-                rows = result.fetchall()
-                columns = result.keys()
-                
-                # Configura a tabela de visualização
-                self.table_data.setRowCount(len(rows))
-                self.table_data.setColumnCount(len(columns))
-                self.table_data.setHorizontalHeaderLabels(columns)
-                
-                # Preenche a tabela com os dados
-                for row_idx, row in enumerate(rows):
-                    for col_idx, col in enumerate(row):
-                        item = QTableWidgetItem(str(col) if col is not None else "NULL")
-                        item.setFlags(item.flags() ^ Qt.ItemFlag.ItemIsEditable)  # Torna não editável
-                        self.table_data.setItem(row_idx, col_idx, item)
-                
-                # Ajusta o tamanho das colunas
-                self.table_data.resizeColumnsToContents()
-                
-        except SQLAlchemyError as e:
-            QMessageBox.critical(self, "Erro", f"Erro ao carregar dados da tabela {table_name}:\n{str(e)}")
-            self.table_data.clearContents()
+        self.selection_stats.clear()
+        self.tabs.removeTab(index)
+        workspace.deleteLater()
 
     #######################################################################
     # SEÇÃO: ABA DE FAVORITOS
@@ -342,11 +182,23 @@ class DatabaseApp(QMainWindow):
         remove_btn.clicked.connect(self.remove_favorite)
         btn_layout.addWidget(remove_btn)
         
+        compare_btn = QPushButton("Comparar Esquemas")
+        compare_btn.clicked.connect(self.show_schema_diff)
+        btn_layout.addWidget(compare_btn)
+        
         layout.addLayout(btn_layout)
         
         self.tabs.addTab(favorites_tab, "Favoritos")
         self.update_favorites_list()
 
+    def show_schema_diff(self):
+        """Compara o esquema de dois favoritos"""
+        if len(self.favorites) < 2:
+            QMessageBox.information(self, "Comparar Esquemas", "Cadastre pelo menos dois favoritos.")
+            return
+        dialog = SchemaDiffDialog(self.favorites, self.crypto, self)
+        dialog.exec()
+
     def setup_favorites_context_menu(self):
         """Configura o menu de contexto para os favoritos"""
         self.favorites_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -0,0 +1,138 @@
+from datetime import datetime
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QPlainTextEdit,
+                             QFileDialog, QMessageBox, QApplication)
+from PyQt6.QtGui import QFontDatabase
+from sqlalchemy import MetaData, ForeignKeyConstraint, UniqueConstraint, Index
+from sqlalchemy.dialects import postgresql, mssql, mysql
+from sqlalchemy.schema import CreateTable, CreateIndex, AddConstraint
+from reflection import iter_schema_batches, reflect_batch, plain_indexes, table_from_info, stub_table
+
+# Dialetos para os quais o DDL pode ser gerado
+DIALECTS = {
+    "PostgreSQL": postgresql.dialect,
+    "SQL Server": mssql.dialect,
+    "MySQL": mysql.dialect,
+}
+DIALECT_NAMES = {"postgresql": "PostgreSQL", "mssql": "SQL Server", "mysql": "MySQL"}
+
+
+def table_ddl(name, info, dialect):
+    """DDL de uma tabela refletida: (CREATE TABLE/INDEX, chaves estrangeiras em ALTER TABLE)"""
+    metadata = MetaData()
+    table = table_from_info(metadata, name, info)
+    for unique in info["unique_constraints"]:
+        table.append_constraint(UniqueConstraint(*unique["column_names"], name=unique.get("name")))
+    creates = [str(CreateTable(table).compile(dialect=dialect)).strip()]
+    for index in plain_indexes(info):
+        if None in index["column_names"]:
+            creates.append(f"-- Índice de expressão {index['name']} não incluído")
+            continue
+        creates.append(str(CreateIndex(Index(index["name"], *[table.c[c] for c in index["column_names"]],
+                                             unique=index.get("unique", False))).compile(dialect=dialect)))
+
+    # Chaves estrangeiras ficam para o fim do script (depois de todas as tabelas)
+    foreign_keys = []
+    for fk in info["foreign_keys"]:
+        stub_table(metadata, fk["referred_table"], fk["referred_columns"])
+        constraint = ForeignKeyConstraint(fk["constrained_columns"],
+                                          [f"{fk['referred_table']}.{c}" for c in fk["referred_columns"]],
+                                          name=fk.get("name"))
+        table.append_constraint(constraint)
+        foreign_keys.append(str(AddConstraint(constraint).compile(dialect=dialect)))
+    return creates, foreign_keys
+
+
+def script_table(engine, table_name, dialect):
+    """Script CREATE completo de uma única tabela"""
+    info = reflect_batch(engine, None, [table_name])[table_name]
+    creates, foreign_keys = table_ddl(table_name, info, dialect)
+    return "".join(f"{s};\n\n" if not s.startswith("--") else f"{s}\n\n" for s in creates + foreign_keys)
+
+
+def write_schema_ddl(engine, path, dialect, schema=None):
+    """Grava o DDL de todas as tabelas em arquivo, lote a lote, à medida que a
+    reflexão paralela termina (o script nunca fica inteiro na memória).
+
+    Gerador: produz (tabelas escritas, total); retorna o total escrito.
+    """
+    written, foreign_keys = 0, []
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"-- DDL de {engine.url.database or engine.url} para {dialect.name}\n")
+        f.write(f"-- Gerado em {datetime.now():%Y-%m-%d %H:%M:%S}\n\n")
+        for batch, total in iter_schema_batches(engine, schema):
+            for name in sorted(batch):
+                try:
+                    creates, table_fks = table_ddl(name, batch[name], dialect)
+                except Exception as e:
+                    f.write(f"-- {name}: não foi possível gerar o DDL ({e})\n\n")
+                    continue
+                for statement in creates:
+                    f.write(f"{statement}\n" if statement.startswith("--") else f"{statement};\n")
+                f.write("\n")
+                foreign_keys.extend(table_fks)
+            written += len(batch)
+            yield written, total
+
+        if foreign_keys:
+            f.write("-- Chaves estrangeiras\n")
+            for statement in foreign_keys:
+                f.write(f"{statement};\n")
+    return written
+
+
+class TableDdlDialog(QDialog):
+    """Mostra o script CREATE de uma tabela no dialeto escolhido"""
+
+    def __init__(self, engine, table_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"DDL - {table_name}")
+        self.resize(760, 520)
+        self.engine = engine
+        self.table_name = table_name
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Dialeto:"))
+        self.dialect_combo = QComboBox()
+        self.dialect_combo.addItems(DIALECTS.keys())
+        self.dialect_combo.setCurrentText(DIALECT_NAMES.get(engine.dialect.name, "PostgreSQL"))
+        self.dialect_combo.currentTextChanged.connect(self.generate)
+        top_layout.addWidget(self.dialect_combo)
+        top_layout.addStretch(1)
+        layout.addLayout(top_layout)
+
+        self.script = QPlainTextEdit(readOnly=True)
+        self.script.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.script, 1)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch(1)
+        copy_btn = QPushButton("Copiar")
+        copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(self.script.toPlainText()))
+        btn_layout.addWidget(copy_btn)
+        save_btn = QPushButton("Salvar")
+        save_btn.clicked.connect(self.save_script)
+        btn_layout.addWidget(save_btn)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+        self.generate()
+
+    def generate(self):
+        dialect = DIALECTS[self.dialect_combo.currentText()]()
+        try:
+            self.script.setPlainText(script_table(self.engine, self.table_name, dialect))
+        except Exception as e:
+            self.script.setPlainText(f"-- Não foi possível gerar o DDL: {e}")
+
+    def save_script(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar DDL", f"{self.table_name}.sql", "SQL (*.sql)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.script.toPlainText())
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível salvar o arquivo:\n{str(e)}")
@@ -0,0 +1,339 @@
+import json
+import re
+import xml.etree.ElementTree as ET
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton
+from PyQt6.QtGui import QFontDatabase
+from sqlalchemy import text, inspect, Index
+from sqlalchemy import types as sqltypes
+from sqlalchemy.schema import CreateIndex
+from lob_viewer import build_table
+from query_params import bind_parameters
+from workers import start_worker
+
+# Tabelas a partir deste número de linhas (estatística do catálogo) são analisadas
+LARGE_TABLE_ROWS = 10000
+# Máximo de colunas incluídas para tornar o índice de cobertura
+MAX_INCLUDE_COLUMNS = 4
+# Espaço livre deixado nas páginas do índice (fillfactor)
+FILL_FACTOR = 0.9
+# Custo fixo aproximado por entrada de índice (cabeçalho + ponteiro), em bytes
+INDEX_ENTRY_OVERHEAD = {"postgresql": 16, "mssql": 11, "mysql": 13}
+
+SSP_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+# Dialetos cujo EXPLAIN aceita os valores dos parâmetros :nome (o SHOWPLAN_XML do SQL Server não)
+BIND_DIALECTS = ("postgresql", "mysql")
+
+
+#######################################################################
+# LEITURA DOS PLANOS (EXPLAIN) POR DIALETO
+#######################################################################
+
+def identifiers(expression):
+    """Identificadores presentes numa expressão de filtro/saída do plano"""
+    return re.findall(r"[A-Za-z_][A-Za-z0-9_$]*", expression or "")
+
+
+def postgres_scans(conn, sql, values):
+    """Seq Scans do plano (EXPLAIN VERBOSE em JSON, sem executar a consulta)"""
+    plan = conn.execute(bind_parameters(f"EXPLAIN (FORMAT JSON, VERBOSE) {sql}", values)).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    scans = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan":
+            scans.append({
+                "schema": node.get("Schema"),
+                "table": node.get("Relation Name"),
+                "kind": "Seq Scan",
+                "rows": node.get("Plan Rows"),
+                "filter": node.get("Filter", ""),
+                "output": " ".join(node.get("Output", [])),
+            })
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return scans
+
+
+def mysql_scans(conn, sql, values):
+    """Acessos do tipo ALL/index (varredura completa) no EXPLAIN FORMAT=JSON"""
+    plan = json.loads(conn.execute(bind_parameters(f"EXPLAIN FORMAT=JSON {sql}", values)).scalar())
+    scans = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            table = node.get("table")
+            if isinstance(table, dict) and table.get("access_type") in ("ALL", "index"):
+                scans.append({
+                    "schema": None,
+                    "table": table.get("table_name"),
+                    "kind": "Full Table Scan" if table["access_type"] == "ALL" else "Full Index Scan",
+                    "rows": table.get("rows_examined_per_scan"),
+                    "filter": table.get("attached_condition", ""),
+                    "output": " ".join(table.get("used_columns", [])),
+                })
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    return scans
+
+
+def mssql_scans(conn, sql, values):
+    """Table/Clustered Index Scans e Key/RID Lookups do plano estimado (SHOWPLAN_XML)"""
+    conn.exec_driver_sql("SET SHOWPLAN_XML ON")
+    try:
+        plan = conn.exec_driver_sql(sql).scalar()
+    finally:
+        conn.exec_driver_sql("SET SHOWPLAN_XML OFF")
+    scans = []
+    for relop in ET.fromstring(plan).iter(f"{SSP_NS}RelOp"):
+        op = relop.get("PhysicalOp")
+        index_scan = relop.find(f"{SSP_NS}IndexScan")
+        lookup = index_scan is not None and index_scan.get("Lookup") == "1"
+        if op not in ("Table Scan", "Clustered Index Scan", "Index Scan") and not lookup:
+            continue
+        obj = relop.find(f".//{SSP_NS}Object")
+        if obj is None:
+            continue
+        predicate = relop.find(f".//{SSP_NS}Predicate")
+        filter_columns = [] if predicate is None else [
+            c.get("Column") for c in predicate.iter(f"{SSP_NS}ColumnReference") if c.get("Column")]
+        output = relop.find(f"{SSP_NS}OutputList")
+        output_columns = [] if output is None else [
+            c.get("Column") for c in output.iter(f"{SSP_NS}ColumnReference") if c.get("Column")]
+        scans.append({
+            "schema": (obj.get("Schema") or "").strip("[]") or None,
+            "table": (obj.get("Table") or "").strip("[]"),
+            "kind": "Key Lookup" if lookup else op,
+            "rows": float(relop.get("EstimateRows") or 0),
+            "filter": " ".join(filter_columns),
+            "output": " ".join(output_columns),
+        })
+    return scans
+
+
+PLAN_READERS = {
+    "postgresql": postgres_scans,
+    "mysql": mysql_scans,
+    "mssql": mssql_scans,
+}
+
+
+#######################################################################
+# ESTATÍSTICAS DO CATÁLOGO
+#######################################################################
+
+def table_row_count(conn, dialect_name, table, schema=None):
+    """Número estimado de linhas segundo as estatísticas do catálogo"""
+    qualified = f"{schema}.{table}" if schema else table
+    if dialect_name == "postgresql":
+        query = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"
+        return conn.execute(text(query), {"t": f'"{schema}"."{table}"' if schema else f'"{table}"'}).scalar() or 0
+    if dialect_name == "mssql":
+        query = ("SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+                 "WHERE object_id = OBJECT_ID(:t) AND index_id IN (0, 1)")
+        return conn.execute(text(query), {"t": qualified}).scalar() or 0
+    if dialect_name == "mysql":
+        query = ("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                 "WHERE TABLE_SCHEMA = COALESCE(:s, DATABASE()) AND TABLE_NAME = :t")
+        return conn.execute(text(query), {"s": schema, "t": table}).scalar() or 0
+    return 0
+
+
+def column_avg_widths(conn, dialect_name, table, schema=None):
+    """Largura média por coluna (bytes), quando o catálogo a fornece"""
+    if dialect_name == "postgresql":
+        query = ("SELECT attname, avg_width FROM pg_stats "
+                 "WHERE tablename = :t AND schemaname = COALESCE(:s, current_schema())")
+        return dict(conn.execute(text(query), {"t": table, "s": schema}).fetchall())
+    return {}
+
+
+def type_width(column_type):
+    """Largura aproximada (bytes) a partir do tipo refletido"""
+    if isinstance(column_type, (sqltypes.BigInteger, sqltypes.DateTime, sqltypes.Float)):
+        return 8
+    if isinstance(column_type, (sqltypes.Integer, sqltypes.Date)):
+        return 4
+    if isinstance(column_type, sqltypes.Boolean):
+        return 1
+    if isinstance(column_type, sqltypes.Numeric):
+        return 9
+    if isinstance(column_type, sqltypes.Uuid):
+        return 16
+    length = getattr(column_type, "length", None)
+    return min(length, 64) // 2 + 2 if length else 32
+
+
+#######################################################################
+# SUGESTÕES
+#######################################################################
+
+def match_columns(expression, columns):
+    """Colunas da tabela citadas na expressão, na ordem em que aparecem"""
+    by_lower = {c.lower(): c for c in columns}
+    found = []
+    for name in identifiers(expression):
+        column = by_lower.get(name.lower())
+        if column and column not in found:
+            found.append(column)
+    return found
+
+
+def key_columns(filter_expression, columns):
+    """Colunas-chave do índice: igualdades primeiro, depois faixas"""
+    matched = match_columns(filter_expression, columns)
+    equality = [c for c in matched
+                if re.search(rf"\b{re.escape(c)}\b[\])\"`]*(::[\w ]+?)?\)*\s*=(?!=)", filter_expression, re.IGNORECASE)]
+    return equality + [c for c in matched if c not in equality]
+
+
+def covered_by_existing(keys, indexes):
+    """True se algum índice existente já começa pelas colunas sugeridas"""
+    for index in indexes:
+        existing = [c for c in index.get("column_names", []) if c]
+        if existing[:len(keys)] == keys:
+            return True
+    return False
+
+
+def suggest_for_scan(engine, conn, scan, columns_cache):
+    """Monta a sugestão de índice (DDL + tamanho estimado) para uma varredura"""
+    dialect_name = engine.dialect.name
+    table, schema = scan["table"], scan["schema"]
+    cache_key = (schema, table)
+    if cache_key not in columns_cache:
+        inspector = inspect(conn)
+        pk = inspector.get_pk_constraint(table, schema=schema).get("constrained_columns") or []
+        columns_cache[cache_key] = {
+            "columns": inspector.get_columns(table, schema=schema),
+            "indexes": inspector.get_indexes(table, schema=schema) + ([{"column_names": pk}] if pk else []),
+            "rows": table_row_count(conn, dialect_name, table, schema),
+            "widths": column_avg_widths(conn, dialect_name, table, schema),
+        }
+    info = columns_cache[cache_key]
+    if info["rows"] < LARGE_TABLE_ROWS:
+        return None
+
+    names = [c["name"] for c in info["columns"]]
+    keys = key_columns(scan["filter"], names)
+    if scan["kind"] == "Key Lookup" and not keys:
+        # A busca já usa um índice: faltam as colunas lidas depois, na tabela base
+        missing = ", ".join(match_columns(scan["output"], names)[:MAX_INCLUDE_COLUMNS])
+        return {"scan": scan, "rows": info["rows"],
+                "note": f"inclua ({missing}) como INCLUDE no índice usado na busca para evitar o lookup"}
+    if not keys:
+        return {"scan": scan, "rows": info["rows"], "note": "varredura sem filtro: nenhum índice ajuda"}
+    include = [c for c in match_columns(scan["output"], names) if c not in keys][:MAX_INCLUDE_COLUMNS]
+    if covered_by_existing(keys, info["indexes"]):
+        return {"scan": scan, "rows": info["rows"],
+                "note": "já existe índice com essas colunas; verifique estatísticas/seletividade"}
+
+    # Sem INCLUDE no MySQL: as colunas de cobertura entram no fim da chave
+    if dialect_name == "mysql":
+        keys, include = keys + include, []
+
+    table_obj = build_table(table, info["columns"], schema=schema)
+    index_name = f"ix_{table}_{'_'.join(keys)}"[:60]
+    index = Index(index_name, *[table_obj.c[k] for k in keys],
+                  postgresql_include=include, mssql_include=include)
+    ddl = str(CreateIndex(index).compile(dialect=engine.dialect)).strip() + ";"
+
+    types = {c["name"]: c["type"] for c in info["columns"]}
+    entry = sum(info["widths"].get(c) or type_width(types[c]) for c in keys + include)
+    entry += INDEX_ENTRY_OVERHEAD.get(dialect_name, 16)
+    size = info["rows"] * entry / FILL_FACTOR
+    return {"scan": scan, "rows": info["rows"], "ddl": ddl, "size": size}
+
+
+def analyze_history(engine, statements):
+    """Gerador: faz EXPLAIN de cada consulta do histórico e produz as sugestões.
+
+    statements: pares (SQL, parâmetros) como executados na aba de consulta.
+    """
+    reader = PLAN_READERS.get(engine.dialect.name)
+    if reader is None:
+        raise ValueError(f"Análise de índices não suportada para {engine.dialect.name}")
+    columns_cache = {}
+    with engine.connect() as conn:
+        for sql, values in statements:
+            if values and engine.dialect.name not in BIND_DIALECTS:
+                yield {"sql": sql, "skipped": "consulta com parâmetros (o plano estimado não aceita valores)"}
+                continue
+            try:
+                scans = reader(conn, sql, values)
+            except Exception as e:
+                conn.rollback()
+                yield {"sql": sql, "error": str(e)}
+                continue
+            findings = [s for s in (suggest_for_scan(engine, conn, scan, columns_cache) for scan in scans) if s]
+            yield {"sql": sql, "findings": findings}
+
+
+def format_report_entry(entry):
+    """Texto do relatório para uma consulta analisada"""
+    lines = ["-- " + " ".join(entry["sql"].split())[:200]]
+    if "error" in entry:
+        lines.append(f"   Erro no EXPLAIN: {entry['error']}")
+    elif "skipped" in entry:
+        lines.append(f"   Ignorada: {entry['skipped']}")
+    elif not entry["findings"]:
+        lines.append("   Nenhuma varredura em tabela grande.")
+    for finding in entry.get("findings", []):
+        scan = finding["scan"]
+        lines.append(f"   {scan['kind']} em {scan['table']} (~{int(finding['rows']):,} linhas na tabela, "
+                     f"~{int(scan['rows'] or 0):,} estimadas no plano)")
+        if "ddl" in finding:
+            lines.append(f"   Sugestão (~{finding['size'] / 1024 / 1024:.1f} MB): {finding['ddl']}")
+        else:
+            lines.append(f"   Observação: {finding['note']}")
+    return "\n".join(lines) + "\n"
+
+
+class IndexAdvisorDialog(QDialog):
+    """Relatório de índices sugeridos a partir do histórico de consultas"""
+
+    def __init__(self, engine, statements, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sugestão de Índices")
+        self.resize(820, 560)
+
+        layout = QVBoxLayout(self)
+        self.status = QLabel(f"Analisando {len(statements)} consultas...")
+        layout.addWidget(self.status)
+        self.report = QPlainTextEdit(readOnly=True)
+        self.report.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.report, 1)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch(1)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+        self.suggestions = 0
+        self.worker = start_worker(analyze_history, engine, statements,
+                                   on_progress=self.add_entry,
+                                   on_finished=self.on_finished,
+                                   on_error=self.on_error)
+
+    def add_entry(self, entry):
+        self.suggestions += sum(1 for f in entry.get("findings", []) if "ddl" in f)
+        self.report.appendPlainText(format_report_entry(entry))
+
+    def on_finished(self, _):
+        self.status.setText(f"Análise concluída: {self.suggestions} índices sugeridos")
+
+    def on_error(self, error):
+        self.status.setText(f"Erro na análise: {error}")
+        self.status.setStyleSheet("color: red;")
+
+    def done(self, result):
+        self.worker.cancel()
+        super().done(result)
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from time import perf_counter
+from PyQt6.QtCore import QObject, pyqtSignal
+from sqlalchemy import event
+
+# Fases medidas, na ordem em que aparecem na linha de status
+PHASES = [
+    ("checkout", "conexão"),
+    ("execute", "execução"),
+    ("fetch", "rede"),
+    ("convert", "conversão"),
+    ("populate", "interface"),
+]
+# Quantidade de consultas mantidas para exportação
+MAX_TRACES = 500
+# Consultas a partir deste tempo vão para o log de consultas lentas
+SLOW_QUERY_MS = 1000
+
+
+class QueryTrace:
+    """Fases cronometradas de uma consulta"""
+
+    def __init__(self, label):
+        self.label = label
+        self.start = perf_counter()
+        self.end = None
+        self.thread_id = threading.get_ident()
+        self.spans = []    # (fase, início, duração, argumentos)
+        self.events = []   # (nome, instante) de eventos pontuais do pool
+        self.row_count = None
+
+    @contextmanager
+    def span(self, name, **args):
+        """Cronometra um trecho de código como uma fase da consulta"""
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, started, perf_counter() - started, args))
+
+    def mark(self, name):
+        self.events.append((name, perf_counter()))
+
+    def duration(self, name):
+        """Tempo total (segundos) gasto numa fase"""
+        return sum(span[2] for span in self.spans if span[0] == name)
+
+    def total(self):
+        return (self.end or perf_counter()) - self.start
+
+    def summary(self):
+        """Resumo para a linha de status: tempo por fase e total"""
+        parts = [f"{label} {self.duration(name) * 1000:.1f} ms"
+                 for name, label in PHASES if any(span[0] == name for span in self.spans)]
+        parts.append(f"total {self.total() * 1000:.1f} ms")
+        return " · ".join(parts)
+
+
+class QueryProfiler(QObject):
+    """Liga os eventos do SQLAlchemy (cursor e pool) à consulta em andamento"""
+
+    slow_query = pyqtSignal(object)  # QueryTrace acima do limite de consulta lenta
+
+    def __init__(self, slow_log_path=None, slow_query_ms=SLOW_QUERY_MS, max_traces=MAX_TRACES, parent=None):
+        super().__init__(parent)
+        self.slow_log_path = slow_log_path
+        self.slow_query_ms = slow_query_ms
+        self.traces = deque(maxlen=max_traces)
+        self.origin = perf_counter()
+        self.local = threading.local()
+        self.engines = []
+
+    def attach(self, engine):
+        """Registra os ganchos de instrumentação no engine e no seu pool"""
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+        event.listen(engine.pool, "connect", self.on_connect)
+        event.listen(engine.pool, "checkout", self.on_checkout)
+        event.listen(engine.pool, "checkin", self.on_checkin)
+        self.engines.append(engine)
+
+    def detach(self, engine):
+        """Remove os ganchos (ao trocar de conexão)"""
+        if engine not in self.engines:
+            return
+        event.remove(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self.after_cursor_execute)
+        event.remove(engine.pool, "connect", self.on_connect)
+        event.remove(engine.pool, "checkout", self.on_checkout)
+        event.remove(engine.pool, "checkin", self.on_checkin)
+        self.engines.remove(engine)
+
+    @property
+    def current(self):
+        """Consulta sendo cronometrada na thread atual (ou None)"""
+        return getattr(self.local, "trace", None)
+
+    @contextmanager
+    def trace(self, label):
+        """Abre o registro de uma consulta; eventos do engine nesta thread são associados a ela"""
+        trace = self.begin(label)
+        try:
+            with self.bind(trace):
+                yield trace
+        finally:
+            self.finish(trace)
+
+    def begin(self, label):
+        """Inicia o registro de uma consulta que passa por mais de uma thread
+        (executada numa thread de trabalho, exibida na da interface)"""
+        return QueryTrace(label)
+
+    @contextmanager
+    def bind(self, trace):
+        """Associa os eventos do engine na thread atual a uma consulta já iniciada"""
+        previous = self.current
+        self.local.trace = trace
+        trace.thread_id = threading.get_ident()
+        try:
+            yield trace
+        finally:
+            self.local.trace = previous
+
+    def finish(self, trace):
+        """Encerra o registro da consulta e verifica o limite de consulta lenta"""
+        trace.end = perf_counter()
+        self.traces.append(trace)
+        if trace.total() * 1000 >= self.slow_query_ms:
+            self.log_slow_query(trace)
+
+    def log_slow_query(self, trace):
+        """Registra a consulta lenta no arquivo de log (uma linha JSON por consulta)"""
+        self.slow_query.emit(trace)
+        if not self.slow_log_path:
+            return
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "total_ms": round(trace.total() * 1000, 1),
+            "phases_ms": {name: round(trace.duration(name) * 1000, 1) for name, _ in PHASES},
+            "rows": trace.row_count,
+            "sql": trace.label,
+        }
+        try:
+            with open(self.slow_log_path, "a") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Erro ao gravar log de consultas lentas: {e}")
+
+    #######################################################################
+    # GANCHOS DO SQLALCHEMY
+    #######################################################################
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        trace = self.current
+        if trace is not None:
+            trace.spans.append(("execute", started, perf_counter() - started, {"sql": statement[:500]}))
+
+    def on_connect(self, dbapi_connection, connection_record):
+        if self.current is not None:
+            self.current.mark("nova conexão física")
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        if self.current is not None:
+            self.current.mark("checkout do pool")
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        if self.current is not None:
+            self.current.mark("checkin no pool")
+
+    #######################################################################
+    # EXPORTAÇÃO
+    #######################################################################
+
+    def chrome_events(self):
+        """Eventos no formato Trace Event do Chrome (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+
+        def micros(instant):
+            return round((instant - self.origin) * 1_000_000, 1)
+
+        events = []
+        for trace in list(self.traces):
+            events.append({"name": trace.label[:80], "cat": "query", "ph": "X", "pid": pid,
+                           "tid": trace.thread_id, "ts": micros(trace.start),
+                           "dur": round(trace.total() * 1_000_000, 1),
+                           "args": {"sql": trace.label, "rows": trace.row_count}})
+            for name, started, duration, args in trace.spans:
+                events.append({"name": name, "cat": "phase", "ph": "X", "pid": pid,
+                               "tid": trace.thread_id, "ts": micros(started),
+                               "dur": round(duration * 1_000_000, 1), "args": args})
+            for name, instant in trace.events:
+                events.append({"name": name, "cat": "pool", "ph": "i", "s": "t", "pid": pid,
+                               "tid": trace.thread_id, "ts": micros(instant)})
+        return events
+
+    def export_chrome_trace(self, path):
+        """Grava as consultas registradas em um arquivo JSON de trace"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}, f)
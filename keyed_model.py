@@ -0,0 +1,99 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+def contiguous_runs(rows):
+    """Agrupa índices ordenados de forma decrescente em faixas (início, fim) contíguas"""
+    runs = []
+    for row in sorted(rows, reverse=True):
+        if runs and runs[-1][0] == row + 1:
+            runs[-1][0] = row
+        else:
+            runs.append([row, row])
+    return runs
+
+
+class KeyedTableModel(QAbstractTableModel):
+    """Modelo de linhas identificadas por chave, atualizado por diferença.
+
+    A cada atualização só são emitidos rowsRemoved, dataChanged e
+    rowsInserted do que mudou, sem reset do modelo (sem piscar e sem
+    realocar a grade inteira).
+    """
+
+    def __init__(self, key_columns=(0,), parent=None):
+        super().__init__(parent)
+        self.columns = []
+        self.rows = []
+        self.positions = {}  # Chave -> índice da linha
+        self.key_columns = tuple(key_columns)
+
+    def key(self, row):
+        return tuple(row[i] for i in self.key_columns)
+
+    def set_rows(self, columns, rows):
+        """Aplica a nova leitura comparando-a com a anterior pela chave"""
+        columns = list(columns)
+        if columns != self.columns:
+            # Estrutura diferente: não há o que comparar
+            self.beginResetModel()
+            self.columns = columns
+            self.rows = list({self.key(r): tuple(r) for r in rows}.values())
+            self.positions = {self.key(r): i for i, r in enumerate(self.rows)}
+            self.endResetModel()
+            return
+
+        new_rows = {}
+        for row in rows:
+            new_rows[self.key(row)] = tuple(row)
+
+        # 1. Remove as linhas que sumiram (de baixo para cima, em faixas)
+        removed = [i for i, row in enumerate(self.rows) if self.key(row) not in new_rows]
+        for first, last in contiguous_runs(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.rows[first:last + 1]
+            self.endRemoveRows()
+        if removed:
+            self.positions = {self.key(r): i for i, r in enumerate(self.rows)}
+
+        # 2. Atualiza só as células alteradas
+        for i, old in enumerate(self.rows):
+            new = new_rows.pop(self.key(old))
+            if new != old:
+                changed = [c for c, (a, b) in enumerate(zip(old, new)) if a != b]
+                self.rows[i] = new
+                self.dataChanged.emit(self.index(i, changed[0]), self.index(i, changed[-1]))
+
+        # 3. Acrescenta as novas linhas no fim
+        if new_rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            for key, row in new_rows.items():
+                self.positions[key] = len(self.rows)
+                self.rows.append(row)
+            self.endInsertRows()
+
+    def row_values(self, row):
+        return self.rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self.rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(value, float):
+                return f"{value:.1f}"
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section]
+        return None
@@ -0,0 +1,248 @@
+import json
+from array import array
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QPlainTextEdit, QTabWidget, QScrollArea, QFileDialog, QMessageBox)
+from PyQt6.QtGui import QPixmap, QFontDatabase
+from PyQt6.QtCore import Qt
+from sqlalchemy import MetaData, Table, Column, Text, select, func, cast, and_
+from sqlalchemy import types as sqltypes
+from result_store import ResultStore
+from workers import start_worker
+
+# Quantidade lida de cada LOB na pré-visualização e por bloco no visualizador
+LOB_PREVIEW_SIZE = 256
+LOB_CHUNK_SIZE = 256 * 1024
+# Tamanho a partir do qual colunas de texto/binário são tratadas como LOB
+LOB_MIN_LENGTH = 4000
+# Limite de bytes exibidos no modo hexadecimal
+HEX_VIEW_LIMIT = 1024 * 1024
+# Servidores que fatiam o LOB sem ler o valor inteiro a cada SUBSTRING (o
+# PostgreSQL descomprime o valor TOAST e o MySQL lê o BLOB todo em cada fatia)
+RANGE_READ_DIALECTS = ("mssql",)
+
+
+#######################################################################
+# DETECÇÃO E LEITURA TRUNCADA
+#######################################################################
+
+def lob_kind(column_type):
+    """Classifica o tipo refletido: 'binary', 'text', 'json' ou None (não LOB)"""
+    if isinstance(column_type, sqltypes.JSON) or type(column_type).__name__ == "XML":
+        return "json"
+    length = getattr(column_type, "length", None)
+    if isinstance(column_type, sqltypes._Binary):
+        return "binary" if length is None or length > LOB_MIN_LENGTH else None
+    if isinstance(column_type, sqltypes.String) and not isinstance(column_type, sqltypes.Enum):
+        return "text" if length is None or length > LOB_MIN_LENGTH else None
+    return None
+
+
+def build_table(table_name, columns, primary_key=(), schema=None):
+    """Monta um Table a partir das colunas já refletidas (sem nova reflexão)"""
+    return Table(table_name, MetaData(), *[
+        Column(c["name"], c["type"], primary_key=c["name"] in primary_key) for c in columns
+    ], schema=schema)
+
+
+def lob_expression(table, column_name, kind):
+    """Expressão usada para fatiar o LOB (JSON/XML são lidos como texto)"""
+    column = table.c[column_name]
+    return cast(column, Text) if kind == "json" else column
+
+
+def lob_size(dialect_name, table, column_name, kind):
+    """Tamanho total do valor no servidor: bytes nos binários, caracteres em texto/JSON
+    (a mesma unidade do valor truncado recebido)"""
+    if kind == "binary":
+        size_of = {"mssql": func.datalength, "postgresql": func.octet_length}.get(dialect_name, func.length)
+        return size_of(table.c[column_name])
+    expr = lob_expression(table, column_name, kind)
+    if dialect_name == "mssql":
+        # DATALENGTH contaria os bytes UTF-16 do nvarchar; LEN não aceita text/ntext
+        return func.len(cast(expr, sqltypes.NVARCHAR()))
+    if dialect_name in ("postgresql", "mysql"):
+        return func.char_length(expr)
+    return func.length(expr)
+
+
+def build_preview_query(dialect_name, table, columns, limit):
+    """SELECT da pré-visualização com LOBs truncados.
+
+    Retorna a consulta e a lista de (índice, tipo LOB); os tamanhos totais
+    dos LOBs vêm em colunas extras no fim de cada linha.
+    """
+    selected, sizes, lob_columns = [], [], []
+    for index, column in enumerate(columns):
+        kind = lob_kind(column["type"])
+        if kind is None:
+            selected.append(table.c[column["name"]])
+            continue
+        expr = lob_expression(table, column["name"], kind)
+        selected.append(func.substring(expr, 1, LOB_PREVIEW_SIZE).label(column["name"]))
+        sizes.append(lob_size(dialect_name, table, column["name"], kind))
+        lob_columns.append((index, kind))
+    return select(*selected, *sizes).select_from(table).limit(limit), lob_columns
+
+
+def store_from_preview(column_names, rows, lob_columns):
+    """Separa os tamanhos dos LOBs das linhas e monta o ResultStore"""
+    width = len(column_names)
+    store = ResultStore.from_rows(column_names, [row[:width] for row in rows])
+    for offset, (index, kind) in enumerate(lob_columns):
+        store.lob_sizes[index] = array("q", (row[width + offset] or 0 for row in rows))
+    return store
+
+
+def iter_lob_chunks(engine, table, column_name, kind, key, chunk_size=LOB_CHUNK_SIZE):
+    """Lê o valor completo de um LOB em blocos, identificando a linha pela chave.
+
+    Nos servidores de RANGE_READ_DIALECTS cada bloco é um SUBSTRING; nos
+    demais o valor vem numa leitura só (fatiar custaria O(n²)) e é repassado
+    em blocos para a exibição incremental.
+    """
+    expr = lob_expression(table, column_name, kind)
+    where = and_(*(table.c[name] == value for name, value in key.items()))
+    offset = 1
+    with engine.connect() as conn:
+        if engine.dialect.name not in RANGE_READ_DIALECTS:
+            value = conn.execute(select(expr).select_from(table).where(where)).scalar()
+            if value is None:
+                return
+            if isinstance(value, memoryview):
+                value = bytes(value)
+            for start in range(0, len(value), chunk_size):
+                yield value[start:start + chunk_size]
+            return
+        while True:
+            query = select(func.substring(expr, offset, chunk_size)).select_from(table).where(where)
+            chunk = conn.execute(query).scalar()
+            if chunk is None:
+                return
+            if isinstance(chunk, memoryview):
+                chunk = bytes(chunk)
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            offset += chunk_size
+
+
+def hexdump(data, offset=0):
+    """Formata bytes no estilo hexdump (16 bytes por linha)"""
+    lines = []
+    for start in range(0, len(data), 16):
+        line = data[start:start + 16]
+        ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in line)
+        lines.append(f"{offset + start:08x}  {line.hex(' '):<47}  {ascii_part}")
+    return "\n".join(lines)
+
+
+#######################################################################
+# VISUALIZADOR DE VALORES GRANDES
+#######################################################################
+
+class LobViewerDialog(QDialog):
+    """Carrega o valor completo de uma célula LOB em blocos e exibe em hex/texto/imagem"""
+
+    def __init__(self, engine, table, column_name, kind, key, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"{table.name}.{column_name}")
+        self.resize(720, 520)
+        self.kind = kind
+        self.chunks = []
+        self.bytes_read = 0
+        self.hex_written = 0
+
+        layout = QVBoxLayout(self)
+        self.status = QLabel("Carregando...")
+        layout.addWidget(self.status)
+
+        fixed_font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        self.views = QTabWidget()
+        self.hex_view = QPlainTextEdit(readOnly=True)
+        self.hex_view.setFont(fixed_font)
+        self.text_view = QPlainTextEdit(readOnly=True)
+        self.text_view.setFont(fixed_font)
+        self.image_view = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
+        image_scroll = QScrollArea()
+        image_scroll.setWidget(self.image_view)
+        image_scroll.setWidgetResizable(True)
+        self.views.addTab(self.hex_view, "Hex")
+        self.views.addTab(self.text_view, "Texto/JSON")
+        self.views.addTab(image_scroll, "Imagem")
+        self.views.setTabEnabled(2, False)
+        layout.addWidget(self.views, 1)
+
+        btn_layout = QHBoxLayout()
+        self.save_btn = QPushButton("Salvar em arquivo")
+        self.save_btn.setEnabled(False)
+        self.save_btn.clicked.connect(self.save_to_file)
+        btn_layout.addWidget(self.save_btn)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+        # Lê o valor em blocos numa thread separada
+        self.worker = start_worker(iter_lob_chunks, engine, table, column_name, kind, key,
+                                   on_progress=self.on_chunk,
+                                   on_finished=self.on_finished,
+                                   on_error=self.on_error)
+
+    def on_chunk(self, chunk):
+        """Recebe um bloco e atualiza a visão hexadecimal incrementalmente"""
+        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        self.chunks.append(chunk)
+        if self.hex_written < HEX_VIEW_LIMIT:
+            visible = data[:HEX_VIEW_LIMIT - self.hex_written]
+            self.hex_view.appendPlainText(hexdump(visible, self.hex_written))
+            self.hex_written += len(visible)
+        self.bytes_read += len(data)
+        self.status.setText(f"Carregando... {self.bytes_read} bytes lidos")
+
+    def on_finished(self, _):
+        """Monta o valor completo e preenche as visões de texto e imagem"""
+        if self.chunks and isinstance(self.chunks[0], str):
+            text_value = "".join(self.chunks)
+            self.value = text_value.encode("utf-8")
+        else:
+            self.value = b"".join(self.chunks)
+            text_value = self.value.decode("utf-8", errors="replace")
+
+        if self.kind == "json":
+            try:
+                text_value = json.dumps(json.loads(text_value), indent=2, ensure_ascii=False)
+            except ValueError:
+                pass
+        self.text_view.setPlainText(text_value)
+
+        pixmap = QPixmap()
+        if self.kind == "binary" and pixmap.loadFromData(self.value):
+            self.image_view.setPixmap(pixmap)
+            self.views.setTabEnabled(2, True)
+            self.views.setCurrentIndex(2)
+        elif self.kind != "binary":
+            self.views.setCurrentIndex(1)
+
+        suffix = f" (hex limitado a {HEX_VIEW_LIMIT} bytes)" if self.bytes_read > HEX_VIEW_LIMIT else ""
+        self.status.setText(f"{self.bytes_read} bytes{suffix}")
+        self.save_btn.setEnabled(True)
+
+    def on_error(self, error):
+        self.status.setText(f"Erro ao carregar valor: {error}")
+        self.status.setStyleSheet("color: red;")
+
+    def save_to_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar valor")
+        if not path:
+            return
+        try:
+            with open(path, "wb") as f:
+                f.write(self.value)
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível salvar o arquivo:\n{str(e)}")
+
+    def done(self, result):
+        # Interrompe a leitura se o diálogo for fechado antes do fim
+        self.worker.cancel()
+        super().done(result)
@@ -0,0 +1,182 @@
+from PyQt6.QtWidgets import QVBoxLayout, QTreeWidget, QTreeWidgetItem
+from PyQt6.QtGui import QColor, QBrush
+from sqlalchemy import text
+from server_activity import PollingTab
+
+# Intervalo padrão entre leituras (segundos)
+LOCKS_INTERVAL = 5
+
+LOCK_COLUMNS = ["sessão", "usuário", "estado", "espera", "segundos", "lock aguardado", "consulta"]
+
+# Uma única consulta por atualização com as sessões envolvidas em bloqueios:
+# sessão, bloqueadores (separados por vírgula), usuário, estado, espera, segundos, lock aguardado, consulta
+LOCK_QUERIES = {
+    "postgresql": """
+        WITH s AS (
+            SELECT a.*, pg_blocking_pids(a.pid) AS blockers
+            FROM pg_stat_activity a
+            WHERE a.backend_type = 'client backend'
+        )
+        SELECT s.pid, array_to_string(s.blockers, ','), s.usename, s.state,
+               coalesce(s.wait_event_type || ': ' || s.wait_event, ''),
+               extract(epoch FROM now() - coalesce(s.query_start, s.backend_start))::float,
+               (SELECT string_agg(DISTINCT l.locktype || ' ' || l.mode
+                                  || coalesce(' ' || l.relation::regclass::text, ''), ', ')
+                FROM pg_locks l WHERE l.pid = s.pid AND NOT l.granted),
+               s.query
+        FROM s
+        WHERE cardinality(s.blockers) > 0
+           OR s.pid IN (SELECT unnest(blockers) FROM s)
+    """,
+    "mssql": """
+        WITH s AS (
+            SELECT es.session_id,
+                   CAST(NULLIF(r.blocking_session_id, 0) AS varchar(10)) AS blocker,
+                   es.login_name, COALESCE(r.status, es.status) AS status,
+                   ISNULL(r.wait_type, '') AS wait_type,
+                   ISNULL(r.total_elapsed_time, 0) / 1000.0 AS seconds,
+                   (SELECT TOP 1 tl.resource_type + ' ' + tl.request_mode
+                    FROM sys.dm_tran_locks tl
+                    WHERE tl.request_session_id = es.session_id AND tl.request_status = 'WAIT') AS lock_info,
+                   t.text AS sql_text
+            FROM sys.dm_exec_sessions es
+            LEFT JOIN sys.dm_exec_requests r ON r.session_id = es.session_id
+            LEFT JOIN sys.dm_exec_connections c ON c.session_id = es.session_id
+            OUTER APPLY sys.dm_exec_sql_text(COALESCE(r.sql_handle, c.most_recent_sql_handle)) t
+            WHERE es.is_user_process = 1
+        )
+        SELECT session_id, blocker, login_name, status, wait_type, seconds, lock_info, sql_text
+        FROM s
+        WHERE blocker IS NOT NULL
+           OR session_id IN (SELECT CAST(blocker AS int) FROM s WHERE blocker IS NOT NULL)
+    """,
+    "mysql": """
+        SELECT t.PROCESSLIST_ID,
+               (SELECT GROUP_CONCAT(DISTINCT bt.PROCESSLIST_ID)
+                FROM performance_schema.data_lock_waits w
+                JOIN performance_schema.threads bt ON bt.THREAD_ID = w.BLOCKING_THREAD_ID
+                WHERE w.REQUESTING_THREAD_ID = t.THREAD_ID),
+               t.PROCESSLIST_USER, t.PROCESSLIST_COMMAND, COALESCE(t.PROCESSLIST_STATE, ''),
+               t.PROCESSLIST_TIME,
+               (SELECT GROUP_CONCAT(DISTINCT CONCAT(l.LOCK_TYPE, ' ', l.LOCK_MODE, ' ', COALESCE(l.OBJECT_NAME, '')))
+                FROM performance_schema.data_locks l
+                WHERE l.THREAD_ID = t.THREAD_ID AND l.LOCK_STATUS = 'WAITING'),
+               t.PROCESSLIST_INFO
+        FROM performance_schema.threads t
+        WHERE t.THREAD_ID IN (SELECT REQUESTING_THREAD_ID FROM performance_schema.data_lock_waits
+                              UNION SELECT BLOCKING_THREAD_ID FROM performance_schema.data_lock_waits)
+    """,
+}
+
+
+def read_locks(engine):
+    """Lê as sessões bloqueadas/bloqueadoras: {sessão: (bloqueador, valores das colunas)}"""
+    query = LOCK_QUERIES.get(engine.dialect.name)
+    if query is None:
+        raise ValueError(f"Visualização de bloqueios não suportada para {engine.dialect.name}")
+    with engine.connect() as conn:
+        rows = conn.execute(text(query)).fetchall()
+
+    sessions = {}
+    for session, blockers, user, state, wait, seconds, lock_info, sql in rows:
+        blocker = str(blockers).split(",")[0] if blockers else None
+        values = (str(session), user or "", state or "", wait or "", f"{float(seconds or 0):.1f}",
+                  lock_info or "", " ".join((sql or "").split())[:300])
+        sessions[str(session)] = (blocker, values)
+    return sessions
+
+
+def tree_parents(sessions):
+    """Define o pai de cada sessão na árvore; ciclos (deadlock) viram raízes"""
+    parents = {}
+    for session, (blocker, _) in sessions.items():
+        parent = blocker if blocker in sessions else None
+        # Sobe a cadeia para detectar ciclos
+        seen, current = set(), parent
+        while current is not None and current != session and current not in seen:
+            seen.add(current)
+            current = sessions[current][0] if sessions[current][0] in sessions else None
+        parents[session] = None if current == session else parent
+    return parents
+
+
+class LockTreeTab(PollingTab):
+    """Aba 'Bloqueios': árvore de quem bloqueia quem, atualizada incrementalmente"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent, interval=LOCKS_INTERVAL)
+        self.items = {}  # Sessão -> QTreeWidgetItem
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(self.toolbar)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(LOCK_COLUMNS)
+        self.tree.setColumnWidth(0, 160)
+        layout.addWidget(self.tree, 1)
+        layout.addWidget(self.status)
+
+    def set_engine(self, engine):
+        self.tree.clear()
+        self.items.clear()
+        super().set_engine(engine)
+
+    def poll(self, engine):
+        return read_locks(engine)
+
+    def on_result(self, sessions):
+        """Aplica a leitura na árvore reaproveitando os itens existentes"""
+        parents = tree_parents(sessions)
+
+        # Remove sessões que não estão mais envolvidas em bloqueios
+        for session in [s for s in self.items if s not in sessions]:
+            item = self.items.pop(session)
+            for child in item.takeChildren():
+                self.tree.addTopLevelItem(child)  # Reposicionadas abaixo
+            self.detach(item)
+
+        # Cria/atualiza itens e ajusta o pai quando a cadeia mudou
+        for session, (_, values) in sessions.items():
+            item = self.items.get(session)
+            if item is None:
+                item = self.items[session] = QTreeWidgetItem(list(values))
+            else:
+                for col, value in enumerate(values):
+                    if item.text(col) != value:
+                        item.setText(col, value)
+        # Em duas passadas: primeiro retira todos os que mudaram de pai (os que
+        # ficam na árvore já estão no pai certo), depois os encaixa. Mover um
+        # por vez criaria ciclos quando a cadeia se inverte (B filho de A passa
+        # a bloquear A e A seria posto dentro do próprio filho).
+        moved = []
+        for session, parent_id in parents.items():
+            item = self.items[session]
+            parent = self.items[parent_id] if parent_id else None
+            if item.parent() is not parent or (parent is None and self.tree.indexOfTopLevelItem(item) < 0):
+                moved.append((item, parent))
+        for item, _ in moved:
+            self.detach(item)
+        for item, parent in moved:
+            if parent is None:
+                self.tree.addTopLevelItem(item)
+            else:
+                parent.addChild(item)
+                parent.setExpanded(True)
+
+        # Raízes que bloqueiam alguém são os bloqueadores principais
+        for session, item in self.items.items():
+            head = parents[session] is None and item.childCount() > 0
+            item.setForeground(0, QColor("red") if head else QBrush())
+
+        blocked = sum(1 for blocker, _ in sessions.values() if blocker)
+        self.status.setText(f"{blocked} sessões bloqueadas" if blocked else "Nenhum bloqueio")
+        self.status.setStyleSheet("color: red;" if blocked else "")
+
+    def detach(self, item):
+        """Retira o item da posição atual na árvore (sem destruí-lo)"""
+        parent = item.parent()
+        if parent is not None:
+            parent.removeChild(item)
+        else:
+            index = self.tree.indexOfTopLevelItem(item)
+            if index >= 0:
+                self.tree.takeTopLevelItem(index)
@@ -0,0 +1,221 @@
+from collections import defaultdict
+from itertools import compress
+from operator import not_
+from time import perf_counter
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox, QPushButton,
+                             QListWidget, QListWidgetItem, QTableView, QMessageBox)
+from PyQt6.QtCore import Qt
+from result_store import ResultStore, NUMERIC_KINDS
+from result_model import ResultTableModel
+from workers import start_worker
+
+# Funções oferecidas no painel
+AGGREGATES = {
+    "Contagem": "count",
+    "Soma": "sum",
+    "Média": "avg",
+    "Mínimo": "min",
+    "Máximo": "max",
+}
+# Valores distintos aceitos na coluna do pivô (cada um vira uma coluna)
+MAX_PIVOT_COLUMNS = 200
+# Opção de valor que conta as linhas do grupo (COUNT(*))
+ROWS_OPTION = "(linhas)"
+NO_PIVOT_OPTION = "(nenhuma)"
+
+
+def column_list(column, row_count):
+    """Valores nativos da coluna inteira, com None nas linhas nulas"""
+    values = column.values[:row_count]
+    if not column.null_count:
+        return values
+    return [None if n else v for v, n in zip(values, column.nulls[:row_count])]
+
+
+def group_codes(keys):
+    """Tabela hash dos grupos: (chaves distintas na ordem de aparição, código de cada linha)"""
+    groups = {}
+    codes = [groups.setdefault(key, len(groups)) for key in keys]
+    return list(groups), codes
+
+
+def sorted_codes(keys):
+    """Códigos dos grupos na ordem das chaves (nulos primeiro)"""
+    codes = range(len(keys))
+    try:
+        return sorted(codes, key=lambda c: tuple((v is not None, v) for v in keys[c]))
+    except TypeError:
+        # Tipos não comparáveis entre si (coluna mista): compara como texto
+        return sorted(codes, key=lambda c: tuple(str(v) for v in keys[c]))
+
+
+def reduce_bucket(values, function):
+    if function == "count":
+        return len(values)
+    if not values:
+        return None
+    if function == "sum":
+        return sum(values)
+    if function == "avg":
+        return sum(values) / len(values)
+    return min(values) if function == "min" else max(values)
+
+
+def pivot_store(store, group_columns, value_column, function, pivot_column=None):
+    """Agrega o resultado carregado por agregação hash (thread de trabalho).
+
+    group_columns: índices das colunas agrupadas; value_column: índice da
+    coluna agregada (None conta as linhas); pivot_column: índice da coluna
+    cujos valores distintos viram colunas. Retorna um ResultStore.
+    """
+    row_count = store.row_count
+    if value_column is not None and function in ("sum", "avg"):
+        if store.kind(value_column) not in NUMERIC_KINDS + ("bool", None):
+            raise ValueError("Soma e média só se aplicam a colunas numéricas")
+
+    # Um código por linha para o grupo e outro para a coluna do pivô
+    if group_columns:
+        keys = [column_list(store.columns[c], row_count) for c in group_columns]
+        groups, codes = group_codes(zip(*keys) if len(keys) > 1 else keys[0])
+        if len(keys) == 1:
+            groups = [(g,) for g in groups]
+    else:
+        groups, codes = [()], [0] * row_count
+    pivots, pivot_codes = [None], None
+    if pivot_column is not None:
+        pivots, pivot_codes = group_codes(column_list(store.columns[pivot_column], row_count))
+        if len(pivots) > MAX_PIVOT_COLUMNS:
+            raise ValueError(f"A coluna do pivô tem {len(pivots)} valores distintos (máximo {MAX_PIVOT_COLUMNS})")
+        # Célula = grupo × valor do pivô
+        width = len(pivots)
+        codes = [code * width + p for code, p in zip(codes, pivot_codes)]
+
+    # Distribui os valores não nulos pelos grupos numa única passada
+    buckets = defaultdict(list)
+    if value_column is None:
+        values = [1] * row_count
+        rows = codes
+    else:
+        column = store.columns[value_column]
+        values = column.values[:row_count]
+        rows = codes
+        if column.null_count:
+            present = list(map(not_, column.nulls[:row_count]))
+            values = list(compress(values, present))
+            rows = list(compress(codes, present))
+    for code, value in zip(rows, values):
+        buckets[code].append(value)
+
+    value_name = ROWS_OPTION if value_column is None else store.column_names[value_column]
+    label = next(name for name, f in AGGREGATES.items() if f == function)
+    names = [store.column_names[c] for c in group_columns]
+    if pivot_column is None:
+        names.append(f"{label}({value_name})")
+    else:
+        pivot_order = sorted_codes([(p,) for p in pivots])
+        names.extend("NULL" if pivots[p] is None else str(pivots[p]) for p in pivot_order)
+
+    result = []
+    missing = 0 if function == "count" else None
+    for code in sorted_codes(groups):
+        if pivot_column is None:
+            cells = [reduce_bucket(buckets.get(code, []), function)]
+        else:
+            base = code * len(pivots)
+            cells = [reduce_bucket(buckets[base + p], function) if base + p in buckets else missing
+                     for p in pivot_order]
+        result.append(groups[code] + tuple(cells))
+    return ResultStore.from_rows(names, result)
+
+
+class PivotDialog(QDialog):
+    """Agrupamento e pivô sobre o resultado já carregado, sem consultar o servidor"""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Agrupar / Pivô")
+        self.resize(900, 600)
+        self.store = store
+        self.worker = None
+
+        layout = QVBoxLayout(self)
+        options = QGridLayout()
+        options.addWidget(QLabel("Agrupar por:"), 0, 0, Qt.AlignmentFlag.AlignTop)
+        self.group_list = QListWidget()
+        for name in store.column_names:
+            item = QListWidgetItem(name)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.group_list.addItem(item)
+        self.group_list.setMaximumHeight(120)
+        options.addWidget(self.group_list, 0, 1, 3, 1)
+
+        options.addWidget(QLabel("Colunas do pivô:"), 0, 2)
+        self.pivot_combo = QComboBox()
+        self.pivot_combo.addItems([NO_PIVOT_OPTION] + store.column_names)
+        options.addWidget(self.pivot_combo, 0, 3)
+        options.addWidget(QLabel("Valor:"), 1, 2)
+        self.value_combo = QComboBox()
+        self.value_combo.addItems([ROWS_OPTION] + store.column_names)
+        options.addWidget(self.value_combo, 1, 3)
+        options.addWidget(QLabel("Função:"), 2, 2)
+        self.function_combo = QComboBox()
+        self.function_combo.addItems(AGGREGATES)
+        options.addWidget(self.function_combo, 2, 3)
+        options.setColumnStretch(1, 1)
+        layout.addLayout(options)
+
+        btn_layout = QHBoxLayout()
+        self.compute_btn = QPushButton("Calcular")
+        self.compute_btn.clicked.connect(self.compute)
+        btn_layout.addWidget(self.compute_btn)
+        self.status = QLabel(f"{store.row_count} linhas carregadas")
+        btn_layout.addWidget(self.status, 1)
+        layout.addLayout(btn_layout)
+
+        self.model = ResultTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table, 1)
+
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        layout.addWidget(close_btn)
+
+    def compute(self):
+        """Calcula o agrupamento numa thread de trabalho"""
+        group_columns = [row for row in range(self.group_list.count())
+                         if self.group_list.item(row).checkState() == Qt.CheckState.Checked]
+        pivot_column = self.pivot_combo.currentIndex() - 1
+        value_column = self.value_combo.currentIndex() - 1
+        function = AGGREGATES[self.function_combo.currentText()]
+        if value_column < 0 and function != "count":
+            QMessageBox.warning(self, "Aviso", "Escolha a coluna de valor para esta função.")
+            return
+        self.compute_btn.setEnabled(False)
+        self.status.setText("Calculando...")
+        started = perf_counter()
+        self.worker = start_worker(
+            pivot_store, self.store, group_columns, value_column if value_column >= 0 else None, function,
+            pivot_column if pivot_column >= 0 else None,
+            on_finished=lambda result: self.on_finished(result, perf_counter() - started),
+            on_error=self.on_error)
+
+    def on_finished(self, result, elapsed):
+        self.worker = None
+        self.compute_btn.setEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.model.set_store(result)
+        self.table.resizeColumnsToContents()
+        self.status.setText(f"{result.row_count} grupos de {self.store.row_count} linhas em {elapsed * 1000:.0f} ms")
+
+    def on_error(self, error):
+        self.worker = None
+        self.compute_btn.setEnabled(True)
+        self.status.setText("")
+        QMessageBox.critical(self, "Erro", f"Não foi possível agrupar:\n{str(error)}")
+
+    def done(self, result):
+        if self.worker is not None:
+            self.worker.cancel()
+        super().done(result)
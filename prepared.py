@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from sqlalchemy.dialects.postgresql import psycopg2 as pg_psycopg2
+from sqlalchemy.exc import DBAPIError
+from connection import is_read_only_sql
+from query_params import bind_parameters
+
+# Statements preparados mantidos por conexão física (os menos usados saem primeiro)
+PREPARED_CACHE_SIZE = 64
+# Comandos aceitos pelo PREPARE do PostgreSQL entre os somente leitura
+PREPARABLE_KEYWORDS = ("select", "with", "values")
+# Erros do PostgreSQL que indicam statement preparado perdido ou desatualizado
+# (sessão reiniciada, tabela alterada depois do PREPARE)
+STALE_PGCODES = ("26000", "0A000")
+# Drivers que recebem o resultado inteiro do EXECUTE na memória do cliente
+# (sem cursor no servidor): só preparam comandos cujo resultado já coube no orçamento
+BUFFERING_DRIVERS = ("psycopg2",)
+
+# PREPARE exige parâmetros posicionais $1, $2...
+PG_PREPARE_DIALECT = pg_psycopg2.dialect(paramstyle="numeric_dollar")
+
+
+class StatementCache:
+    """LRU dos statements preparados de uma conexão física"""
+
+    def __init__(self, size=PREPARED_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.created = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def add(self, key, entry):
+        """Guarda o statement; retorna os que saíram do cache (para liberar no servidor)"""
+        self.entries[key] = entry
+        self.created += 1
+        evicted = []
+        while len(self.entries) > self.size:
+            evicted.append(self.entries.popitem(last=False)[1])
+        return evicted
+
+    def remove(self, key):
+        return self.entries.pop(key, None)
+
+
+@contextmanager
+def driver_errors(conn, statement, args=None, cursor=None):
+    """Erros das chamadas diretas ao cursor do driver chegam como DBAPIError,
+    com a conexão invalidada se caiu (como nas execuções pelo SQLAlchemy)"""
+    dbapi_error = conn.dialect.loaded_dbapi.Error
+    try:
+        yield
+    except dbapi_error as e:
+        invalidated = conn.dialect.is_disconnect(e, conn.connection.dbapi_connection, cursor)
+        if invalidated:
+            conn.invalidate(e)
+        raise DBAPIError.instance(statement, args, e, dbapi_error, connection_invalidated=invalidated,
+                                  dialect=conn.dialect) from e
+
+
+class CursorRows:
+    """Resultado lido direto de um cursor preparado (mesma interface do CursorResult usada na consulta).
+
+    Lido até o fim, o driver já liberou as linhas e o cursor fica no cache
+    com o statement preparado; fechado antes disso (consulta cancelada ou
+    lida em parte), o cursor é fechado e sai do cache, para que linhas
+    pendentes não deixem a conexão ocupada para o próximo comando.
+    """
+
+    def __init__(self, conn, cursor, statement, cache):
+        self.conn = conn
+        self.cursor = cursor
+        self.statement = statement
+        self.cache = cache
+        self.exhausted = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def keys(self):
+        return [column[0] for column in self.cursor.description]
+
+    def fetchmany(self, size):
+        with driver_errors(self.conn, self.statement, cursor=self.cursor):
+            rows = self.cursor.fetchmany(size)
+        # Menos linhas que o pedido: o driver chegou ao fim do resultado
+        self.exhausted = len(rows) < size
+        return rows
+
+    def fetchall(self):
+        with driver_errors(self.conn, self.statement, cursor=self.cursor):
+            rows = self.cursor.fetchall()
+        self.exhausted = True
+        return rows
+
+    def close(self):
+        if not self.exhausted:
+            self.exhausted = True
+            self.cache.remove(self.statement)
+            with suppress(self.conn.dialect.loaded_dbapi.Error):  # Conexão que já caiu
+                self.cursor.close()
+
+
+def preparable(sql):
+    """Comando único e somente leitura que o servidor consegue preparar"""
+    words = sql.lstrip("( \n\t").split(None, 1)
+    return (bool(words) and words[0].lower() in PREPARABLE_KEYWORDS and is_read_only_sql(sql)
+            and ";" not in sql.rstrip().rstrip(";"))
+
+
+def bound_args(dialect, names, values):
+    """Valores posicionais passados pelos processadores de tipo do dialeto,
+    como o SQLAlchemy faz nas execuções normais"""
+    args = []
+    for name in names:
+        value, type_ = values[name]
+        process = type_.dialect_impl(dialect).bind_processor(dialect)
+        args.append(process(value) if process is not None else value)
+    return args
+
+
+def statement_cache(conn):
+    """Cache da conexão física; o pool o descarta junto com a conexão ao reconectar"""
+    return conn.connection.info.setdefault("prepared_statements", StatementCache())
+
+
+def postgres_execute(conn, sql, values):
+    """PREPARE na primeira execução, EXECUTE nas seguintes (mesma sessão)"""
+    statement = bind_parameters(sql.rstrip().rstrip(";"), values)
+    compiled = statement.compile(dialect=PG_PREPARE_DIALECT)
+    names = compiled.positiontup or []
+    types = [PG_PREPARE_DIALECT.type_compiler_instance.process(values[name][1]) for name in names]
+    key = (compiled.string, tuple(types))
+    cache = statement_cache(conn)
+    name = cache.get(key)
+    if name is None:
+        name = f"allsqladmin_{cache.created}"
+        # no_parameters: sem parâmetros o psycopg2 não interpreta os % do SQL
+        raw = {"no_parameters": True}
+        type_list = f" ({', '.join(types)})" if types else ""
+        conn.exec_driver_sql(f"PREPARE {name}{type_list} AS {compiled.string}", execution_options=raw)
+        for evicted in cache.add(key, name):
+            conn.exec_driver_sql(f"DEALLOCATE {evicted}", execution_options=raw)
+
+    args = tuple(bound_args(conn.dialect, names, values))
+    try:
+        if not args:
+            return conn.exec_driver_sql(f"EXECUTE {name}")
+        return conn.exec_driver_sql(f"EXECUTE {name} ({', '.join(['%s'] * len(args))})", args)
+    except DBAPIError as e:
+        if e.connection_invalidated or getattr(e.orig, "pgcode", None) not in STALE_PGCODES:
+            raise
+    # Statement perdido ou desatualizado: esquece e executa sem preparar
+    conn.rollback()
+    cache.remove(key)
+    return conn.execute(statement)
+
+
+def pyodbc_execute(conn, sql, values):
+    """Um cursor por comando: o pyodbc reaproveita o handle preparado (SQLPrepare)
+    quando o mesmo SQL é executado de novo no mesmo cursor"""
+    compiled = bind_parameters(sql, values).compile(dialect=conn.dialect)
+    args = bound_args(conn.dialect, compiled.positiontup or [], values)
+    cache = statement_cache(conn)
+    cursor = cache.get(compiled.string)
+    if cursor is None:
+        cursor = conn.connection.cursor()
+        for evicted in cache.add(compiled.string, cursor):
+            evicted.close()
+    # Dispara os eventos do engine (instrumentação) como numa execução normal
+    conn.dispatch.before_cursor_execute(conn, cursor, compiled.string, args, None, False)
+    with driver_errors(conn, compiled.string, args, cursor):
+        cursor.execute(compiled.string, args)
+    conn.dispatch.after_cursor_execute(conn, cursor, compiled.string, args, None, False)
+    return CursorRows(conn, cursor, compiled.string, cache)
+
+
+# Drivers com reaproveitamento de statements preparados
+PREPARED_EXECUTORS = {
+    "psycopg2": postgres_execute,
+    "pyodbc": pyodbc_execute,
+}
+
+
+def execute_prepared(conn, sql, values, fits_in_memory=True):
+    """Executa o comando reaproveitando o statement preparado da conexão.
+
+    fits_in_memory indica que a execução anterior do comando coube no
+    orçamento de memória; sem isso os drivers de BUFFERING_DRIVERS não
+    preparam, para que o chamador leia as linhas por um cursor no servidor.
+    Retorna o resultado (keys()/fetchmany()/fetchall()/close()) ou None quando o
+    driver ou o comando não permitem preparo (o chamador executa normalmente).
+    """
+    executor = PREPARED_EXECUTORS.get(conn.dialect.driver)
+    if executor is None or not preparable(sql):
+        return None
+    if not fits_in_memory and conn.dialect.driver in BUFFERING_DRIVERS:
+        return None
+    return executor(conn, sql, values)
@@ -0,0 +1,89 @@
+import re
+from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel, QComboBox, QLineEdit
+from sqlalchemy import text, bindparam
+from sqlalchemy import types as sqltypes
+from changeset import parse_input
+
+# Tipos oferecidos para cada parâmetro: (tipo lógico do ResultStore, tipo SQLAlchemy)
+PARAMETER_TYPES = {
+    "Texto": ("text", sqltypes.String()),
+    "Inteiro": ("int", sqltypes.Integer()),
+    "Decimal": ("decimal", sqltypes.Numeric()),
+    "Real": ("float", sqltypes.Float()),
+    "Data": ("date", sqltypes.Date()),
+    "Data/Hora": ("datetime", sqltypes.DateTime()),
+    "Hora": ("time", sqltypes.Time()),
+    "Lógico": ("bool", sqltypes.Boolean()),
+    "Binário": ("bytes", sqltypes.LargeBinary()),
+}
+
+# :nome fora de literais e comentários (:: de cast e \: não são parâmetros, como no text())
+PLACEHOLDER = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/|(?<![:\w\\]):([^\W\d]\w*)(?!:)", re.DOTALL)
+# Dois-pontos que o text() tomaria como parâmetro
+TEXT_BIND = re.compile(r"(?<![:\w\\]):(?=\w)")
+
+
+def find_parameters(sql):
+    """Nomes dos parâmetros :nome do SQL, na ordem em que aparecem"""
+    return list(dict.fromkeys(name for name in PLACEHOLDER.findall(sql) if name))
+
+
+def escape_literals(sql):
+    """Escapa (\\:) os :nome de literais e comentários para o text() não os tomar por parâmetros"""
+    return PLACEHOLDER.sub(lambda m: m.group(0) if m.group(1) else TEXT_BIND.sub(r"\\:", m.group(0)), sql)
+
+
+def bind_parameters(sql, values):
+    """text() com os valores ligados como parâmetros tipados.
+
+    values: {nome: (valor, tipo SQLAlchemy)}. O texto enviado ao servidor é o
+    mesmo para qualquer valor, então o plano em cache é reaproveitado.
+    """
+    statement = text(escape_literals(sql))
+    if values:
+        statement = statement.bindparams(*[bindparam(name, value, type_=type_)
+                                           for name, (value, type_) in values.items()])
+    return statement
+
+
+class ParameterPanel(QWidget):
+    """Campos tipados para os parâmetros :nome da consulta (oculto quando não há nenhum)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QGridLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.setColumnStretch(2, 1)
+        self.fields = {}  # Nome -> (rótulo, combo de tipo, campo de valor)
+        self.names = []
+        self.hide()
+
+    def set_names(self, names):
+        """Mostra um campo por parâmetro, mantendo tipo e valor dos que continuam na consulta"""
+        if names == self.names:
+            return
+        for name in set(self.fields) - set(names):
+            for widget in self.fields.pop(name):
+                widget.deleteLater()
+        for row, name in enumerate(names):
+            if name not in self.fields:
+                type_combo = QComboBox()
+                type_combo.addItems(PARAMETER_TYPES)
+                value_input = QLineEdit(placeholderText="valor (NULL para nulo)")
+                self.fields[name] = (QLabel(f":{name}"), type_combo, value_input)
+            for column, widget in enumerate(self.fields[name]):
+                self.layout.addWidget(widget, row, column)
+        self.names = list(names)
+        self.setVisible(bool(names))
+
+    def values(self):
+        """{nome: (valor, tipo SQLAlchemy)} convertidos (ValueError indica o parâmetro inválido)"""
+        values = {}
+        for name in self.names:
+            _, type_combo, value_input = self.fields[name]
+            kind, type_ = PARAMETER_TYPES[type_combo.currentText()]
+            try:
+                values[name] = (parse_input(value_input.text(), kind), type_)
+            except ValueError as e:
+                raise ValueError(f":{name}: {str(e)}")
+        return values
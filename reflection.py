@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import Table, Column, PrimaryKeyConstraint, inspect, text
+from sqlalchemy import types as sqltypes
+
+# Tabelas refletidas por chamada e lotes em paralelo por banco
+REFLECTION_BATCH_SIZE = 50
+REFLECTION_WORKERS = 4
+
+
+def batches(items, size):
+    """Divide a lista em lotes de até `size` itens"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def reflect_batch(engine, schema, names):
+    """Reflete um lote de tabelas com as APIs em massa (uma consulta por tipo de objeto)"""
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        columns = inspector.get_multi_columns(schema=schema, filter_names=names)
+        primary_keys = inspector.get_multi_pk_constraint(schema=schema, filter_names=names)
+        indexes = inspector.get_multi_indexes(schema=schema, filter_names=names)
+        foreign_keys = inspector.get_multi_foreign_keys(schema=schema, filter_names=names)
+        uniques = inspector.get_multi_unique_constraints(schema=schema, filter_names=names)
+
+    tables = {}
+    for key, table_columns in columns.items():
+        tables[key[1]] = {
+            "columns": table_columns,
+            "primary_key": primary_keys.get(key, {}),
+            "indexes": indexes.get(key, []),
+            "foreign_keys": foreign_keys.get(key, []),
+            "unique_constraints": uniques.get(key, []),
+        }
+    return tables
+
+
+def iter_schema_batches(engine, schema=None, batch_size=REFLECTION_BATCH_SIZE, max_workers=REFLECTION_WORKERS):
+    """Reflete as tabelas do schema em lotes paralelos, produzindo cada lote
+    ({tabela: reflexão}, total de tabelas) assim que termina"""
+    names = sorted(inspect(engine).get_table_names(schema=schema))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(reflect_batch, engine, schema, batch) for batch in batches(names, batch_size)]
+        for future in as_completed(futures):
+            yield future.result(), len(names)
+
+
+def reflect_schema(engine, schema=None, on_batch=None, batch_size=REFLECTION_BATCH_SIZE,
+                   max_workers=REFLECTION_WORKERS):
+    """Reflete todas as tabelas do schema em lotes paralelos.
+
+    Retorna {tabela: {columns, primary_key, indexes, foreign_keys,
+    unique_constraints}}; `on_batch(refletidas, total)` é chamado a cada
+    lote concluído.
+    """
+    tables = {}
+    for batch, total in iter_schema_batches(engine, schema, batch_size, max_workers):
+        tables.update(batch)
+        if on_batch:
+            on_batch(len(tables), total)
+    return tables
+
+
+def plain_indexes(info):
+    """Índices refletidos, sem os que apenas implementam restrições únicas (MySQL)"""
+    return [i for i in info["indexes"] if not i.get("duplicates_constraint")]
+
+
+def table_from_info(metadata, name, info):
+    """Monta (ou reaproveita) o Table de uma tabela refletida"""
+    if name in metadata.tables:
+        return metadata.tables[name]
+    primary_key = info["primary_key"].get("constrained_columns") or []
+    columns = [Column(c["name"], c["type"], nullable=c.get("nullable", True),
+                      server_default=text(c["default"]) if c.get("default") is not None else None,
+                      autoincrement=c.get("autoincrement", "auto"))
+               for c in info["columns"]]
+    table = Table(name, metadata, *columns)
+    if primary_key:
+        table.append_constraint(PrimaryKeyConstraint(*primary_key, name=info["primary_key"].get("name")))
+    return table
+
+
+def stub_table(metadata, name, column_names):
+    """Tabela mínima só para compilar referências (índices/FKs a remover)"""
+    if name in metadata.tables:
+        table = metadata.tables[name]
+        for column in column_names:
+            if column not in table.c:
+                table.append_column(Column(column, sqltypes.NullType()))
+        return table
+    return Table(name, metadata, *[Column(c, sqltypes.NullType()) for c in column_names])
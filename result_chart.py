@@ -0,0 +1,554 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from itertools import compress, repeat
+from operator import add, gt, mul, not_, sub
+from time import perf_counter
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QWidget,
+                             QMessageBox)
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer, pyqtSignal
+from pivot import pivot_store
+from query_params import bind_parameters
+from workers import start_worker
+
+# Vértices desenhados por série: a tela não mostra mais do que isso
+CHART_POINTS = 2000
+HISTOGRAM_BINS = 50
+MAX_BARS = 100
+# Pausa após zoom/arraste antes de reamostrar a faixa visível (ms)
+RESAMPLE_MS = 150
+CHART_TYPES = ["Linha", "Barras", "Histograma"]
+ROW_NUMBER_OPTION = "(nº da linha)"
+COUNT_OPTION = "(linhas)"
+# Tipos que viram eixo numérico contínuo
+CONTINUOUS_KINDS = ("int", "float", "decimal", "bool", "datetime", "date", "time")
+TIME_KINDS = ("datetime", "date")
+
+# Agrupamento no servidor: unidade -> expressão do balde por dialeto
+SERVER_BUCKETS = {"Minuto": "minute", "Hora": "hour", "Dia": "day", "Mês": "month"}
+MYSQL_BUCKET_FORMATS = {
+    "minute": "%Y-%m-%d %H:%i:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+BUCKET_EXPRESSIONS = {
+    "postgresql": lambda x, unit: f"date_trunc('{unit}', {x})",
+    "mssql": lambda x, unit: f"DATEADD({unit}, DATEDIFF({unit}, 0, {x}), 0)",
+    "mysql": lambda x, unit: f"CAST(DATE_FORMAT({x}, '{MYSQL_BUCKET_FORMATS[unit]}') AS DATETIME)",
+}
+
+PLOT_COLOR = QColor("#1750eb")
+GRID_COLOR = QColor("#e0e0e0")
+MARGIN_LEFT = 80
+MARGIN_BOTTOM = 40
+MARGIN = 12
+TICKS = 5
+
+
+#######################################################################
+# SÉRIES E AMOSTRAGEM
+#######################################################################
+
+def numeric_value(value):
+    """Posição do valor no eixo (datas em segundos)"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    if isinstance(value, time):
+        return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+def axis_value(kind):
+    """Conversão dos valores de uma coluna do tipo informado para o eixo"""
+    return float if kind in ("int", "float", "bool", "decimal") else numeric_value
+
+
+def numeric_column(column, row_count):
+    """Valores não nulos da coluna como array de floats"""
+    values = column.values[:row_count]
+    if column.null_count:
+        values = compress(values, map(not_, column.nulls[:row_count]))
+    if column.kind in ("int", "float", "bool"):
+        return array("d", values)
+    if column.kind == "decimal":
+        return array("d", map(float, values))
+    return array("d", map(numeric_value, values))
+
+
+def line_series(store, x_col, y_col):
+    """Pontos (x, y) ordenados por x, sem as linhas com x ou y nulos"""
+    row_count = store.row_count
+    y_column = store.columns[y_col]
+    if x_col is None:
+        xs, ys = array("d", range(row_count)), numeric_column(y_column, row_count)
+        if y_column.null_count:
+            xs = array("d", compress(xs, map(not_, y_column.nulls[:row_count])))
+        return xs, ys
+    x_column = store.columns[x_col]
+    if x_column.null_count or y_column.null_count:
+        # Só as linhas com os dois valores
+        both = [not (a or b) for a, b in zip(x_column.nulls[:row_count], y_column.nulls[:row_count])]
+        x_values = compress(x_column.values[:row_count], both)
+        y_values = compress(y_column.values[:row_count], both)
+    else:
+        x_values, y_values = x_column.values[:row_count], y_column.values[:row_count]
+    xs = array("d", map(axis_value(x_column.kind), x_values))
+    ys = array("d", map(axis_value(y_column.kind), y_values))
+    if any(map(gt, xs[:-1], xs[1:])):
+        order = sorted(range(len(xs)), key=xs.__getitem__)
+        xs = array("d", map(xs.__getitem__, order))
+        ys = array("d", map(ys.__getitem__, order))
+    return xs, ys
+
+
+def lttb(xs, ys, threshold=CHART_POINTS, start=0, stop=None):
+    """Largest-Triangle-Three-Buckets: reduz xs[start:stop] a `threshold`
+    pontos preservando a forma (picos e vales) da série.
+
+    Em cada balde fica o ponto que forma o maior triângulo com o ponto
+    escolhido no balde anterior e a média do balde seguinte; as áreas de um
+    balde são calculadas em lote (map em C) em vez de ponto a ponto.
+    """
+    stop = len(xs) if stop is None else stop
+    count = stop - start
+    if count <= threshold or threshold < 3:
+        return list(xs[start:stop]), list(ys[start:stop])
+    out_x, out_y = [xs[start]], [ys[start]]
+    every = (count - 2) / (threshold - 2)
+    a = start
+    for i in range(threshold - 2):
+        lo = start + int(i * every) + 1
+        hi = start + int((i + 1) * every) + 1
+        next_hi = min(start + int((i + 2) * every) + 1, stop - 1)
+        if next_hi > hi:
+            cx = sum(xs[hi:next_hi]) / (next_hi - hi)
+            cy = sum(ys[hi:next_hi]) / (next_hi - hi)
+        else:
+            cx, cy = xs[stop - 1], ys[stop - 1]
+        ax, ay = xs[a], ys[a]
+        # 2 × área = |px·(ay − cy) + py·(cx − ax) + (ax·cy − cx·ay)|
+        areas = list(map(abs, map(add, map(add, map(mul, xs[lo:hi], repeat(ay - cy)),
+                                             map(mul, ys[lo:hi], repeat(cx - ax))),
+                                  repeat(ax * cy - cx * ay))))
+        a = lo + areas.index(max(areas))
+        out_x.append(xs[a])
+        out_y.append(ys[a])
+    out_x.append(xs[stop - 1])
+    out_y.append(ys[stop - 1])
+    return out_x, out_y
+
+
+def visible_series(xs, ys, low, high, threshold=CHART_POINTS):
+    """Amostra só a faixa visível (mais um ponto de cada lado, para a linha chegar às bordas)"""
+    start = max(bisect_left(xs, low) - 1, 0)
+    stop = min(bisect_right(xs, high) + 1, len(xs))
+    return lttb(xs, ys, threshold, start, stop)
+
+
+def histogram(values, bins=HISTOGRAM_BINS):
+    """(início, largura da faixa, contagem por faixa)"""
+    if not values:
+        return 0.0, 1.0, []
+    low, high = min(values), max(values)
+    width = (high - low) / bins or 1.0
+    counts = Counter(map(int, map(mul, map(sub, values, repeat(low)), repeat(1 / width))))
+    # O valor máximo cai no fim da última faixa
+    counts[bins - 1] += counts.pop(bins, 0)
+    return low, width, [counts.get(i, 0) for i in range(bins)]
+
+
+def chart_data(store, chart_type, x_col, y_col):
+    """Prepara os dados do gráfico (thread de trabalho)"""
+    if chart_type == "Linha":
+        xs, ys = line_series(store, x_col, y_col)
+        return {"type": chart_type, "xs": xs, "ys": ys, "points": lttb(xs, ys), "y_kind": store.kind(y_col)}
+    if chart_type == "Histograma":
+        values = numeric_column(store.columns[y_col], store.row_count)
+        low, width, counts = histogram(values)
+        return {"type": chart_type, "low": low, "width": width, "counts": counts, "total": len(values),
+                "kind": store.kind(y_col)}
+    # Barras: soma de Y (ou contagem de linhas) por valor de X
+    grouped = pivot_store(store, [x_col], y_col, "count" if y_col is None else "sum")
+    labels = ["NULL" if v is None else str(v) for v in map(grouped.columns[0].get, range(grouped.row_count))]
+    values = [0.0 if v is None else float(v) for v in map(grouped.columns[1].get, range(grouped.row_count))]
+    return {"type": chart_type, "labels": labels[:MAX_BARS], "values": values[:MAX_BARS], "total": len(labels)}
+
+
+def bucket_query(dialect, sql, x_name, y_name, unit):
+    """Consulta que agrega a série em baldes de tempo no servidor"""
+    expression = BUCKET_EXPRESSIONS.get(dialect.name)
+    if expression is None:
+        raise ValueError(f"Agrupamento no servidor não disponível para {dialect.name}")
+    quote = dialect.identifier_preparer.quote
+    bucket = expression(f"chart_source.{quote(x_name)}", unit)
+    return (f"SELECT {bucket} AS bucket, AVG({quote(y_name)}) AS value "
+            f"FROM ({sql.rstrip().rstrip(';')}) chart_source "
+            f"WHERE {quote(x_name)} IS NOT NULL AND {quote(y_name)} IS NOT NULL "
+            f"GROUP BY {bucket} ORDER BY 1")
+
+
+def server_buckets(engine, sql, values):
+    """Executa o agrupamento no servidor: os pontos já chegam reduzidos"""
+    with engine.connect() as conn:
+        rows = conn.execute(bind_parameters(sql, values)).fetchall()
+    xs = array("d", (numeric_value(r[0]) for r in rows))
+    ys = array("d", (float(r[1]) for r in rows))
+    return {"type": "Linha", "xs": xs, "ys": ys, "points": lttb(xs, ys)}
+
+
+def format_tick(value, kind):
+    if kind in TIME_KINDS:
+        return datetime.fromtimestamp(value).strftime("%d/%m/%Y %H:%M" if kind == "datetime" else "%d/%m/%Y")
+    if kind == "time":
+        return f"{int(value) // 3600:02d}:{int(value) % 3600 // 60:02d}:{int(value) % 60:02d}"
+    return f"{value:.6g}"
+
+
+#######################################################################
+# DESENHO
+#######################################################################
+
+class ChartView(QWidget):
+    """Gráfico desenhado com QPainter. Na linha, a roda do mouse aproxima,
+    arrastar desloca e duplo clique volta à série inteira."""
+
+    range_changed = pyqtSignal(float, float)  # Faixa de X visível após zoom/arraste
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(300)
+        self.data = None
+        self.x_kind = None
+        self.points = ([], [])
+        self.x_range = None
+        self.full_range = None
+        self.drag_x = None
+
+    def set_data(self, data, x_kind=None):
+        self.data = data
+        self.x_kind = x_kind
+        if data["type"] == "Linha":
+            xs = data["xs"]
+            self.full_range = (xs[0], xs[-1]) if len(xs) else (0.0, 1.0)
+            self.x_range = self.full_range
+            self.points = data["points"]
+        self.update()
+
+    def set_points(self, points):
+        """Pontos reamostrados para a faixa visível"""
+        self.points = points
+        self.update()
+
+    def plot_rect(self):
+        return QRectF(self.rect()).adjusted(MARGIN_LEFT, MARGIN, -MARGIN, -MARGIN_BOTTOM)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        if self.data is None:
+            return
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if self.data["type"] == "Linha":
+            self.paint_line(painter)
+        elif self.data["type"] == "Histograma":
+            self.paint_histogram(painter)
+        else:
+            self.paint_bars(painter)
+
+    def paint_axes(self, painter, rect, y_low, y_high, x_ticks, y_kind=None):
+        """Grade, rótulos do eixo Y e os rótulos de X informados [(posição em px, texto)]"""
+        painter.setPen(QPen(GRID_COLOR))
+        metrics = painter.fontMetrics()
+        for i in range(TICKS + 1):
+            y = rect.bottom() - rect.height() * i / TICKS
+            painter.setPen(QPen(GRID_COLOR))
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+            painter.setPen(QPen(Qt.GlobalColor.black))
+            value = y_low + (y_high - y_low) * i / TICKS
+            label = format_tick(value, y_kind) if y_kind in TIME_KINDS + ("time",) else f"{value:.5g}"
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(label) - 6, y + metrics.ascent() / 2), label)
+        painter.setPen(QPen(Qt.GlobalColor.black))
+        painter.drawRect(rect)
+        last_right = float("-inf")
+        for x, label in x_ticks:
+            width = metrics.horizontalAdvance(label)
+            left = min(max(x - width / 2, rect.left()), rect.right() - width)
+            if left > last_right + 8:  # Pula rótulos que se sobrepõem
+                painter.drawText(QPointF(left, rect.bottom() + metrics.height() + 4), label)
+                last_right = left + width
+
+    def paint_line(self, painter):
+        rect = self.plot_rect()
+        low, high = self.x_range
+        xs, ys = self.points
+        visible = [y for x, y in zip(xs, ys) if low <= x <= high] or [0.0]
+        y_low, y_high = min(visible), max(visible)
+        if y_high == y_low:
+            y_low, y_high = y_low - 1, y_high + 1
+        x_span = (high - low) or 1.0
+        x_ticks = [(rect.left() + rect.width() * i / TICKS, format_tick(low + x_span * i / TICKS, self.x_kind))
+                   for i in range(TICKS + 1)]
+        self.paint_axes(painter, rect, y_low, y_high, x_ticks, self.data.get("y_kind"))
+        sx, sy = rect.width() / x_span, rect.height() / (y_high - y_low)
+        polygon = QPolygonF([QPointF(rect.left() + (x - low) * sx, rect.bottom() - (y - y_low) * sy)
+                             for x, y in zip(xs, ys)])
+        painter.setClipRect(rect)
+        painter.setPen(QPen(PLOT_COLOR, 1.5))
+        painter.drawPolyline(polygon)
+
+    def paint_bar_rects(self, painter, rect, values, labels):
+        y_high = max(values, default=0) or 1.0
+        y_low = min(min(values, default=0), 0)
+        width = rect.width() / max(len(values), 1)
+        x_ticks = [(rect.left() + width * (i + 0.5), label) for i, label in enumerate(labels)]
+        self.paint_axes(painter, rect, y_low, y_high, x_ticks)
+        sy = rect.height() / (y_high - y_low)
+        zero = rect.bottom() + y_low * sy
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(PLOT_COLOR)
+        gap = 1 if width > 4 else 0
+        for i, value in enumerate(values):
+            top = zero - value * sy
+            painter.drawRect(QRectF(rect.left() + width * i + gap, min(top, zero), max(width - 2 * gap, 1), abs(zero - top)))
+
+    def paint_histogram(self, painter):
+        low, width, counts = self.data["low"], self.data["width"], self.data["counts"]
+        labels = [format_tick(low + width * i, self.data["kind"]) for i in range(len(counts))]
+        self.paint_bar_rects(painter, self.plot_rect(), counts, labels)
+
+    def paint_bars(self, painter):
+        self.paint_bar_rects(painter, self.plot_rect(), self.data["values"], self.data["labels"])
+
+    def data_x(self, pixel):
+        rect = self.plot_rect()
+        low, high = self.x_range
+        return low + (pixel - rect.left()) / rect.width() * (high - low)
+
+    def set_range(self, low, high):
+        full_low, full_high = self.full_range
+        span = min(high - low, full_high - full_low)
+        low = min(max(low, full_low), full_high - span)
+        self.x_range = (low, low + span)
+        self.update()
+        self.range_changed.emit(*self.x_range)
+
+    def wheelEvent(self, event):
+        if self.data is None or self.data["type"] != "Linha":
+            return
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        center = self.data_x(event.position().x())
+        low, high = self.x_range
+        self.set_range(center - (center - low) * factor, center + (high - center) * factor)
+
+    def mousePressEvent(self, event):
+        self.drag_x = event.position().x()
+
+    def mouseMoveEvent(self, event):
+        if self.drag_x is None or self.data is None or self.data["type"] != "Linha":
+            return
+        shift = self.data_x(self.drag_x) - self.data_x(event.position().x())
+        self.drag_x = event.position().x()
+        low, high = self.x_range
+        self.set_range(low + shift, high + shift)
+
+    def mouseReleaseEvent(self, event):
+        self.drag_x = None
+
+    def mouseDoubleClickEvent(self, event):
+        if self.data is not None and self.data["type"] == "Linha":
+            self.set_range(*self.full_range)
+
+
+#######################################################################
+# DIÁLOGO
+#######################################################################
+
+class ChartDialog(QDialog):
+    """Gráfico de linha, barras ou histograma das colunas do resultado.
+
+    Séries grandes são reduzidas a alguns milhares de vértices: no cliente
+    (LTTB, reamostrando a faixa visível após cada zoom) ou no servidor
+    (baldes de tempo com GROUP BY sobre a consulta).
+    """
+
+    def __init__(self, store, engine=None, query=None, parent=None):
+        """query: (SQL, valores dos parâmetros) que gerou o resultado, para agrupar no servidor"""
+        super().__init__(parent)
+        self.setWindowTitle("Gráfico")
+        self.resize(1000, 650)
+        self.store = store
+        self.engine = engine
+        self.query = query
+        self.worker = None
+        self.sample_worker = None
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Tipo:"))
+        self.type_combo = QComboBox()
+        self.type_combo.addItems(CHART_TYPES)
+        self.type_combo.currentTextChanged.connect(self.update_options)
+        top_layout.addWidget(self.type_combo)
+        self.x_label = QLabel("X:")
+        top_layout.addWidget(self.x_label)
+        self.x_combo = QComboBox()
+        top_layout.addWidget(self.x_combo, 1)
+        top_layout.addWidget(QLabel("Y:"))
+        self.y_combo = QComboBox()
+        top_layout.addWidget(self.y_combo, 1)
+        self.draw_btn = QPushButton("Desenhar")
+        self.draw_btn.clicked.connect(self.draw)
+        top_layout.addWidget(self.draw_btn)
+        layout.addLayout(top_layout)
+
+        server_layout = QHBoxLayout()
+        server_layout.addWidget(QLabel("Agrupar no servidor por:"))
+        self.bucket_combo = QComboBox()
+        self.bucket_combo.addItems(SERVER_BUCKETS)
+        server_layout.addWidget(self.bucket_combo)
+        self.server_btn = QPushButton("Agrupar no Servidor")
+        self.server_btn.setToolTip("Reexecuta a consulta com GROUP BY em baldes de tempo (média de Y)")
+        self.server_btn.clicked.connect(self.draw_server_buckets)
+        server_layout.addWidget(self.server_btn)
+        server_layout.addStretch(1)
+        layout.addLayout(server_layout)
+
+        self.chart = ChartView()
+        self.chart.range_changed.connect(lambda *_: self.resample_timer.start())
+        layout.addWidget(self.chart, 1)
+        self.status = QLabel(f"{store.row_count} linhas carregadas")
+        layout.addWidget(self.status)
+
+        self.resample_timer = QTimer(self)
+        self.resample_timer.setSingleShot(True)
+        self.resample_timer.setInterval(RESAMPLE_MS)
+        self.resample_timer.timeout.connect(self.resample)
+
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        layout.addWidget(close_btn)
+        self.update_options(self.type_combo.currentText())
+
+    def update_options(self, chart_type):
+        """Colunas aceitas em cada eixo conforme o tipo do gráfico"""
+        names = self.store.column_names
+        kinds = [self.store.kind(c) for c in range(self.store.column_count)]
+        numeric = [name for name, kind in zip(names, kinds) if kind in CONTINUOUS_KINDS]
+        self.x_combo.clear()
+        self.y_combo.clear()
+        self.x_combo.setVisible(chart_type != "Histograma")
+        self.x_label.setVisible(chart_type != "Histograma")
+        if chart_type == "Linha":
+            self.x_combo.addItems([ROW_NUMBER_OPTION] + numeric)
+            self.y_combo.addItems(numeric)
+        elif chart_type == "Barras":
+            self.x_combo.addItems(names)
+            self.y_combo.addItems([COUNT_OPTION] + [n for n, k in zip(names, kinds) if k in ("int", "float", "decimal", "bool")])
+        else:
+            self.y_combo.addItems(numeric)
+        # Série temporal: o primeiro eixo de data e a primeira coluna numérica
+        if chart_type == "Linha":
+            time_columns = [n for n, k in zip(names, kinds) if k in TIME_KINDS]
+            if time_columns:
+                self.x_combo.setCurrentText(time_columns[0])
+                values = [n for n, k in zip(names, kinds) if k in ("int", "float", "decimal")]
+                if values:
+                    self.y_combo.setCurrentText(values[0])
+        self.update_options_state()
+
+    def column_index(self, name):
+        return None if name in (ROW_NUMBER_OPTION, COUNT_OPTION) else self.store.column_names.index(name)
+
+    def draw(self):
+        """Prepara a série numa thread de trabalho e desenha"""
+        chart_type = self.type_combo.currentText()
+        if not self.y_combo.currentText() or (chart_type != "Histograma" and not self.x_combo.currentText()):
+            QMessageBox.warning(self, "Aviso", "O resultado não tem colunas para este gráfico.")
+            return
+        x_col = self.column_index(self.x_combo.currentText()) if chart_type != "Histograma" else None
+        y_col = self.column_index(self.y_combo.currentText())
+        x_kind = self.store.kind(x_col) if x_col is not None else None
+        self.start(chart_data, self.store, chart_type, x_col, y_col, x_kind=x_kind)
+
+    def draw_server_buckets(self):
+        x_name, y_name = self.x_combo.currentText(), self.y_combo.currentText()
+        if x_name == ROW_NUMBER_OPTION or self.store.kind(self.column_index(x_name)) not in TIME_KINDS:
+            QMessageBox.warning(self, "Aviso", "Escolha uma coluna de data/hora no eixo X.")
+            return
+        try:
+            sql = bucket_query(self.engine.dialect, self.query[0], x_name, y_name,
+                               SERVER_BUCKETS[self.bucket_combo.currentText()])
+        except ValueError as e:
+            QMessageBox.warning(self, "Aviso", str(e))
+            return
+        self.start(server_buckets, self.engine, sql, self.query[1], x_kind="datetime")
+
+    def start(self, fn, *args, x_kind=None):
+        if self.worker is not None:
+            return
+        self.draw_btn.setEnabled(False)
+        self.server_btn.setEnabled(False)
+        self.status.setText("Preparando o gráfico...")
+        started = perf_counter()
+        self.worker = start_worker(fn, *args,
+                                   on_finished=lambda data: self.on_finished(data, x_kind, perf_counter() - started),
+                                   on_error=self.on_error)
+
+    def on_finished(self, data, x_kind, elapsed):
+        self.worker = None
+        self.draw_btn.setEnabled(True)
+        self.update_options_state()
+        self.chart.set_data(data, x_kind)
+        if data["type"] == "Linha":
+            self.status.setText(f"{len(data['xs'])} pontos, {len(data['points'][0])} desenhados "
+                                f"({elapsed * 1000:.0f} ms) — roda do mouse aproxima, duplo clique volta")
+        elif data["type"] == "Histograma":
+            self.status.setText(f"{data['total']} valores em {len(data['counts'])} faixas ({elapsed * 1000:.0f} ms)")
+        else:
+            shown = len(data["values"])
+            suffix = f" (mostrando {shown} de {data['total']})" if data["total"] > shown else ""
+            self.status.setText(f"{data['total']} categorias{suffix} ({elapsed * 1000:.0f} ms)")
+
+    def update_options_state(self):
+        self.server_btn.setEnabled(self.engine is not None and self.query is not None and
+                                   self.type_combo.currentText() == "Linha")
+
+    def on_error(self, error):
+        self.worker = None
+        self.draw_btn.setEnabled(True)
+        self.update_options_state()
+        self.status.setText("")
+        QMessageBox.critical(self, "Erro", f"Não foi possível montar o gráfico:\n{str(error)}")
+
+    def resample(self):
+        """Reamostra a faixa visível após zoom/arraste (detalhes aparecem ao aproximar)"""
+        data = self.chart.data
+        if data is None or data["type"] != "Linha" or self.sample_worker is not None:
+            return
+        low, high = self.chart.x_range
+
+        def finished(points):
+            self.sample_worker = None
+            self.chart.set_points(points)
+            if self.chart.x_range != (low, high):
+                self.resample_timer.start()  # A faixa mudou durante a amostragem
+
+        def failed(error):
+            self.sample_worker = None
+
+        self.sample_worker = start_worker(visible_series, data["xs"], data["ys"], low, high,
+                                          on_finished=finished, on_error=failed)
+
+    def done(self, result):
+        self.resample_timer.stop()
+        for worker in (self.worker, self.sample_worker):
+            if worker is not None:
+                worker.cancel()
+        super().done(result)
@@ -0,0 +1,272 @@
+import json
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QLocale
+from PyQt6.QtGui import QColor
+from result_store import NUMERIC_KINDS
+from keyed_model import contiguous_runs
+
+# Limites de exibição para valores grandes
+MAX_TEXT_CHARS = 200
+MAX_BLOB_BYTES = 16
+
+
+#######################################################################
+# FORMATADORES POR TIPO (aplicados somente na exibição)
+#######################################################################
+
+def format_int(value, locale):
+    return locale.toString(value)
+
+
+def format_float(value, locale):
+    return locale.toString(value, 'g', 15)
+
+
+def format_decimal(value, locale):
+    """Formata Decimal sem perder precisão, com separadores do locale"""
+    text = f"{value:,f}"
+    return (text.replace(",", "\0")
+                .replace(".", locale.decimalPoint())
+                .replace("\0", locale.groupSeparator()))
+
+
+def format_bool(value, locale):
+    return "true" if value else "false"
+
+
+def format_temporal(value, locale):
+    """Datas e horários em ISO 8601"""
+    if hasattr(value, "date"):  # datetime
+        return value.isoformat(sep=" ")
+    return value.isoformat()
+
+
+def format_bytes(value, locale, size=None):
+    """Mostra os primeiros bytes em hexadecimal e o tamanho total"""
+    size = len(value) if size is None else size
+    head = bytes(value[:MAX_BLOB_BYTES]).hex()
+    suffix = "…" if size > MAX_BLOB_BYTES else ""
+    return f"0x{head}{suffix} ({size} bytes)"
+
+
+def format_text(value, locale):
+    if len(value) > MAX_TEXT_CHARS:
+        return value[:MAX_TEXT_CHARS] + "…"
+    return value
+
+
+def format_object(value, locale):
+    """JSON (dict/list) e demais objetos nativos"""
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    else:
+        text = str(value)
+    return format_text(text, locale)
+
+
+FORMATTERS = {
+    "int": format_int,
+    "float": format_float,
+    "decimal": format_decimal,
+    "bool": format_bool,
+    "datetime": format_temporal,
+    "date": format_temporal,
+    "time": format_temporal,
+    "interval": format_object,
+    "text": format_text,
+    "bytes": format_bytes,
+    "object": format_object,
+}
+
+
+def format_lob_preview(value, size, locale):
+    """Pré-visualização de um LOB lido truncado, com o tamanho total no servidor"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return format_bytes(value, locale, size)
+    # Texto e JSON: tamanho em caracteres
+    text = format_text(str(value), locale)
+    if size > len(str(value)):
+        return f"{text.rstrip('…')}… ({size} caracteres)"
+    return text
+
+
+def format_value(value, kind, locale):
+    """Converte um valor nativo no texto exibido na grade"""
+    if value is None:
+        return "NULL"
+    return FORMATTERS.get(kind, format_object)(value, locale)
+
+
+#######################################################################
+# CHAVE DAS LINHAS (atualização por diferença)
+#######################################################################
+
+def row_keys(store, key_columns):
+    """Chave de cada linha do armazenamento; repetições recebem o número da ocorrência"""
+    seen = {}
+    keys = []
+    for row in range(store.row_count):
+        key = tuple(store.columns[c].get(row) for c in key_columns)
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        keys.append((key, occurrence))
+    return keys
+
+
+def diff_key_columns(old, new):
+    """Primeira coluna quando ela identifica as linhas nos dois resultados, senão a linha inteira"""
+    for store in (old, new):
+        first = store.columns[0]
+        values = [first.get(row) for row in range(store.row_count)]
+        if first.null_count or len(set(values)) != len(values):
+            return list(range(new.column_count))
+    return [0]
+
+
+#######################################################################
+# MODELO DA GRADE DE RESULTADOS
+#######################################################################
+
+class ResultTableModel(QAbstractTableModel):
+    """Modelo Qt sobre um ResultStore: formata apenas as células exibidas"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = None
+        self.order = None  # Permutação das linhas quando ordenado
+        self.sort_key = (-1, Qt.SortOrder.AscendingOrder)
+        self.locale = QLocale()
+
+    def set_store(self, store):
+        """Troca o resultado exibido"""
+        self.beginResetModel()
+        self.store = store
+        self.order = None
+        self.sort_key = (-1, Qt.SortOrder.AscendingOrder)
+        self.endResetModel()
+
+    def update_store(self, store):
+        """Troca o resultado por uma nova leitura da mesma consulta, emitindo só
+        rowsRemoved, dataChanged e rowsInserted do que mudou (sem reset).
+
+        As linhas são comparadas pela chave (primeira coluna, se única, ou a
+        linha inteira); as que continuam mantêm a posição e as novas entram
+        no fim, ou na posição da ordenação ativa.
+        """
+        if self.store is None or store.column_names != self.store.column_names or not store.column_count:
+            self.set_store(store)
+            return
+        old = self.store
+        key_columns = diff_key_columns(old, store)
+        new_rows = {key: row for row, key in enumerate(row_keys(store, key_columns))}
+        old_keys = row_keys(old, key_columns)
+        if self.order is None:
+            self.order = list(range(old.row_count))
+
+        # 1. Remove as linhas que sumiram (de baixo para cima, em faixas)
+        removed = [i for i, row in enumerate(self.order) if old_keys[row] not in new_rows]
+        for first, last in contiguous_runs(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.order[first:last + 1]
+            self.endRemoveRows()
+
+        # 2. Troca o armazenamento e avisa só as células alteradas
+        order = [new_rows.pop(old_keys[row]) for row in self.order]
+        changed = []
+        for i, (old_row, new_row) in enumerate(zip(self.order, order)):
+            columns = [c for c in range(store.column_count)
+                       if old.columns[c].get(old_row) != store.columns[c].get(new_row)]
+            if columns:
+                changed.append((i, columns[0], columns[-1]))
+        self.store = store
+        self.order = order
+        for row, first, last in changed:
+            self.dataChanged.emit(self.index(row, first), self.index(row, last))
+
+        # 3. Acrescenta as novas linhas no fim
+        if new_rows:
+            first = len(self.order)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self.order.extend(sorted(new_rows.values()))
+            self.endInsertRows()
+
+        if self.sort_key[0] >= 0:
+            self.sort(*self.sort_key)
+
+    def append_rows(self, rows):
+        """Acrescenta um lote de linhas no fim do resultado exibido (carga em partes)"""
+        if not rows:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.store.append_rows(rows)
+        if self.order is not None:
+            self.order.extend(range(self.store.row_count - len(rows), self.store.row_count))
+        self.endInsertRows()
+
+    def store_row(self, row):
+        """Converte a linha exibida na linha do armazenamento"""
+        return self.order[row] if self.order is not None else row
+
+    def native_value(self, row, col):
+        """Valor nativo (não formatado) da célula exibida"""
+        return self.store.value(self.store_row(row), col)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.store is None:
+            return 0
+        return len(self.order) if self.order is not None else self.store.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.store is None:
+            return 0
+        return self.store.column_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self.store is None:
+            return None
+
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.native_value(index.row(), col)
+            sizes = self.store.lob_sizes.get(col)
+            if sizes is not None and value is not None:
+                return format_lob_preview(value, sizes[self.store_row(index.row())], self.locale)
+            return format_value(value, self.store.kind(col), self.locale)
+        if role == Qt.ItemDataRole.UserRole:
+            return self.native_value(index.row(), col)
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.store.kind(col) in NUMERIC_KINDS:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role == Qt.ItemDataRole.ForegroundRole and self.native_value(index.row(), col) is None:
+            return QColor(Qt.GlobalColor.gray)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or self.store is None:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.store.columns[section].name
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Ordena pelos valores nativos (numérico, data...) e não pelo texto"""
+        if self.store is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        store_rows = [self.store_row(index.row()) for index in persistent]
+
+        self.sort_key = (column, order)
+        if column < 0:
+            self.order = None
+        else:
+            descending = order == Qt.SortOrder.DescendingOrder
+            self.order = self.store.sorted_rows(column, descending)
+
+        # Mantém seleção/índices persistentes apontando para as mesmas linhas
+        if persistent:
+            position = {row: i for i, row in enumerate(self.order)} if self.order is not None else None
+            self.changePersistentIndexList(persistent, [
+                self.index(position[row] if position else row, index.column())
+                for row, index in zip(store_rows, persistent)
+            ])
+        self.layoutChanged.emit()
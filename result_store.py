@@ -0,0 +1,178 @@
+from array import array
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import compress
+from operator import not_
+
+# Tipos Python que cabem em buffers compactos do módulo array
+ARRAY_KINDS = {
+    bool: ("bool", "b"),
+    int: ("int", "q"),
+    float: ("float", "d"),
+}
+
+# Tipos mantidos como objetos nativos (lista), apenas classificados
+LIST_KINDS = {
+    Decimal: "decimal",
+    datetime: "datetime",
+    date: "date",
+    time: "time",
+    timedelta: "interval",
+    str: "text",
+    bytes: "bytes",
+    bytearray: "bytes",
+    memoryview: "bytes",
+}
+
+NUMERIC_KINDS = ("int", "float", "decimal")
+TYPECODES = {kind: typecode for kind, typecode in ARRAY_KINDS.values()}
+
+
+def kind_of(value_type):
+    """Retorna o tipo lógico da coluna para um tipo Python"""
+    if value_type in ARRAY_KINDS:
+        return ARRAY_KINDS[value_type][0]
+    return LIST_KINDS.get(value_type, "object")
+
+
+class TypedColumn:
+    """Coluna de resultado com valores nativos em buffer compacto e máscara de nulos"""
+
+    def __init__(self, name):
+        self.name = name
+        self.kind = None          # Definido pelo primeiro valor não nulo
+        self.values = []          # array tipado ou lista de objetos nativos
+        self.nulls = bytearray()  # 1 = NULL na linha correspondente
+        self.null_count = 0
+
+    def __len__(self):
+        return len(self.nulls)
+
+    def extend(self, values):
+        """Acrescenta uma sequência de valores (uma fatia da coluna)"""
+        types = set(map(type, values))
+        types.discard(type(None))
+        null_count = values.count(None)
+
+        # Determina (ou promove) o tipo lógico da coluna
+        if types:
+            kinds = {kind_of(t) for t in types}
+            new_kind = kinds.pop() if len(kinds) == 1 else "object"
+            if self.kind is None:
+                self._start(new_kind)
+            elif new_kind != self.kind:
+                self._promote()
+
+        if null_count:
+            self.nulls.extend(v is None for v in values)
+            self.null_count += null_count
+        else:
+            self.nulls.extend(bytes(len(values)))
+
+        if self.kind in TYPECODES:
+            before = len(self.values)
+            try:
+                self.values.extend([0 if v is None else v for v in values] if null_count else values)
+            except OverflowError:
+                # Inteiro maior que 64 bits: volta para objetos nativos
+                del self.values[before:]
+                self._promote()
+                self.values.extend(values)
+        elif self.kind == "bytes":
+            self.values.extend(bytes(v) if type(v) is memoryview else v for v in values)
+        else:
+            # Objetos nativos, ou marcadores enquanto a coluna só tem nulos
+            self.values.extend(values)
+
+    def _start(self, kind):
+        """Cria o buffer para o tipo detectado, preservando nulos anteriores"""
+        self.kind = kind
+        if kind in TYPECODES:
+            self.values = array(TYPECODES[kind], bytes(array(TYPECODES[kind]).itemsize * len(self.values)))
+
+    def _promote(self):
+        """Converte a coluna para lista de objetos quando os tipos se misturam"""
+        if isinstance(self.values, array):
+            self.values = [None if n else v for v, n in zip(self.values, self.nulls)]
+        self.kind = "object"
+
+    def get(self, row):
+        """Retorna o valor nativo da linha (None para NULL)"""
+        if self.nulls[row]:
+            return None
+        return self.values[row]
+
+    def set(self, row, value):
+        """Substitui o valor de uma linha, promovendo o tipo se necessário"""
+        if value is not None and self.kind is not None and kind_of(type(value)) != self.kind:
+            self._promote()
+        elif value is not None and self.kind is None:
+            self._start(kind_of(type(value)))
+        was_null = self.nulls[row]
+        self.nulls[row] = value is None
+        self.null_count += (value is None) - was_null
+        if value is None and isinstance(self.values, array):
+            value = 0
+        self.values[row] = value
+
+    def non_null_rows(self, start=0, stop=None):
+        """Índices das linhas não nulas no intervalo"""
+        stop = len(self) if stop is None else stop
+        if not self.null_count:
+            return range(start, stop)
+        return list(compress(range(start, stop), map(not_, self.nulls[start:stop])))
+
+
+class ResultStore:
+    """Armazena um resultado em colunas tipadas, sem converter para texto"""
+
+    def __init__(self, column_names):
+        self.columns = [TypedColumn(name) for name in column_names]
+        self.row_count = 0
+        self.lob_sizes = {}  # Coluna -> tamanho total dos LOBs lidos truncados
+
+    @classmethod
+    def from_rows(cls, column_names, rows):
+        """Cria o armazenamento a partir das linhas retornadas pelo banco"""
+        store = cls(column_names)
+        store.append_rows(rows)
+        return store
+
+    @property
+    def column_names(self):
+        return [column.name for column in self.columns]
+
+    @property
+    def column_count(self):
+        return len(self.columns)
+
+    def append_rows(self, rows):
+        """Acrescenta linhas transpondo-as para as colunas"""
+        if not rows:
+            return
+        for column, values in zip(self.columns, zip(*rows)):
+            column.extend(values)
+        self.row_count += len(rows)
+
+    def value(self, row, col):
+        """Valor nativo de uma célula"""
+        return self.columns[col].get(row)
+
+    def row(self, row):
+        """Valores nativos de uma linha inteira"""
+        return tuple(column.get(row) for column in self.columns)
+
+    def kind(self, col):
+        return self.columns[col].kind
+
+    def sorted_rows(self, col, descending=False):
+        """Ordem das linhas pela coluna usando os valores nativos (nulos primeiro)"""
+        column = self.columns[col]
+        nulls = [i for i in range(self.row_count) if column.nulls[i]] if column.null_count else []
+        rows = list(column.non_null_rows(0, self.row_count))
+        try:
+            rows.sort(key=column.values.__getitem__, reverse=descending)
+        except TypeError:
+            # Tipos não comparáveis entre si (coluna mista): compara como texto
+            rows.sort(key=lambda i: str(column.values[i]), reverse=descending)
+        return rows + nulls if descending else nulls + rows
@@ -0,0 +1,420 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QPlainTextEdit,
+                             QTreeWidget, QTreeWidgetItem, QSplitter, QFileDialog, QMessageBox)
+from PyQt6.QtGui import QFontDatabase, QColor
+from PyQt6.QtCore import Qt
+from sqlalchemy import MetaData, Index, PrimaryKeyConstraint, UniqueConstraint, ForeignKeyConstraint
+from sqlalchemy.schema import (CreateTable, CreateIndex, DropIndex, CreateColumn, AddConstraint, DropConstraint)
+from connection import dispose_after, favorite_engine
+from reflection import reflect_schema, plain_indexes, table_from_info, stub_table
+from workers import start_worker
+
+# Tipos de diferença (o script transforma o destino no esquema da origem)
+ONLY_SOURCE = "somente na origem"
+ONLY_TARGET = "somente no destino"
+CHANGED = "diferente"
+
+DIFF_COLORS = {ONLY_SOURCE: QColor("darkgreen"), ONLY_TARGET: QColor("red"), CHANGED: QColor("darkorange")}
+
+
+#######################################################################
+# COMPARAÇÃO
+#######################################################################
+
+def type_sql(column_type, dialect):
+    """Tipo da coluna como texto no dialeto informado"""
+    try:
+        return column_type.compile(dialect=dialect)
+    except Exception:
+        return type(column_type).__name__.upper()
+
+
+def describe_column(column, dialect):
+    """Definição comparável de uma coluna refletida"""
+    return {
+        "type": type_sql(column["type"], dialect),
+        "nullable": bool(column.get("nullable", True)),
+        "default": (str(column["default"]) if column.get("default") is not None else None),
+    }
+
+
+def constraint_key(constraint, fields):
+    """Nome da restrição ou, sem nome, a própria definição"""
+    return constraint.get("name") or tuple(tuple(constraint.get(f) or ()) if isinstance(constraint.get(f), list)
+                                           else constraint.get(f) for f in fields)
+
+
+def describe_index(index):
+    return {"columns": list(index["column_names"]), "unique": bool(index.get("unique"))}
+
+
+def describe_fk(fk):
+    return {"columns": list(fk["constrained_columns"]), "referred_table": fk["referred_table"],
+            "referred_columns": list(fk["referred_columns"])}
+
+
+def diff_objects(entries, table, kind, source, target):
+    """Compara dois dicionários {nome: descrição} do mesmo tipo de objeto"""
+    for name in sorted(source.keys() | target.keys(), key=str):
+        if name not in target:
+            entries.append({"table": table, "kind": kind, "name": name, "change": ONLY_SOURCE,
+                            "source": source[name], "target": None})
+        elif name not in source:
+            entries.append({"table": table, "kind": kind, "name": name, "change": ONLY_TARGET,
+                            "source": None, "target": target[name]})
+        elif source[name] != target[name]:
+            entries.append({"table": table, "kind": kind, "name": name, "change": CHANGED,
+                            "source": source[name], "target": target[name]})
+
+
+def diff_schemas(source, target, source_dialect, target_dialect):
+    """Diferenças estruturadas entre dois esquemas refletidos (reflect_schema)"""
+    entries = []
+    for table in sorted(source.keys() | target.keys()):
+        if table not in target:
+            entries.append({"table": table, "kind": "tabela", "name": table, "change": ONLY_SOURCE,
+                            "source": source[table], "target": None})
+            continue
+        if table not in source:
+            entries.append({"table": table, "kind": "tabela", "name": table, "change": ONLY_TARGET,
+                            "source": None, "target": target[table]})
+            continue
+        a, b = source[table], target[table]
+        diff_objects(entries, table, "coluna",
+                     {c["name"]: describe_column(c, source_dialect) for c in a["columns"]},
+                     {c["name"]: describe_column(c, target_dialect) for c in b["columns"]})
+        pk_a = list(a["primary_key"].get("constrained_columns") or [])
+        pk_b = list(b["primary_key"].get("constrained_columns") or [])
+        if pk_a != pk_b:
+            entries.append({"table": table, "kind": "chave primária", "name": a["primary_key"].get("name")
+                            or b["primary_key"].get("name") or "", "change": CHANGED if pk_a and pk_b else
+                            ONLY_SOURCE if pk_a else ONLY_TARGET, "source": pk_a, "target": pk_b})
+        diff_objects(entries, table, "índice",
+                     {constraint_key(i, ["column_names"]): describe_index(i) for i in plain_indexes(a)},
+                     {constraint_key(i, ["column_names"]): describe_index(i) for i in plain_indexes(b)})
+        diff_objects(entries, table, "restrição única",
+                     {constraint_key(u, ["column_names"]): list(u["column_names"]) for u in a["unique_constraints"]},
+                     {constraint_key(u, ["column_names"]): list(u["column_names"]) for u in b["unique_constraints"]})
+        fk_fields = ["constrained_columns", "referred_table", "referred_columns"]
+        diff_objects(entries, table, "chave estrangeira",
+                     {constraint_key(f, fk_fields): describe_fk(f) for f in a["foreign_keys"]},
+                     {constraint_key(f, fk_fields): describe_fk(f) for f in b["foreign_keys"]})
+    return entries
+
+
+def compare_schemas(source_engine, target_engine, source_schema=None, target_schema=None):
+    """Reflete os dois bancos ao mesmo tempo e retorna (diferenças, esquema da origem).
+
+    Gerador: produz (lado, refletidas, total) conforme os lotes terminam.
+    """
+    progress = queue.Queue()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {
+            side: pool.submit(reflect_schema, engine, schema,
+                              lambda done, total, side=side: progress.put((side, done, total)))
+            for side, engine, schema in (("origem", source_engine, source_schema),
+                                         ("destino", target_engine, target_schema))
+        }
+        while not all(f.done() for f in futures.values()) or not progress.empty():
+            try:
+                yield progress.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        source, target = futures["origem"].result(), futures["destino"].result()
+    return diff_schemas(source, target, source_engine.dialect, target_engine.dialect), source
+
+
+#######################################################################
+# SCRIPT DE ALTERAÇÃO
+#######################################################################
+
+def alter_column(table, column, dialect, change):
+    """ALTER COLUMN para tipo/nulidade/padrão conforme o dialeto do destino"""
+    name = dialect.identifier_preparer.format_table(table)
+    col = dialect.identifier_preparer.format_column(column)
+    col_type = type_sql(column.type, dialect)
+    if dialect.name == "postgresql":
+        statements = []
+        if change["source"]["type"] != change["target"]["type"]:
+            statements.append(f"ALTER TABLE {name} ALTER COLUMN {col} TYPE {col_type}")
+        if change["source"]["nullable"] != change["target"]["nullable"]:
+            statements.append(f"ALTER TABLE {name} ALTER COLUMN {col} {'DROP' if column.nullable else 'SET'} NOT NULL")
+        if change["source"]["default"] != change["target"]["default"]:
+            default = change["source"]["default"]
+            statements.append(f"ALTER TABLE {name} ALTER COLUMN {col} " +
+                              (f"SET DEFAULT {default}" if default is not None else "DROP DEFAULT"))
+        return statements
+    if dialect.name == "mssql":
+        statements = [f"ALTER TABLE {name} ALTER COLUMN {col} {col_type} {'NULL' if column.nullable else 'NOT NULL'}"]
+        if change["source"]["default"] != change["target"]["default"]:
+            statements.append(f"-- Padrão de {col} diferente: ajuste a restrição DEFAULT manualmente")
+        return statements
+    if dialect.name == "mysql":
+        return [f"ALTER TABLE {name} MODIFY COLUMN {CreateColumn(column).compile(dialect=dialect)}"]
+    return [f"-- {name}.{col}: alteração de coluna não suportada para {dialect.name}"]
+
+
+def alter_script(entries, source, dialect):
+    """Gera o script que leva o destino ao esquema da origem.
+
+    Remoções de tabelas e colunas (perda de dados) saem comentadas.
+    """
+    metadata = MetaData()  # Tabelas completas da origem
+    stubs = MetaData()     # Tabelas mínimas para remover objetos do destino
+    drops, creates, alters, constraints = [], [], [], []
+
+    def compile_ddl(element):
+        return str(element.compile(dialect=dialect)).strip()
+
+    def attach(table, constraint):
+        # A restrição precisa estar ligada à tabela para compilar
+        table.append_constraint(constraint)
+        return constraint
+
+    for entry in entries:
+        table_name, kind, change = entry["table"], entry["kind"], entry["change"]
+        if kind == "tabela":
+            if change == ONLY_SOURCE:
+                info = source[table_name]
+                table = table_from_info(metadata, table_name, info)
+                creates.append(compile_ddl(CreateTable(table)))
+                for index in plain_indexes(info):
+                    if None not in index["column_names"]:
+                        creates.append(compile_ddl(CreateIndex(Index(index["name"], *[table.c[c] for c in index["column_names"]],
+                                                                     unique=index.get("unique", False)))))
+                # Restrições entram depois de todas as tabelas criadas
+                for unique in info["unique_constraints"]:
+                    constraints.append(compile_ddl(AddConstraint(attach(table, UniqueConstraint(
+                        *unique["column_names"], name=unique.get("name"))))))
+                for fk in info["foreign_keys"]:
+                    referred = fk["referred_table"]
+                    if referred in source:
+                        table_from_info(metadata, referred, source[referred])
+                    else:
+                        stub_table(metadata, referred, fk["referred_columns"])
+                    constraints.append(compile_ddl(AddConstraint(attach(table, ForeignKeyConstraint(
+                        fk["constrained_columns"], [f"{referred}.{c}" for c in fk["referred_columns"]],
+                        name=fk.get("name"))))))
+            else:
+                drops.append(f"-- DROP TABLE {dialect.identifier_preparer.quote(table_name)}")
+            continue
+
+        info = source.get(table_name)
+        if kind == "coluna":
+            if change == ONLY_TARGET:
+                drops.append(f"-- ALTER TABLE {dialect.identifier_preparer.quote(table_name)} "
+                             f"DROP COLUMN {dialect.identifier_preparer.quote(entry['name'])}")
+                continue
+            table = table_from_info(metadata, table_name, info)
+            column = table.c[entry["name"]]
+            if change == ONLY_SOURCE:
+                alters.append(f"ALTER TABLE {dialect.identifier_preparer.format_table(table)} "
+                              f"ADD {compile_ddl(CreateColumn(column))}")
+            else:
+                alters.extend(alter_column(table, column, dialect, entry))
+        elif kind == "índice":
+            definition = entry["source"] or entry["target"]
+            if None in definition["columns"]:
+                alters.append(f"-- Índice de expressão {entry['name']} em {table_name}: ajuste manualmente")
+                continue
+            if entry["target"] is not None:
+                table = stub_table(stubs, table_name, entry["target"]["columns"])
+                drops.append(compile_ddl(DropIndex(Index(entry["name"], *[table.c[c] for c in entry["target"]["columns"]]))))
+            if entry["source"] is not None:
+                table = table_from_info(metadata, table_name, info)
+                constraints.append(compile_ddl(CreateIndex(Index(entry["name"], *[table.c[c] for c in entry["source"]["columns"]],
+                                                                 unique=entry["source"]["unique"]))))
+        else:
+            name = entry["name"] if isinstance(entry["name"], str) and entry["name"] else None
+            build = {
+                "chave primária": lambda cols: PrimaryKeyConstraint(*cols, name=name),
+                "restrição única": lambda cols: UniqueConstraint(*cols, name=name),
+                "chave estrangeira": lambda d: ForeignKeyConstraint(
+                    d["columns"], [f"{d['referred_table']}.{c}" for c in d["referred_columns"]], name=name),
+            }[kind]
+            if entry["target"] and name is None:
+                drops.append(f"-- {kind} sem nome em {table_name}: remova manualmente")
+            elif entry["target"]:
+                definition = entry["target"]
+                table = stub_table(stubs, table_name, definition["columns"] if isinstance(definition, dict) else definition)
+                if kind == "chave estrangeira":
+                    stub_table(stubs, definition["referred_table"], definition["referred_columns"])
+                drops.append(compile_ddl(DropConstraint(attach(table, build(definition)))))
+            if entry["source"]:
+                definition = entry["source"]
+                table = table_from_info(metadata, table_name, info)
+                if kind == "chave estrangeira":
+                    referred = definition["referred_table"]
+                    if referred in source:
+                        table_from_info(metadata, referred, source[referred])
+                    else:
+                        stub_table(metadata, referred, definition["referred_columns"])
+                constraints.append(compile_ddl(AddConstraint(attach(table, build(definition)))))
+
+    sections = [("Remoções (revise antes de executar)", drops), ("Novas tabelas", creates),
+                ("Colunas", alters), ("Chaves, restrições e índices", constraints)]
+    lines = []
+    for title, statements in sections:
+        if statements:
+            lines.append(f"-- {title}")
+            lines.extend(s if s.startswith("--") else f"{s};" for s in statements)
+            lines.append("")
+    return "\n".join(lines)
+
+
+#######################################################################
+# DIÁLOGO
+#######################################################################
+
+class SchemaDiffDialog(QDialog):
+    """Compara o esquema de dois favoritos e gera o script de alteração"""
+
+    def __init__(self, favorites, crypto, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Comparar Esquemas")
+        self.resize(1000, 650)
+        self.favorites = favorites
+        self.crypto = crypto
+        self.worker = None
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        labels = [f"{f['name']} ({f['db_type']} - {f['host']}/{f['db_name']})" for f in favorites]
+        self.source_combo = QComboBox()
+        self.source_combo.addItems(labels)
+        self.target_combo = QComboBox()
+        self.target_combo.addItems(labels)
+        if len(labels) > 1:
+            self.target_combo.setCurrentIndex(1)
+        top_layout.addWidget(QLabel("Origem:"))
+        top_layout.addWidget(self.source_combo, 1)
+        top_layout.addWidget(QLabel("Destino:"))
+        top_layout.addWidget(self.target_combo, 1)
+        self.compare_btn = QPushButton("Comparar")
+        self.compare_btn.clicked.connect(self.compare)
+        top_layout.addWidget(self.compare_btn)
+        layout.addLayout(top_layout)
+
+        self.status = QLabel("Selecione os favoritos e clique em Comparar")
+        layout.addWidget(self.status)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Objeto", "Diferença", "Origem", "Destino"])
+        self.tree.setColumnWidth(0, 260)
+        self.tree.setColumnWidth(1, 140)
+        self.tree.setColumnWidth(2, 260)
+        splitter.addWidget(self.tree)
+        self.script = QPlainTextEdit(readOnly=True)
+        self.script.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        splitter.addWidget(self.script)
+        layout.addWidget(splitter, 1)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch(1)
+        self.save_btn = QPushButton("Salvar script")
+        self.save_btn.setEnabled(False)
+        self.save_btn.clicked.connect(self.save_script)
+        btn_layout.addWidget(self.save_btn)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+    def compare(self):
+        """Reflete os dois favoritos numa thread de trabalho"""
+        if self.source_combo.currentIndex() == self.target_combo.currentIndex():
+            QMessageBox.warning(self, "Aviso", "Selecione favoritos diferentes para origem e destino.")
+            return
+        source = None
+        try:
+            source = favorite_engine(self.favorites[self.source_combo.currentIndex()], self.crypto)
+            target = favorite_engine(self.favorites[self.target_combo.currentIndex()], self.crypto)
+        except Exception as e:
+            if source is not None:
+                source.dispose()
+            QMessageBox.critical(self, "Erro", f"Não foi possível criar as conexões:\n{str(e)}")
+            return
+        self.tree.clear()
+        self.script.clear()
+        self.save_btn.setEnabled(False)
+        self.compare_btn.setEnabled(False)
+        self.status.setText("Refletindo esquemas...")
+        self.reflected = {}
+        # Os engines criados para a comparação são liberados ao fim dela
+        self.worker = start_worker(dispose_after, compare_schemas(source, target), source, target,
+                                   on_progress=self.on_progress,
+                                   on_finished=lambda result: self.on_finished(result, target.dialect),
+                                   on_error=self.on_error)
+
+    def on_progress(self, progress):
+        side, done, total = progress
+        self.reflected[side] = f"{side}: {done}/{total} tabelas"
+        self.status.setText("Refletindo esquemas... " + ", ".join(self.reflected.values()))
+
+    def on_finished(self, result, dialect):
+        self.worker = None
+        self.compare_btn.setEnabled(True)
+        entries, source = result
+        tables = {}
+        for entry in entries:
+            parent = tables.get(entry["table"])
+            if parent is None:
+                parent = tables[entry["table"]] = QTreeWidgetItem([entry["table"]])
+                self.tree.addTopLevelItem(parent)
+            if entry["kind"] == "tabela":
+                parent.setText(1, entry["change"])
+                parent.setForeground(1, DIFF_COLORS[entry["change"]])
+                continue
+            item = QTreeWidgetItem([f"{entry['kind']} {entry['name']}", entry["change"],
+                                    self.describe(entry["source"]), self.describe(entry["target"])])
+            item.setForeground(1, DIFF_COLORS[entry["change"]])
+            parent.addChild(item)
+            parent.setExpanded(True)
+
+        self.status.setText(f"{len(entries)} diferenças em {len(tables)} tabelas" if entries
+                            else "Os esquemas são iguais")
+        try:
+            self.script.setPlainText(alter_script(entries, source, dialect))
+        except Exception as e:
+            self.script.setPlainText(f"-- Erro ao gerar o script: {e}")
+        self.save_btn.setEnabled(bool(entries))
+
+    def describe(self, definition):
+        """Resumo de uma definição para a árvore"""
+        if definition is None:
+            return ""
+        if isinstance(definition, dict):
+            if "type" in definition:
+                parts = [definition["type"], "NULL" if definition["nullable"] else "NOT NULL"]
+                if definition["default"] is not None:
+                    parts.append(f"DEFAULT {definition['default']}")
+                return " ".join(parts)
+            if "referred_table" in definition:
+                return (f"({', '.join(definition['columns'])}) → "
+                        f"{definition['referred_table']}({', '.join(definition['referred_columns'])})")
+            if "unique" in definition:
+                return ("UNIQUE " if definition["unique"] else "") + f"({', '.join(map(str, definition['columns']))})"
+        return f"({', '.join(map(str, definition))})"
+
+    def on_error(self, error):
+        self.worker = None
+        self.compare_btn.setEnabled(True)
+        self.status.setText(f"Erro ao comparar: {error}")
+
+    def save_script(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar script", "alteracoes.sql", "SQL (*.sql)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.script.toPlainText())
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível salvar o arquivo:\n{str(e)}")
+
+    def done(self, result):
+        # Ignora o resultado de uma comparação ainda em andamento
+        if self.worker:
+            self.worker.cancel()
+        super().done(result)
@@ -0,0 +1,170 @@
+from decimal import Decimal
+from itertools import compress
+from operator import not_
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QTimer, QLocale
+from result_store import NUMERIC_KINDS, kind_of
+from result_model import format_value
+from workers import start_worker
+
+# Linhas processadas por bloco antes de publicar um resultado parcial
+STATS_CHUNK_ROWS = 262144
+# Espera após a última mudança de seleção antes de calcular (ms)
+STATS_DEBOUNCE_MS = 120
+
+
+def column_values(column, rows):
+    """Valores não nulos das linhas do armazenamento (range ou lista) e a contagem de nulos"""
+    if isinstance(rows, range):
+        values = column.values[rows.start:rows.stop]
+        nulls = column.nulls[rows.start:rows.stop]
+    else:
+        values = list(map(column.values.__getitem__, rows))
+        nulls = bytes(map(column.nulls.__getitem__, rows))
+    null_count = nulls.count(1) if column.null_count else 0
+    if null_count:
+        values = list(compress(values, map(not_, nulls)))
+    return values, null_count
+
+
+class SelectionStats:
+    """Acumulador incremental das estatísticas de uma seleção"""
+
+    def __init__(self):
+        self.cells = 0
+        self.null_count = 0
+        self.distinct = set()
+        self.totals = {}          # Soma por tipo numérico (int/float/decimal)
+        self.numeric_count = 0
+        self.minimum = None
+        self.maximum = None
+        self.extreme_kind = None  # Tipo usado em mín/máx (numérico ou único não numérico)
+
+    def add(self, kind, values, null_count, cells):
+        """Agrega um bloco de valores nativos de uma mesma coluna"""
+        self.cells += cells
+        self.null_count += null_count
+        if not values:
+            return
+        try:
+            self.distinct.update(values)
+        except TypeError:
+            # Valores não hasheáveis (ex.: JSON como dict)
+            self.distinct.update(map(repr, values))
+
+        if kind in NUMERIC_KINDS:
+            self.totals[kind] = self.totals.get(kind, 0) + sum(values)
+            self.numeric_count += len(values)
+            self._update_extremes("numeric", min(values), max(values))
+        elif kind not in ("object", "bytes", None) and self.extreme_kind in (None, kind):
+            self._update_extremes(kind, min(values), max(values))
+
+    def _update_extremes(self, kind, low, high):
+        if self.extreme_kind not in (None, kind):
+            if kind != "numeric":
+                return
+            # Colunas numéricas têm prioridade sobre as demais
+            self.minimum = self.maximum = None
+        self.extreme_kind = kind
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    def total(self):
+        """Soma combinada dos tipos numéricos"""
+        if not self.totals:
+            return None
+        if "float" in self.totals:
+            return sum(float(v) for v in self.totals.values())
+        return sum(self.totals.values(), Decimal(0) if "decimal" in self.totals else 0)
+
+    def summary(self, locale, done=True):
+        """Texto exibido na barra de status"""
+        def fmt(value):
+            return format_value(value, kind_of(type(value)), locale)
+
+        parts = [f"Contagem: {fmt(self.cells)}", f"Distintos: {fmt(len(self.distinct))}",
+                 f"Nulos: {fmt(self.null_count)}"]
+        total = self.total()
+        if total is not None:
+            average = total / self.numeric_count
+            parts += [f"Soma: {fmt(total)}", f"Média: {fmt(average)}"]
+        if self.minimum is not None:
+            parts += [f"Mín: {fmt(self.minimum)}", f"Máx: {fmt(self.maximum)}"]
+        text = "   ".join(parts)
+        return text if done else text + "   (calculando...)"
+
+
+def selection_snapshot(model, ranges):
+    """Linhas do armazenamento e colunas (com o tipo) de cada faixa selecionada.
+
+    Tirada na thread da interface: os lotes que chegam (append_rows) e a
+    reexecução fixada (update_store) mudam a ordem exibida do modelo
+    enquanto a thread de trabalho percorre a seleção.
+    """
+    store, order = model.store, model.order
+    snapshot = []
+    for top, bottom, left, right in ranges:
+        rows = range(top, bottom + 1) if order is None else order[top:bottom + 1]
+        columns = [(store.columns[col], store.columns[col].kind) for col in range(left, right + 1)]
+        snapshot.append((rows, columns))
+    return snapshot
+
+
+def compute_selection_stats(selection, locale, chunk_rows=STATS_CHUNK_ROWS):
+    """Gerador: percorre a seleção (selection_snapshot) em blocos e produz o resumo parcial/final"""
+    stats = SelectionStats()
+    pending = 0
+    for rows, columns in selection:
+        for column, kind in columns:
+            for start in range(0, len(rows), chunk_rows):
+                chunk = rows[start:start + chunk_rows]
+                values, null_count = column_values(column, chunk)
+                stats.add(kind, values, null_count, len(chunk))
+                pending += len(chunk)
+                if pending >= chunk_rows:
+                    pending = 0
+                    yield stats.summary(locale, done=False)
+    yield stats.summary(locale)
+
+
+class SelectionStatsLabel(QLabel):
+    """Rótulo da barra de status com as estatísticas da seleção das grades"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.locale = QLocale()
+        self.worker = None
+        self.view = None
+        self.timer = QTimer(self, singleShot=True, interval=STATS_DEBOUNCE_MS)
+        self.timer.timeout.connect(self.start_computation)
+
+    def watch(self, view):
+        """Passa a acompanhar a seleção de uma grade de resultados"""
+        view.selectionModel().selectionChanged.connect(lambda *_: self.schedule(view))
+        view.model().modelReset.connect(self.clear)
+
+    def schedule(self, view):
+        self.view = view
+        self.cancel()
+        self.timer.start()
+
+    def cancel(self):
+        if self.worker:
+            self.worker.cancel()
+            self.worker = None
+
+    def clear(self):
+        self.timer.stop()
+        self.cancel()
+        self.setText("")
+
+    def start_computation(self):
+        """Calcula as estatísticas da seleção atual numa thread de trabalho"""
+        model = self.view.model()
+        ranges = [(r.top(), r.bottom(), r.left(), r.right())
+                  for r in self.view.selectionModel().selection()]
+        if model.store is None or not ranges or sum((b - t + 1) * (r - l + 1) for t, b, l, r in ranges) < 2:
+            self.clear()
+            return
+        self.worker = start_worker(compute_selection_stats, selection_snapshot(model, ranges), self.locale,
+                                   on_progress=self.setText)
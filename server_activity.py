@@ -0,0 +1,245 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView,
+                             QSpinBox, QCheckBox, QListWidget, QMessageBox, QSplitter, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+from sqlalchemy import text
+from keyed_model import KeyedTableModel
+from workers import start_worker
+
+# Intervalo padrão entre leituras (segundos)
+ACTIVITY_INTERVAL = 2
+
+ACTIVITY_COLUMNS = ["sessão", "usuário", "banco", "estado", "espera", "bloqueado por", "segundos", "cadeia", "consulta"]
+
+# Sessões ativas por dialeto: sessão, usuário, banco, estado, espera, bloqueadores, segundos, consulta
+ACTIVITY_QUERIES = {
+    "postgresql": """
+        SELECT pid, usename, datname, state,
+               coalesce(wait_event_type || ': ' || wait_event, ''),
+               array_to_string(pg_blocking_pids(pid), ','),
+               extract(epoch FROM now() - coalesce(query_start, backend_start))::float,
+               query
+        FROM pg_stat_activity
+        WHERE pid <> pg_backend_pid() AND backend_type = 'client backend'
+    """,
+    # Sessões sem requisição entram se têm transação aberta ou bloqueiam outra
+    # (o início da cadeia costuma estar ocioso com a transação aberta)
+    "mssql": """
+        SELECT s.session_id, s.login_name, DB_NAME(COALESCE(r.database_id, s.database_id)),
+               COALESCE(r.status, s.status),
+               ISNULL(r.wait_type, ''),
+               ISNULL(CAST(NULLIF(r.blocking_session_id, 0) AS varchar(10)), ''),
+               COALESCE(r.total_elapsed_time / 1000.0, DATEDIFF(second, s.last_request_end_time, GETDATE())),
+               t.text
+        FROM sys.dm_exec_sessions s
+        LEFT JOIN sys.dm_exec_requests r ON r.session_id = s.session_id
+        LEFT JOIN sys.dm_exec_connections c ON c.session_id = s.session_id
+        OUTER APPLY sys.dm_exec_sql_text(COALESCE(r.sql_handle, c.most_recent_sql_handle)) t
+        WHERE s.session_id <> @@SPID AND s.is_user_process = 1
+          AND (r.session_id IS NOT NULL OR s.open_transaction_count > 0
+               OR EXISTS (SELECT 1 FROM sys.dm_exec_requests b WHERE b.blocking_session_id = s.session_id))
+    """,
+    "mysql": """
+        SELECT p.ID, p.USER, p.DB, p.COMMAND, COALESCE(p.STATE, ''),
+               COALESCE((SELECT GROUP_CONCAT(DISTINCT bt.PROCESSLIST_ID)
+                         FROM performance_schema.data_lock_waits w
+                         JOIN performance_schema.threads rt ON rt.THREAD_ID = w.REQUESTING_THREAD_ID
+                         JOIN performance_schema.threads bt ON bt.THREAD_ID = w.BLOCKING_THREAD_ID
+                         WHERE rt.PROCESSLIST_ID = p.ID), ''),
+               p.TIME, p.INFO
+        FROM information_schema.PROCESSLIST p
+        WHERE p.ID <> CONNECTION_ID() AND p.COMMAND <> 'Daemon'
+    """,
+}
+
+# Comandos para cancelar a consulta ou encerrar a sessão (None: o servidor
+# não cancela só a consulta de outra sessão; KILL encerra a sessão e desfaz a transação)
+CANCEL_COMMANDS = {
+    "postgresql": ("SELECT pg_cancel_backend({id})", "SELECT pg_terminate_backend({id})"),
+    "mssql": (None, "KILL {id}"),
+    "mysql": ("KILL QUERY {id}", "KILL {id}"),
+}
+
+
+def blocking_chain(session, blockers):
+    """Monta a cadeia 'sessão ← bloqueador ← ...' seguindo o primeiro bloqueador"""
+    chain, seen = [str(session)], {str(session)}
+    current = blockers.get(str(session))
+    while current and current not in seen:
+        chain.append(current)
+        seen.add(current)
+        current = blockers.get(current)
+    return " ← ".join(chain) if len(chain) > 1 else ""
+
+
+def read_activity(engine):
+    """Lê as sessões ativas do servidor e calcula as cadeias de bloqueio"""
+    query = ACTIVITY_QUERIES.get(engine.dialect.name)
+    if query is None:
+        raise ValueError(f"Monitor de atividade não suportado para {engine.dialect.name}")
+    with engine.connect() as conn:
+        rows = conn.execute(text(query)).fetchall()
+
+    blockers = {str(r[0]): str(r[5]).split(",")[0] for r in rows if r[5]}
+    return [(r[0], r[1], r[2], r[3], r[4], r[5], float(r[6] or 0), blocking_chain(r[0], blockers),
+             (r[7] or "").strip()) for r in rows]
+
+
+def cancel_session(engine, session_id, terminate=False):
+    """Cancela a consulta (ou encerra a sessão) informada"""
+    command = CANCEL_COMMANDS[engine.dialect.name][1 if terminate else 0]
+    if command is None:
+        raise ValueError(f"{engine.dialect.name} não permite cancelar só a consulta; encerre a sessão")
+    with engine.connect() as conn:
+        conn.execute(text(command.format(id=int(session_id))))
+        conn.commit()
+
+
+class PollingTab(QWidget):
+    """Aba que consulta o servidor periodicamente numa thread de trabalho.
+
+    A leitura só acontece com a aba visível e nunca há duas leituras
+    simultâneas; subclasses definem `poll(engine)` e `on_result(result)`.
+    """
+
+    def __init__(self, parent=None, interval=ACTIVITY_INTERVAL):
+        super().__init__(parent)
+        self.engine = None
+        self.worker = None
+
+        self.toolbar = QHBoxLayout()
+        self.auto_refresh = QCheckBox("Atualizar a cada")
+        self.auto_refresh.setChecked(True)
+        self.auto_refresh.toggled.connect(self.update_timer)
+        self.toolbar.addWidget(self.auto_refresh)
+        self.interval = QSpinBox(minimum=1, maximum=300, value=interval, suffix=" s")
+        self.interval.valueChanged.connect(self.update_timer)
+        self.toolbar.addWidget(self.interval)
+        self.toolbar.addStretch(1)
+        refresh_btn = QPushButton("Atualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        self.toolbar.addWidget(refresh_btn)
+
+        self.status = QLabel("")
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def set_engine(self, engine):
+        """Troca a conexão monitorada"""
+        self.engine = engine
+        self.update_timer()
+
+    def update_timer(self):
+        """Só consulta o servidor com a aba visível e a atualização automática ligada"""
+        if self.engine and self.auto_refresh.isChecked() and self.isVisible():
+            self.timer.start(self.interval.value() * 1000)
+            self.refresh()
+        else:
+            self.timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self):
+        """Dispara uma leitura em segundo plano (ignora se a anterior não terminou)"""
+        if not self.engine or self.worker is not None:
+            return
+        self.worker = start_worker(self.poll, self.engine,
+                                   on_finished=self.on_finished, on_error=self.on_error)
+
+    def on_finished(self, result):
+        self.worker = None
+        self.on_result(result)
+
+    def on_error(self, error):
+        self.worker = None
+        self.timer.stop()
+        self.status.setText(f"Erro ao ler o servidor: {error}")
+        self.status.setStyleSheet("color: red;")
+
+    def poll(self, engine):
+        raise NotImplementedError
+
+    def on_result(self, result):
+        raise NotImplementedError
+
+
+class ServerActivityTab(PollingTab):
+    """Aba 'Atividade do Servidor': sessões em execução e consultas lentas desta aplicação"""
+
+    def __init__(self, profiler, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+
+        layout = QVBoxLayout(self)
+        self.cancel_btn = QPushButton("Cancelar Consulta")
+        self.cancel_btn.clicked.connect(lambda: self.kill_selected(terminate=False))
+        self.toolbar.addWidget(self.cancel_btn)
+        kill_btn = QPushButton("Encerrar Sessão")
+        kill_btn.clicked.connect(lambda: self.kill_selected(terminate=True))
+        self.toolbar.addWidget(kill_btn)
+        layout.addLayout(self.toolbar)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.model = KeyedTableModel(parent=self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        splitter.addWidget(self.view)
+
+        slow_widget = QWidget()
+        slow_layout = QVBoxLayout(slow_widget)
+        slow_layout.setContentsMargins(0, 0, 0, 0)
+        slow_layout.addWidget(QLabel(f"Consultas lentas desta aplicação (≥ {profiler.slow_query_ms} ms):"))
+        self.slow_list = QListWidget()
+        slow_layout.addWidget(self.slow_list)
+        splitter.addWidget(slow_widget)
+        splitter.setStretchFactor(0, 3)
+        layout.addWidget(splitter, 1)
+        layout.addWidget(self.status)
+
+        profiler.slow_query.connect(self.add_slow_query)
+
+    def set_engine(self, engine):
+        self.model.set_rows([], [])
+        cancellable = engine is None or CANCEL_COMMANDS.get(engine.dialect.name, (None,))[0] is not None
+        self.cancel_btn.setEnabled(cancellable)
+        self.cancel_btn.setToolTip("" if cancellable else
+                                   "Este servidor não cancela só a consulta de outra sessão: use Encerrar Sessão")
+        super().set_engine(engine)
+
+    def poll(self, engine):
+        return read_activity(engine)
+
+    def on_result(self, rows):
+        self.model.set_rows(ACTIVITY_COLUMNS, rows)
+        blocked = sum(1 for r in rows if r[5])
+        self.status.setText(f"{len(rows)} sessões, {blocked} bloqueadas")
+        self.status.setStyleSheet("color: red;" if blocked else "")
+
+    def kill_selected(self, terminate):
+        """Cancela a consulta ou encerra a sessão selecionada"""
+        selected = self.view.selectionModel().selectedRows()
+        if not selected or not self.engine:
+            return
+        session_id = self.model.row_values(selected[0].row())[0]
+        action = "encerrar a sessão" if terminate else "cancelar a consulta da sessão"
+        warning = "\n\nA conexão é fechada e a transação aberta nela é desfeita." if terminate else ""
+        if QMessageBox.question(self, "Confirmar",
+                                f"Deseja {action} {session_id}?{warning}") != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            cancel_session(self.engine, session_id, terminate)
+            self.status.setText(f"Sessão {session_id}: comando enviado")
+            self.refresh()
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível {action}:\n{str(e)}")
+
+    def add_slow_query(self, trace):
+        self.slow_list.insertItem(0, f"{trace.total() * 1000:.0f} ms — {trace.label[:200]}")
@@ -0,0 +1,327 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate, chain
+from result_store import ResultStore, TypedColumn, TYPECODES
+
+try:
+    import lz4.frame
+except ImportError:  # Compressão lz4 é opcional
+    lz4 = None
+
+# Arquivo: MAGIC | blocos | rodapé JSON | tamanho do rodapé (uint64) | MAGIC
+MAGIC = b"ASNAP001"
+TRAILER = struct.Struct("<Q8s")
+# Linhas por bloco: a unidade lida (e descomprimida) sob demanda
+BLOCK_ROWS = 65536
+# Blocos descomprimidos mantidos em memória por fluxo de cada coluna
+BLOCK_CACHE = 16
+# Dicionário só compensa com poucos valores distintos
+DICTIONARY_MAX = 65535
+# Extensão dos arquivos de resultado
+SNAPSHOT_FILTER = "Resultado AllSqlAdmin (*.asnap)"
+
+COMPRESSORS = {
+    "none": (None, None),
+    "zlib": (lambda data: zlib.compress(data, 1), zlib.decompress),
+}
+if lz4 is not None:
+    COMPRESSORS["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+
+# Tipos gravados como texto e a conversão de volta ao abrir
+TEXT_DECODERS = {
+    "text": str,
+    "decimal": Decimal,
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "object": str,  # Colunas mistas voltam como texto
+}
+
+
+def text_of(value, kind):
+    if kind in ("datetime", "date", "time"):
+        return value.isoformat()
+    return str(value)
+
+
+def code_typecode(size):
+    """Menor inteiro sem sinal que indexa o dicionário"""
+    return "B" if size <= 0xFF else "H" if size <= 0xFFFF else "I"
+
+
+#######################################################################
+# GRAVAÇÃO
+#######################################################################
+
+class SnapshotWriter:
+    """Grava os blocos alinhados em 8 bytes e anota onde ficou cada um"""
+
+    def __init__(self, f, compression):
+        self.f = f
+        self.compress = COMPRESSORS[compression][0]
+        self.compression = compression
+
+    def blob(self, data):
+        """Grava um bloco (comprimido só se ficar menor) e retorna [início, tamanho, comprimido]"""
+        data = bytes(data)
+        compressed = False
+        if self.compress is not None and data:
+            packed = self.compress(data)
+            if len(packed) < len(data):
+                data, compressed = packed, True
+        self.f.write(bytes(-self.f.tell() % 8))
+        start = self.f.tell()
+        self.f.write(data)
+        return [start, len(data), compressed]
+
+
+def column_blocks(column, row_count):
+    for start in range(0, row_count, BLOCK_ROWS):
+        yield start, min(start + BLOCK_ROWS, row_count)
+
+
+def column_encoding(kind):
+    """(codificação, typecode) dos blocos de uma coluna do tipo informado"""
+    if kind is None:
+        return "empty", None  # Só nulos
+    if kind in TYPECODES:
+        return "fixed", TYPECODES[kind]
+    if kind == "interval":
+        return "fixed", "q"  # Microssegundos
+    return "plain", None
+
+
+def encode_block(writer, kind, encoding, typecode, values, nulls, dictionary=None):
+    """Grava os valores e a máscara de nulos de um bloco; retorna sua descrição"""
+    block = {"rows": len(nulls), "nulls": writer.blob(nulls) if nulls.count(1) else None}
+    if encoding == "fixed" and kind == "interval":
+        micros = [0 if n else v // timedelta(microseconds=1) for v, n in zip(values, nulls)]
+        block["values"] = writer.blob(array("q", micros).tobytes())
+    elif encoding == "fixed":
+        if not isinstance(values, array):  # Resultado aberto de arquivo
+            values = array(typecode, values)
+        block["values"] = writer.blob(values.tobytes())
+    elif encoding == "dict":
+        codes = [0 if n else dictionary[text_of(v, kind)] for v, n in zip(values, nulls)]
+        block["values"] = writer.blob(array(typecode, codes).tobytes())
+    else:
+        if kind == "bytes":
+            encoded = [b"" if n else bytes(v) for v, n in zip(values, nulls)]
+        else:
+            encoded = [b"" if n else text_of(v, kind).encode() for v, n in zip(values, nulls)]
+        offsets = array("q", accumulate(map(len, encoded), initial=0))
+        block["offsets"] = writer.blob(offsets.tobytes())
+        block["values"] = writer.blob(b"".join(encoded))
+    return block
+
+
+def decode_block(reader, block, kind, encoding, typecode, dictionary=None):
+    """Valores de um bloco gravado por encode_block (nulos com valor qualquer)"""
+    if encoding == "fixed":
+        values = reader.array(block["values"], typecode)
+        if kind == "interval":
+            return [timedelta(microseconds=v) for v in values]
+        return values
+    if encoding == "dict":
+        return list(map(dictionary.__getitem__, reader.array(block["values"], typecode)))
+    offsets = reader.array(block["offsets"], "q")
+    data = reader.read(block["values"])
+    chunks = [data[offsets[i]:offsets[i + 1]] for i in range(block["rows"])]
+    if kind == "bytes":
+        return chunks
+    decode = TEXT_DECODERS[kind]
+    return [decode(c.decode()) if c else "" for c in chunks]
+
+
+def write_column(writer, column, row_count):
+    """Grava uma coluna bloco a bloco; retorna sua descrição para o rodapé"""
+    kind = column.kind
+    encoding, typecode = column_encoding(kind)
+    meta = {"name": column.name, "kind": kind, "null_count": column.null_count, "blocks": [],
+            "encoding": encoding, "typecode": typecode}
+    if encoding == "empty":
+        return meta
+
+    dictionary = None
+    if encoding == "plain" and kind != "bytes":
+        distinct = dict.fromkeys(text_of(column.values[i], kind) for i in column.non_null_rows(0, row_count))
+        if len(distinct) <= DICTIONARY_MAX and len(distinct) * 2 < row_count:
+            dictionary = {value: code for code, value in enumerate(distinct)}
+            meta["encoding"] = "dict"
+            meta["typecode"] = code_typecode(len(dictionary))
+            meta["dictionary"] = writer.blob(json.dumps(list(dictionary), ensure_ascii=False).encode())
+
+    for start, stop in column_blocks(column, row_count):
+        meta["blocks"].append(encode_block(writer, kind, meta["encoding"], meta["typecode"],
+                                           column.values[start:stop], column.nulls[start:stop], dictionary))
+    return meta
+
+
+def save_snapshot(store, path, compression="zlib"):
+    """Grava o resultado num arquivo colunar (uma coluna por vez; para thread de trabalho).
+
+    Gerador: produz (colunas gravadas, total); retorna a quantidade de linhas.
+    Grava num arquivo temporário e o renomeia no fim: um resultado aberto
+    (mapeado em memória) do mesmo arquivo continua válido.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        writer = SnapshotWriter(f, compression)
+        columns = []
+        for column in store.columns:
+            columns.append(write_column(writer, column, store.row_count))
+            yield len(columns), store.column_count
+        footer = json.dumps({"row_count": store.row_count, "block_rows": BLOCK_ROWS,
+                             "compression": compression, "columns": columns}, ensure_ascii=False).encode()
+        f.write(footer)
+        f.write(TRAILER.pack(len(footer), MAGIC))
+    os.replace(temp_path, path)
+    return store.row_count
+
+
+#######################################################################
+# LEITURA (mapeada em memória, sob demanda)
+#######################################################################
+
+class BlockSequence:
+    """Sequência lida do arquivo bloco a bloco: só os blocos acessados são
+    descomprimidos e apenas os mais recentes ficam em memória"""
+
+    def __init__(self, length, block_rows, load_block, join):
+        self.length = length
+        self.block_rows = block_rows
+        self.load_block = load_block
+        self.join = join
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()  # Lida também pelas threads de trabalho
+
+    def __len__(self):
+        return self.length
+
+    def block(self, index):
+        with self.lock:
+            block = self.cache.get(index)
+            if block is not None:
+                self.cache.move_to_end(index)
+                return block
+        block = self.load_block(index)
+        with self.lock:
+            self.cache[index] = block
+            while len(self.cache) > BLOCK_CACHE:
+                self.cache.popitem(last=False)
+        return block
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, _ = item.indices(self.length)
+            parts = []
+            for index in range(start // self.block_rows, (stop - 1) // self.block_rows + 1 if stop > start else 0):
+                offset = index * self.block_rows
+                parts.append(self.block(index)[max(start - offset, 0):stop - offset])
+            return self.join(parts)
+        if item < 0:
+            item += self.length
+        return self.block(item // self.block_rows)[item % self.block_rows]
+
+    def __iter__(self):
+        for index in range((self.length + self.block_rows - 1) // self.block_rows):
+            yield from self.block(index)
+
+
+class SnapshotColumn(TypedColumn):
+    """Coluna somente leitura sobre os blocos do arquivo"""
+
+    def __init__(self, reader, meta, row_count, block_rows):
+        super().__init__(meta["name"])
+        self.reader = reader
+        self.meta = meta
+        self.kind = meta["kind"]
+        self.null_count = meta["null_count"]
+        blocks = meta["blocks"]
+        if meta["encoding"] == "empty":
+            self.nulls = b"\x01" * row_count
+            self.values = [None] * row_count
+            return
+        self.dictionary = None
+        if meta["encoding"] == "dict":
+            decode = TEXT_DECODERS[self.kind]
+            self.dictionary = [decode(v) for v in json.loads(reader.read(meta["dictionary"]))]
+
+        def load_nulls(index):
+            block = blocks[index]
+            return reader.read(block["nulls"]) if block["nulls"] else bytes(block["rows"])
+
+        self.nulls = BlockSequence(row_count, block_rows, load_nulls, lambda parts: b"".join(map(bytes, parts)))
+        self.values = BlockSequence(row_count, block_rows, lambda index: self.load_values(blocks[index]),
+                                    lambda parts: list(chain.from_iterable(parts)))
+
+    def load_values(self, block):
+        return decode_block(self.reader, block, self.kind, self.meta["encoding"], self.meta.get("typecode"),
+                            self.dictionary)
+
+    def extend(self, values):
+        raise TypeError("Resultado aberto de arquivo é somente leitura")
+
+    def set(self, row, value):
+        raise TypeError("Resultado aberto de arquivo é somente leitura")
+
+
+class SnapshotReader:
+    """Arquivo mapeado em memória: blocos sem compressão são lidos sem cópia"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < len(MAGIC) + TRAILER.size or self.mm[:len(MAGIC)] != MAGIC:
+            raise ValueError("Arquivo não é um resultado salvo pelo AllSqlAdmin")
+        footer_size, magic = TRAILER.unpack_from(self.mm, len(self.mm) - TRAILER.size)
+        if magic != MAGIC:
+            raise ValueError("Arquivo de resultado incompleto ou corrompido")
+        footer_start = len(self.mm) - TRAILER.size - footer_size
+        self.footer = json.loads(self.mm[footer_start:footer_start + footer_size])
+        self.decompress = COMPRESSORS.get(self.footer["compression"], (None, None))[1]
+        if self.footer["compression"] not in COMPRESSORS:
+            raise ValueError(f"Compressão {self.footer['compression']} indisponível (instale o pacote lz4)")
+
+    def view(self, blob):
+        start, size, compressed = blob
+        if compressed:
+            return memoryview(self.decompress(self.mm[start:start + size]))
+        return memoryview(self.mm)[start:start + size]
+
+    def read(self, blob):
+        return bytes(self.view(blob))
+
+    def array(self, blob, typecode):
+        """Valores tipados do bloco (sem cópia quando não comprimido)"""
+        return self.view(blob).cast(typecode)
+
+
+class SnapshotStore(ResultStore):
+    """Resultado aberto de um arquivo: mesma interface do ResultStore, valores lidos sob demanda"""
+
+    def __init__(self, path):
+        self.reader = SnapshotReader(path)
+        footer = self.reader.footer
+        self.path = path
+        self.row_count = footer["row_count"]
+        self.columns = [SnapshotColumn(self.reader, meta, self.row_count, footer["block_rows"])
+                        for meta in footer["columns"]]
+        self.lob_sizes = {}
+
+    def append_rows(self, rows):
+        raise TypeError("Resultado aberto de arquivo é somente leitura")
+
+
+def open_snapshot(path):
+    """Abre um resultado salvo (só o rodapé é lido; os dados, conforme exibidos)"""
+    return SnapshotStore(path)
@@ -0,0 +1,303 @@
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from itertools import chain
+from result_store import ResultStore, TypedColumn
+from snapshot import COMPRESSORS, SnapshotWriter, column_encoding, decode_block, encode_block
+
+# Orçamento padrão de memória de cada resultado (MB)
+MEMORY_BUDGET_MB = 500
+# Linhas por bloco despejado (menor que o dos arquivos salvos: o despejo roda na thread da interface)
+SPILL_BLOCK_ROWS = 16384
+# Blocos despejados mantidos em memória por coluna (os menos usados saem primeiro)
+SPILL_CACHE_BLOCKS = 8
+# lz4 quando instalado (rápido o bastante para o despejo); senão sem compressão
+SPILL_COMPRESSION = "lz4" if "lz4" in COMPRESSORS else "none"
+# Valores amostrados para estimar a memória das colunas de objetos
+SIZE_SAMPLE = 64
+
+
+def estimated_size(column, start, stop):
+    """Bytes aproximados ocupados pelas linhas [start, stop) de um TypedColumn"""
+    count = stop - start
+    if hasattr(column.values, "itemsize"):
+        return (column.values.itemsize + 1) * count
+    return objects_size(column.values[start:min(stop, start + SIZE_SAMPLE)], count)
+
+
+def objects_size(sample, count):
+    """Bytes aproximados de `count` objetos, estimados pela amostra"""
+    average = sum(map(sys.getsizeof, sample)) / len(sample) if sample else 0
+    # Objeto + ponteiro na lista + byte da máscara de nulos
+    return int((average + 9) * count)
+
+
+class SpillFile:
+    """Arquivo temporário com os blocos despejados (apagado ao ser liberado)"""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile(prefix="allsqladmin-")
+        self.writer = SnapshotWriter(self.file, SPILL_COMPRESSION)
+        self.decompress = COMPRESSORS[SPILL_COMPRESSION][1]
+
+    @property
+    def size(self):
+        return self.file.tell()
+
+    def flush(self):
+        """Torna os blocos gravados visíveis para a leitura (pread)"""
+        self.file.flush()
+
+    def view(self, blob):
+        start, size, compressed = blob
+        data = os.pread(self.file.fileno(), size, start)
+        return memoryview(self.decompress(data) if compressed else data)
+
+    def read(self, blob):
+        return bytes(self.view(blob))
+
+    def array(self, blob, typecode):
+        return self.view(blob).cast(typecode)
+
+
+class SpillSequence:
+    """values/nulls de uma SpillColumn: blocos do arquivo seguidos das linhas em memória"""
+
+    def __init__(self, column, part):
+        self.column = column
+        self.part = part  # 0 = valores, 1 = máscara de nulos
+
+    def __len__(self):
+        return len(self.column)
+
+    def memory_part(self):
+        tail = self.column.tail
+        return tail.nulls if self.part else tail.values
+
+    def __getitem__(self, item):
+        column = self.column
+        if isinstance(item, slice):
+            start, stop, _ = item.indices(len(column))
+            with column.lock:
+                offset = column.offset
+                if start >= offset:
+                    return self.memory_part()[start - offset:stop - offset]
+                parts = []
+                for index in range(start // SPILL_BLOCK_ROWS, (min(stop, offset) - 1) // SPILL_BLOCK_ROWS + 1):
+                    base = index * SPILL_BLOCK_ROWS
+                    parts.append(column.block(index)[self.part][max(start - base, 0):min(stop, offset) - base])
+                if stop > offset:
+                    parts.append(self.memory_part()[:stop - offset])
+            if self.part:
+                return b"".join(map(bytes, parts))
+            return list(chain.from_iterable(parts))
+        if item < 0:
+            item += len(column)
+        with column.lock:
+            if item >= column.offset:
+                return self.memory_part()[item - column.offset]
+            return column.block(item // SPILL_BLOCK_ROWS)[self.part][item % SPILL_BLOCK_ROWS]
+
+    def __iter__(self):
+        for start in range(0, len(self), SPILL_BLOCK_ROWS):
+            yield from self[start:start + SPILL_BLOCK_ROWS]
+
+
+class SpillColumn(TypedColumn):
+    """Coluna cujas linhas mais antigas podem estar no arquivo de despejo.
+
+    As linhas [0, offset) estão em blocos no arquivo; as demais num
+    TypedColumn em memória, que continua recebendo os lotes da consulta.
+    """
+
+    def __init__(self, name, store):
+        self.name = name
+        self.store = store
+        self.tail = TypedColumn(name)
+        self.blocks = []  # (descrição gravada, tipo, codificação, typecode) de cada bloco despejado
+        self.offset = 0
+        self.spilling = 0  # Linhas copiadas para o bloco em gravação (ainda em memória)
+        self.spilled_nulls = 0
+        self.cache = OrderedDict()
+        self.lock = store.lock  # A do armazenamento: o despejo move todas as colunas juntas
+        self.values = SpillSequence(self, 0)
+        self.nulls = SpillSequence(self, 1)
+
+    @property
+    def kind(self):
+        return self.tail.kind
+
+    @property
+    def null_count(self):
+        return self.spilled_nulls + self.tail.null_count
+
+    def __len__(self):
+        return self.offset + len(self.tail)
+
+    def extend(self, values):
+        with self.lock:
+            self.tail.extend(values)
+
+    def get(self, row):
+        with self.lock:
+            if row >= self.offset:
+                return self.tail.get(row - self.offset)
+            values, nulls = self.block(row // SPILL_BLOCK_ROWS)
+            i = row % SPILL_BLOCK_ROWS
+            return None if nulls[i] else values[i]
+
+    def set(self, row, value):
+        with self.lock:
+            if row < self.offset + self.spilling:
+                raise TypeError("Linha despejada em disco é somente leitura")
+            self.tail.set(row - self.offset, value)
+
+    def take_block(self):
+        """Copia as linhas mais antigas em memória para o próximo bloco (sob a trava)"""
+        tail = self.tail
+        self.spilling = SPILL_BLOCK_ROWS
+        return tail.kind, tail.values[:SPILL_BLOCK_ROWS], bytes(tail.nulls[:SPILL_BLOCK_ROWS])
+
+    def write_block(self, spill_file, kind, values, nulls):
+        """Grava o bloco copiado (sem a trava: a interface continua lendo e acrescentando)"""
+        encoding, typecode = column_encoding(kind)
+        if encoding == "empty":
+            block = {"rows": len(nulls)}
+        elif kind == "object":
+            block = self.spill_objects(spill_file, values, nulls)
+            encoding = "pickle" if "values" in block else "memory"
+        else:
+            block = encode_block(spill_file.writer, kind, encoding, typecode, values, nulls)
+            spill_file.flush()
+        return block, kind, encoding, typecode
+
+    def add_block(self, written, nulls):
+        """Troca as linhas copiadas pelo bloco gravado (sob a trava)"""
+        tail = self.tail
+        null_count = nulls.count(1)
+        self.blocks.append(written)
+        del tail.values[:SPILL_BLOCK_ROWS]
+        del tail.nulls[:SPILL_BLOCK_ROWS]
+        tail.null_count -= null_count
+        self.spilled_nulls += null_count
+        self.offset += SPILL_BLOCK_ROWS
+        self.spilling = 0
+
+    @staticmethod
+    def spill_objects(spill_file, values, nulls):
+        """Bloco de coluna mista (JSON, UUID...): os objetos nativos são
+        serializados, não convertidos em texto como nos arquivos salvos"""
+        try:
+            data = pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Objeto do driver que não se serializa: o bloco continua em memória
+            return {"rows": len(nulls), "objects": (values, nulls)}
+        writer = spill_file.writer
+        block = {"rows": len(nulls), "nulls": writer.blob(nulls) if nulls.count(1) else None,
+                 "values": writer.blob(data)}
+        spill_file.flush()
+        return block
+
+    def block(self, index):
+        """(valores, nulos) de um bloco despejado, lidos do arquivo se não estiverem no cache"""
+        with self.lock:
+            cached = self.cache.get(index)
+            if cached is not None:
+                self.cache.move_to_end(index)
+                return cached
+            block, kind, encoding, typecode = self.blocks[index]
+            if encoding == "memory":
+                return block["objects"]
+            spill_file = self.store.spill_file
+            if encoding == "empty":
+                cached = ([None] * block["rows"], b"\x01" * block["rows"])
+            else:
+                nulls = spill_file.read(block["nulls"]) if block["nulls"] else bytes(block["rows"])
+                if encoding == "pickle":
+                    values = pickle.loads(spill_file.read(block["values"]))
+                else:
+                    values = decode_block(spill_file, block, kind, encoding, typecode)
+                cached = (values, nulls)
+            self.cache[index] = cached
+            while len(self.cache) > SPILL_CACHE_BLOCKS:
+                self.cache.popitem(last=False)
+            return cached
+
+
+class SpillingStore(ResultStore):
+    """ResultStore com orçamento de memória: ao passar dele, os blocos mais
+    antigos vão para um arquivo temporário e voltam sob demanda ao rolar.
+
+    append_rows só contabiliza a memória; o despejo (spill_excess) roda numa
+    thread de trabalho enquanto a interface continua lendo e acrescentando.
+    """
+
+    def __init__(self, column_names, budget):
+        self.lock = threading.RLock()
+        self.columns = [SpillColumn(name, self) for name in column_names]
+        self.row_count = 0
+        self.lob_sizes = {}
+        self.budget = budget
+        self.memory = 0  # Estimativa das linhas em memória (bytes)
+        self.kept_bytes = 0  # Blocos que não se serializam e ficaram em memória (bytes estimados)
+        self.spill_file = None
+        self.spill_error = None
+
+    @property
+    def spilled_rows(self):
+        return self.columns[0].offset if self.columns else 0
+
+    @property
+    def spilled_bytes(self):
+        return self.spill_file.size if self.spill_file is not None else 0
+
+    @property
+    def over_budget(self):
+        return self.memory + self.kept_bytes > self.budget
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        with self.lock:
+            start = self.row_count
+            super().append_rows(rows)
+            offset = self.spilled_rows
+            self.memory += sum(estimated_size(c.tail, start - offset, self.row_count - offset) for c in self.columns)
+
+    def needs_spill(self):
+        """Passou do orçamento e há mais que um bloco em memória para despejar"""
+        with self.lock:
+            return (self.spill_error is None and self.over_budget
+                    and self.row_count - self.spilled_rows > SPILL_BLOCK_ROWS)
+
+    def spill_excess(self):
+        """Despeja blocos até voltar ao orçamento (thread de trabalho); retorna quantos"""
+        spilled = 0
+        try:
+            while self.needs_spill():
+                self.spill_block()
+                spilled += 1
+        except OSError as e:
+            # Disco cheio etc.: para de despejar este resultado
+            self.spill_error = e
+            raise
+        return spilled
+
+    def spill_block(self):
+        """Despeja o bloco mais antigo de todas as colunas (um despejo por vez)"""
+        with self.lock:
+            if self.spill_file is None:
+                self.spill_file = SpillFile()
+            in_memory = self.row_count - self.spilled_rows
+            freed = self.memory * SPILL_BLOCK_ROWS // in_memory
+            taken = [column.take_block() for column in self.columns]
+        written = [column.write_block(self.spill_file, *block) for column, block in zip(self.columns, taken)]
+        with self.lock:
+            for column, block, (_, values, nulls) in zip(self.columns, written, taken):
+                column.add_block(block, nulls)
+                if block[2] == "memory":
+                    self.kept_bytes += objects_size(values[:SIZE_SAMPLE], len(values))
+            self.memory -= freed
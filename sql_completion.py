@@ -0,0 +1,201 @@
+import re
+from bisect import bisect_left
+from sqlalchemy import inspect, text
+
+# Palavras-chave comuns a todos os bancos
+SQL_KEYWORDS = [
+    "ADD", "ALL", "ALTER", "AND", "ANY", "AS", "ASC", "AVG", "BEGIN", "BETWEEN", "BY", "CASE", "CAST",
+    "CHECK", "COALESCE", "COLUMN", "COMMIT", "CONSTRAINT", "COUNT", "CREATE", "CROSS", "CURRENT_DATE",
+    "CURRENT_TIMESTAMP", "DATABASE", "DEFAULT", "DELETE", "DESC", "DISTINCT", "DROP", "ELSE", "END",
+    "EXCEPT", "EXISTS", "FOREIGN", "FROM", "FULL", "FUNCTION", "GRANT", "GROUP", "HAVING", "IN",
+    "INDEX", "INNER", "INSERT", "INTERSECT", "INTO", "IS", "JOIN", "KEY", "LEFT", "LIKE", "MAX",
+    "MIN", "NOT", "NULL", "NULLIF", "ON", "OR", "ORDER", "OUTER", "OVER", "PARTITION", "PRIMARY",
+    "PROCEDURE", "REFERENCES", "REVOKE", "RIGHT", "ROLLBACK", "SELECT", "SET", "SUM", "TABLE", "THEN",
+    "TRANSACTION", "TRIGGER", "TRUNCATE", "UNION", "UNIQUE", "UPDATE", "USING", "VALUES", "VIEW",
+    "WHEN", "WHERE", "WITH",
+]
+# Palavras-chave próprias de cada dialeto (nome do dialeto no SQLAlchemy)
+DIALECT_KEYWORDS = {
+    "postgresql": [
+        "ANALYZE", "ARRAY", "CONFLICT", "DO", "EXPLAIN", "FETCH", "FILTER", "FIRST", "ILIKE", "LATERAL",
+        "LIMIT", "MATERIALIZED", "NOTHING", "NULLS", "OFFSET", "ONLY", "RETURNING", "SCHEMA", "SEQUENCE",
+        "SIMILAR", "TABLESAMPLE", "VACUUM", "WINDOW",
+    ],
+    "mssql": [
+        "APPLY", "CLUSTERED", "DECLARE", "EXEC", "EXECUTE", "FETCH", "GO", "IDENTITY", "MERGE", "NEXT",
+        "NOCOUNT", "NOLOCK", "NONCLUSTERED", "OFFSET", "OUTPUT", "PIVOT", "PRINT", "ROWS", "SCHEMA",
+        "TOP", "TRY_CAST", "UNPIVOT",
+    ],
+    "mysql": [
+        "AUTO_INCREMENT", "DELAYED", "DUPLICATE", "ENGINE", "EXPLAIN", "FORCE", "IGNORE", "LIMIT",
+        "LOCK", "OFFSET", "REPLACE", "REGEXP", "SHOW", "STRAIGHT_JOIN", "UNLOCK", "UNSIGNED", "USE",
+    ],
+}
+# Quantidade máxima de sugestões por tecla
+MAX_SUGGESTIONS = 50
+
+# Palavras após as quais se espera o nome de uma tabela
+TABLE_CONTEXT = {"from", "join", "into", "update", "table"}
+# Todas as palavras-chave (nunca são tomadas como apelido de tabela)
+ALL_KEYWORDS = {k.lower() for k in SQL_KEYWORDS} | {k.lower() for ks in DIALECT_KEYWORDS.values() for k in ks}
+
+# Colunas do schema padrão numa única consulta ao catálogo
+CATALOG_QUERIES = {
+    "postgresql": "SELECT table_name, column_name FROM information_schema.columns "
+                  "WHERE table_schema = current_schema() ORDER BY table_name, ordinal_position",
+    "mssql": "SELECT table_name, column_name FROM information_schema.columns "
+             "WHERE table_schema = SCHEMA_NAME() ORDER BY table_name, ordinal_position",
+    "mysql": "SELECT table_name, column_name FROM information_schema.columns "
+             "WHERE table_schema = DATABASE() ORDER BY table_name, ordinal_position",
+}
+
+# Identificador simples ou entre aspas/colchetes/crases, com qualificadores opcionais
+IDENTIFIER = r'(?:"[^"]*"|`[^`]*`|\[[^\]]*\]|[^\W\d][\w$#@]*)'
+TOKEN = re.compile(rf"'(?:[^']|'')*'?|--[^\n]*|/\*.*?(?:\*/|$)|{IDENTIFIER}(?:\.{IDENTIFIER})*|\d[\w.]*|\S",
+                   re.DOTALL)
+PREFIX = re.compile(r"[\w$#@]*$")
+QUALIFIER = re.compile(rf"({IDENTIFIER})\.$")
+
+
+def unquote(identifier):
+    """Último nome de um identificador qualificado, sem aspas"""
+    name = re.findall(IDENTIFIER, identifier)[-1]
+    return name[1:-1] if name[0] in "\"`[" else name
+
+
+def is_identifier(token):
+    return re.fullmatch(rf"{IDENTIFIER}(?:\.{IDENTIFIER})*", token) is not None and token.lower() not in ALL_KEYWORDS
+
+
+def sql_tokens(sql):
+    """Tokens do SQL, sem comentários e literais de texto"""
+    return [t for t in TOKEN.findall(sql) if not t.startswith(("'", "--", "/*"))]
+
+
+def statement_tables(statement):
+    """Tabelas do FROM/JOIN/UPDATE/INTO do comando: {nome ou apelido em minúsculas: tabela}"""
+    tokens = sql_tokens(statement)
+    scope = {}
+    i = 0
+    while i < len(tokens):
+        keyword = tokens[i].lower()
+        i += 1
+        if keyword not in TABLE_CONTEXT:
+            continue
+        while i < len(tokens) and is_identifier(tokens[i]):
+            table = unquote(tokens[i])
+            scope[table.lower()] = table
+            i += 1
+            if i < len(tokens) and tokens[i].lower() == "as":
+                i += 1
+            if i < len(tokens) and is_identifier(tokens[i]):
+                scope[unquote(tokens[i]).lower()] = table
+                i += 1
+            # Lista de tabelas separadas por vírgula no FROM
+            if keyword == "from" and i < len(tokens) and tokens[i] == ",":
+                i += 1
+                continue
+            break
+    return scope
+
+
+def completion_context(before):
+    """Contexto do cursor: (prefixo digitado, qualificador antes do ponto, espera tabela)"""
+    prefix = PREFIX.search(before).group()
+    rest = before[:len(before) - len(prefix)]
+    qualifier = QUALIFIER.search(rest)
+    if qualifier:
+        return prefix, unquote(qualifier.group(1)), False
+    # A última palavra-chave decide: FROM a x, b... continua esperando tabela
+    keywords = [t.lower() for t in sql_tokens(rest) if t.lower() in ALL_KEYWORDS]
+    return prefix, None, bool(keywords) and keywords[-1] in TABLE_CONTEXT
+
+
+class PrefixIndex:
+    """Nomes ordenados em minúsculas: busca por prefixo com bisect, O(log n + k)"""
+
+    def __init__(self, names):
+        pairs = sorted({(name.lower(), name) for name in names})
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix, limit=MAX_SUGGESTIONS):
+        """Até `limit` nomes que começam com o prefixo (sem distinguir maiúsculas)"""
+        prefix = prefix.lower()
+        found = []
+        for i in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if len(found) >= limit or not self.keys[i].startswith(prefix):
+                break
+            found.append(self.names[i])
+        return found
+
+
+class CompletionIndex:
+    """Índices de prefixo de uma conexão: tabelas, colunas por tabela e palavras-chave.
+
+    Montado uma vez por conexão (numa thread de trabalho); cada tecla faz só
+    buscas binárias, independentemente do tamanho do catálogo.
+    """
+
+    def __init__(self, columns_by_table, dialect_name=None):
+        self.tables = PrefixIndex(columns_by_table)
+        self.table_names = {name.lower(): name for name in columns_by_table}
+        self.columns = {name.lower(): PrefixIndex(columns) for name, columns in columns_by_table.items()}
+        self.all_columns = PrefixIndex({c for columns in columns_by_table.values() for c in columns})
+        self.keywords = PrefixIndex(SQL_KEYWORDS + DIALECT_KEYWORDS.get(dialect_name, []))
+
+    def table_columns(self, table, prefix, limit):
+        index = self.columns.get(table.lower())
+        return index.search(prefix, limit) if index is not None else []
+
+    def suggest(self, before, statement, limit=MAX_SUGGESTIONS):
+        """Sugestões para o texto antes do cursor: ([(nome, tipo)], prefixo digitado).
+
+        `statement` é o comando inteiro em que o cursor está, usado para achar
+        as tabelas do FROM (que podem vir depois do cursor, como no SELECT).
+        """
+        prefix, qualifier, wants_table = completion_context(before)
+        if qualifier is not None:
+            # apelido.coluna ou tabela.coluna
+            table = statement_tables(statement).get(qualifier.lower(), qualifier)
+            return [(c, "column") for c in self.table_columns(table, prefix, limit)], prefix
+        if wants_table:
+            return [(t, "table") for t in self.tables.search(prefix, limit)], prefix
+
+        scope = statement_tables(statement)
+        suggestions = []
+        if scope:
+            # Colunas só das tabelas do FROM
+            columns = set()
+            for table in set(scope.values()):
+                columns.update(self.table_columns(table, prefix, limit))
+            suggestions += [(c, "column") for c in sorted(columns, key=str.lower)[:limit]]
+            suggestions += [(alias, "alias") for alias in sorted(scope) if alias.startswith(prefix.lower())
+                            and alias not in self.table_names]
+        elif prefix:
+            suggestions += [(c, "column") for c in self.all_columns.search(prefix, limit)]
+        suggestions += [(k, "keyword") for k in self.keywords.search(prefix, limit)]
+        return suggestions[:limit], prefix
+
+
+def read_catalog(engine, tables=()):
+    """{tabela: [colunas]} do schema padrão; uma consulta ao information_schema
+    quando o dialeto permite, reflexão em massa nos demais"""
+    columns = {name: [] for name in tables}
+    query = CATALOG_QUERIES.get(engine.dialect.name)
+    with engine.connect() as conn:
+        if query:
+            for table, column in conn.execute(text(query)):
+                columns.setdefault(table, []).append(column)
+        else:
+            for (_, table), table_columns in inspect(conn).get_multi_columns().items():
+                columns[table] = [c["name"] for c in table_columns]
+    return columns
+
+
+def build_completion_index(engine, tables=()):
+    """Lê o catálogo e monta o índice do autocompletar (para thread de trabalho)"""
+    return CompletionIndex(read_catalog(engine, tables), engine.dialect.name)
@@ -0,0 +1,98 @@
+from PyQt6.QtWidgets import QPlainTextEdit, QCompleter
+from PyQt6.QtGui import QTextCursor, QTextDocument
+from PyQt6.QtCore import Qt, QStringListModel
+from sql_completion import CompletionIndex
+from sql_highlighter import SqlHighlighter
+
+# Teclas que, com a lista aberta, são tratadas pelo QCompleter
+COMPLETER_KEYS = (Qt.Key.Key_Enter, Qt.Key.Key_Return, Qt.Key.Key_Escape, Qt.Key.Key_Tab, Qt.Key.Key_Backtab)
+
+
+class SqlEditor(QPlainTextEdit):
+    """Editor SQL com autocompletar de tabelas, colunas, apelidos e palavras-chave.
+
+    A lista abre ao digitar um identificador ou após um ponto (Ctrl+Espaço
+    força a abertura); as sugestões vêm do índice de prefixos da conexão.
+    É um QPlainTextEdit (layout por linhas, bem mais rápido em scripts
+    grandes) com realce de sintaxe incremental.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.highlighter = SqlHighlighter(self.document())
+        self.index = CompletionIndex({})  # Só palavras-chave até o catálogo ser lido
+        self.preparer = None
+        self.prefix = ""
+        self.kinds = {}
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setWidget(self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(12)
+        self.completer.activated.connect(self.insert_completion)
+
+    def set_dialect(self, dialect):
+        """Dialeto da conexão: palavras-chave realçadas e forma de citar os nomes inseridos"""
+        self.preparer = dialect.identifier_preparer
+        self.highlighter.set_dialect(dialect.name)
+
+    def set_index(self, index):
+        """Troca o índice de sugestões (catálogo da conexão)"""
+        self.index = index
+
+    def keyPressEvent(self, event):
+        popup = self.completer.popup()
+        if popup.isVisible() and event.key() in COMPLETER_KEYS:
+            event.ignore()
+            return
+        requested = (event.key() == Qt.Key.Key_Space and
+                     event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        if not requested:
+            super().keyPressEvent(event)
+        typed = event.text()
+        if requested or (typed and (typed[-1].isalnum() or typed[-1] in "_$#@.")):
+            self.update_completions(requested)
+        elif event.key() == Qt.Key.Key_Backspace and popup.isVisible():
+            self.update_completions(False)
+        else:
+            popup.hide()
+
+    def current_statement(self):
+        """Comando em que o cursor está (entre ';') e o trecho dele antes do cursor"""
+        document = self.document()
+        position = self.textCursor().position()
+        previous = document.find(";", position, QTextDocument.FindFlag.FindBackward)
+        start = 0 if previous.isNull() else previous.position()
+        following = document.find(";", position)
+        end = document.characterCount() - 1 if following.isNull() else following.selectionStart()
+        cursor = QTextCursor(document)
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        statement = cursor.selectedText().replace("\u2029", "\n")
+        return statement[:position - start], statement
+
+    def update_completions(self, requested):
+        before, statement = self.current_statement()
+        suggestions, prefix = self.index.suggest(before, statement)
+        popup = self.completer.popup()
+        # Sem nada digitado, a lista só abre após um ponto ou por Ctrl+Espaço
+        if (not suggestions or (not prefix and not requested and not before.endswith(".")) or
+                (len(suggestions) == 1 and suggestions[0][0] == prefix)):
+            popup.hide()
+            return
+        self.prefix = prefix
+        self.kinds = dict(suggestions)
+        self.model.setStringList([name for name, _ in suggestions])
+        popup.setCurrentIndex(self.model.index(0, 0))
+        rect = self.cursorRect()
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
+
+    def insert_completion(self, name):
+        """Substitui o prefixo digitado pela sugestão escolhida"""
+        if self.kinds.get(name) in ("table", "column") and self.preparer is not None:
+            name = self.preparer.quote(name)
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.Left, QTextCursor.MoveMode.KeepAnchor, len(self.prefix))
+        cursor.insertText(name)
+        self.setTextCursor(cursor)
@@ -0,0 +1,115 @@
+import re
+from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+from sql_completion import SQL_KEYWORDS, DIALECT_KEYWORDS
+
+# Estado de cada bloco (linha) ao terminar: o seguinte continua a partir dele
+STATE_NORMAL = 0
+STATE_COMMENT = 1   # Dentro de /* ... */
+STATE_STRING = 2    # Dentro de '...'
+
+# Um único padrão por linha; o grupo encontrado decide o formato
+TOKEN = re.compile(r"""(?P<line_comment>--.*)
+                     |(?P<comment>/\*)
+                     |(?P<string>')
+                     |(?P<quoted>"[^"]*"|\[[^\]]*\]|`[^`]*`)
+                     |(?P<number>\b\d+(?:\.\d+)?\b)
+                     |(?P<word>[^\W\d][\w$#@]*)""", re.VERBOSE)
+
+
+def text_format(color, bold=False, italic=False):
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold:
+        fmt.setFontWeight(QFont.Weight.Bold)
+    fmt.setFontItalic(italic)
+    return fmt
+
+
+def string_end(text, pos):
+    """Posição logo após o apóstrofo que fecha o literal ('' é escape), ou -1"""
+    while True:
+        pos = text.find("'", pos)
+        if pos < 0:
+            return -1
+        if text.startswith("''", pos):
+            pos += 2
+            continue
+        return pos + 1
+
+
+class SqlHighlighter(QSyntaxHighlighter):
+    """Realce de sintaxe SQL incremental.
+
+    Cada bloco é analisado a partir do estado do bloco anterior (comentário
+    ou literal aberto), então uma edição só reanalisa a linha alterada e as
+    seguintes enquanto o estado final delas mudar.
+    """
+
+    def __init__(self, document, dialect_name=None):
+        super().__init__(document)
+        self.formats = {
+            "keyword": text_format("#0033b3", bold=True),
+            "comment": text_format("#8c8c8c", italic=True),
+            "string": text_format("#067d17"),
+            "number": text_format("#1750eb"),
+        }
+        self.keywords = set()
+        self.set_dialect(dialect_name, rehighlight=False)
+
+    def set_dialect(self, dialect_name, rehighlight=True):
+        """Troca as palavras-chave realçadas (comuns + as do dialeto)"""
+        self.keywords = {k.lower() for k in SQL_KEYWORDS + DIALECT_KEYWORDS.get(dialect_name, [])}
+        if rehighlight:
+            self.rehighlight()
+
+    def highlightBlock(self, text):
+        pos = 0
+        state = self.previousBlockState()
+        if state == STATE_COMMENT:
+            end = text.find("*/")
+            if end < 0:
+                self.setFormat(0, len(text), self.formats["comment"])
+                self.setCurrentBlockState(STATE_COMMENT)
+                return
+            pos = end + 2
+            self.setFormat(0, pos, self.formats["comment"])
+        elif state == STATE_STRING:
+            pos = string_end(text, 0)
+            if pos < 0:
+                self.setFormat(0, len(text), self.formats["string"])
+                self.setCurrentBlockState(STATE_STRING)
+                return
+            self.setFormat(0, pos, self.formats["string"])
+        self.setCurrentBlockState(STATE_NORMAL)
+
+        keywords = self.keywords
+        search = TOKEN.search
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return
+            kind, start, pos = match.lastgroup, match.start(), match.end()
+            if kind == "word":
+                if match.group().lower() in keywords:
+                    self.setFormat(start, pos - start, self.formats["keyword"])
+            elif kind == "number":
+                self.setFormat(start, pos - start, self.formats["number"])
+            elif kind == "line_comment":
+                self.setFormat(start, pos - start, self.formats["comment"])
+                return
+            elif kind == "comment":
+                end = text.find("*/", pos)
+                if end < 0:
+                    self.setFormat(start, len(text) - start, self.formats["comment"])
+                    self.setCurrentBlockState(STATE_COMMENT)
+                    return
+                pos = end + 2
+                self.setFormat(start, pos - start, self.formats["comment"])
+            elif kind == "string":
+                end = string_end(text, pos)
+                if end < 0:
+                    self.setFormat(start, len(text) - start, self.formats["string"])
+                    self.setCurrentBlockState(STATE_STRING)
+                    return
+                pos = end
+                self.setFormat(start, pos - start, self.formats["string"])
@@ -0,0 +1,351 @@
+import json
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, datetime
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem
+from PyQt6.QtCore import QLocale
+from sqlalchemy import text
+from index_advisor import table_row_count
+from lob_viewer import LOB_PREVIEW_SIZE, lob_kind
+from result_store import ResultStore, NUMERIC_KINDS, kind_of
+from result_model import format_value
+from workers import start_worker
+
+# Linhas lidas na amostra quando não há estatísticas no catálogo
+SAMPLE_ROWS = 10000
+# Valores mais comuns e faixas do histograma exibidos por coluna
+MCV_COUNT = 10
+HISTOGRAM_BUCKETS = 10
+BAR_WIDTH = 30
+
+
+#######################################################################
+# ESTATÍSTICAS DO CATÁLOGO
+#######################################################################
+
+def parse_pg_array(value):
+    """Converte o texto de um anyarray do PostgreSQL ('{a,"b c",NULL}') em lista"""
+    if not value:
+        return []
+    items, current, quoted, escaped, was_quoted = [], [], False, False, False
+    for char in value.strip()[1:-1]:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+            was_quoted = True
+        elif char == "," and not quoted:
+            item = "".join(current)
+            items.append(None if item == "NULL" and not was_quoted else item)
+            current, was_quoted = [], False
+        else:
+            current.append(char)
+    item = "".join(current)
+    items.append(None if item == "NULL" and not was_quoted else item)
+    return items
+
+
+def equi_depth_histogram(bounds, fraction):
+    """Faixas de um histograma de mesma altura: [(rótulo, fração)]"""
+    if len(bounds) < 2:
+        return []
+    step = fraction / (len(bounds) - 1)
+    return [(f"{low} – {high}", step) for low, high in zip(bounds, bounds[1:])]
+
+
+def postgres_profile(conn, table, schema, rows):
+    """Perfil a partir de pg_stats (mantido pelo ANALYZE, sem ler a tabela)"""
+    query = """
+        SELECT attname, null_frac, n_distinct, most_common_vals::text, most_common_freqs,
+               histogram_bounds::text
+        FROM pg_stats
+        WHERE schemaname = COALESCE(:s, current_schema()) AND tablename = :t
+    """
+    profiles = {}
+    for name, null_frac, n_distinct, mcv, mcf, bounds in conn.execute(text(query), {"s": schema, "t": table}):
+        distinct = -n_distinct * rows if n_distinct < 0 else n_distinct
+        common = list(zip(parse_pg_array(mcv), mcf or []))
+        remaining = max(0.0, 1 - null_frac - sum(f for _, f in common))
+        profiles[name] = {
+            "source": "pg_stats",
+            "null_frac": null_frac,
+            "distinct": distinct,
+            "common": common[:MCV_COUNT],
+            "histogram": equi_depth_histogram(parse_pg_array(bounds), remaining),
+        }
+    return profiles
+
+
+def mssql_profile(conn, table, schema, rows):
+    """Perfil a partir das estatísticas de coluna (DBCC SHOW_STATISTICS)"""
+    qualified = f"{schema}.{table}" if schema else table
+    stats_query = """
+        SELECT c.name, s.name
+        FROM sys.stats s
+        JOIN sys.stats_columns sc ON sc.object_id = s.object_id AND sc.stats_id = s.stats_id
+                                 AND sc.stats_column_id = 1
+        JOIN sys.columns c ON c.object_id = sc.object_id AND c.column_id = sc.column_id
+        WHERE s.object_id = OBJECT_ID(:t)
+    """
+    profiles = {}
+    for column, stat in conn.execute(text(stats_query), {"t": qualified}).fetchall():
+        if column in profiles:
+            continue
+        target = qualified.replace("'", "''")
+        stat = stat.replace("'", "''")
+        header = conn.exec_driver_sql(f"DBCC SHOW_STATISTICS ('{target}', '{stat}') WITH STAT_HEADER").mappings().first()
+        density = conn.exec_driver_sql(f"DBCC SHOW_STATISTICS ('{target}', '{stat}') WITH DENSITY_VECTOR").first()
+        steps = conn.exec_driver_sql(f"DBCC SHOW_STATISTICS ('{target}', '{stat}') WITH HISTOGRAM").fetchall()
+        total = float(header["Rows"] or 0) if header else 0
+        if not total:
+            continue
+        nulls = sum(float(s[2]) for s in steps if s[0] is None)
+        by_frequency = sorted((s for s in steps if s[0] is not None), key=lambda s: float(s[2]), reverse=True)
+        histogram = [(f"≤ {s[0]}", (float(s[1]) + float(s[2])) / total) for s in steps if s[0] is not None]
+        profiles[column] = {
+            "source": "DBCC SHOW_STATISTICS",
+            "null_frac": nulls / total,
+            "distinct": 1 / float(density[0]) if density and density[0] else None,
+            "common": [(s[0], float(s[2]) / total) for s in by_frequency[:MCV_COUNT]],
+            "histogram": histogram,
+        }
+    return profiles
+
+
+def mysql_profile(conn, table, schema, rows):
+    """Perfil a partir dos histogramas do MySQL 8 (ANALYZE TABLE ... UPDATE HISTOGRAM)"""
+    query = """
+        SELECT COLUMN_NAME, HISTOGRAM FROM information_schema.COLUMN_STATISTICS
+        WHERE SCHEMA_NAME = COALESCE(:s, DATABASE()) AND TABLE_NAME = :t
+    """
+    profiles = {}
+    for column, histogram in conn.execute(text(query), {"s": schema, "t": table}):
+        data = json.loads(histogram) if isinstance(histogram, str) else histogram
+        buckets, previous = [], 0.0
+        common, distinct = [], 0
+        for bucket in data.get("buckets", []):
+            if data.get("histogram-type") == "singleton":
+                value, cumulative = bucket[0], bucket[1]
+                common.append((value, cumulative - previous))
+                buckets.append((str(value), cumulative - previous))
+                distinct += 1
+            else:
+                low, high, cumulative, ndv = bucket[:4]
+                buckets.append((f"{low} – {high}", cumulative - previous))
+                distinct += ndv
+            previous = cumulative
+        profiles[column] = {
+            "source": "histograma MySQL",
+            "null_frac": data.get("null-values", 0),
+            "distinct": distinct,
+            "common": sorted(common, key=lambda c: c[1], reverse=True)[:MCV_COUNT],
+            "histogram": buckets,
+        }
+    return profiles
+
+
+CATALOG_READERS = {
+    "postgresql": postgres_profile,
+    "mssql": mssql_profile,
+    "mysql": mysql_profile,
+}
+
+
+#######################################################################
+# AMOSTRA (QUANDO NÃO HÁ ESTATÍSTICAS)
+#######################################################################
+
+def sample_query(engine, table, schema, column_names, rows, truncated=()):
+    """Uma única consulta amostrada, limitada a SAMPLE_ROWS linhas"""
+    quote = engine.dialect.identifier_preparer.quote
+    target = f"{quote(schema)}.{quote(table)}" if schema else quote(table)
+    # Textos longos entram só com o início, como na pré-visualização
+    columns = ", ".join(f"SUBSTRING({quote(c)}, 1, {LOB_PREVIEW_SIZE}) AS {quote(c)}" if c in truncated else quote(c)
+                        for c in column_names)
+    percent = min(100.0, max(0.01, 100.0 * SAMPLE_ROWS / rows)) if rows else 100.0
+    dialect_name = engine.dialect.name
+    if dialect_name == "postgresql":
+        return f"SELECT {columns} FROM {target} TABLESAMPLE SYSTEM ({percent:.4f}) LIMIT {SAMPLE_ROWS}"
+    if dialect_name == "mssql":
+        return f"SELECT TOP {SAMPLE_ROWS} {columns} FROM {target} TABLESAMPLE SYSTEM ({percent:.4f} PERCENT)"
+    # Sem TABLESAMPLE (MySQL e outros): lê apenas as primeiras linhas
+    return f"SELECT {columns} FROM {target} LIMIT {SAMPLE_ROWS}"
+
+
+def estimate_distinct(counts, population):
+    """Estimador Duj1 (Haas & Stokes) de valores distintos na tabela a partir da amostra"""
+    n = sum(counts.values())
+    if not n:
+        return 0
+    d = len(counts)
+    if not population or population <= n:
+        return d
+    f1 = sum(1 for c in counts.values() if c == 1)
+    return n * d / (n - f1 + f1 * n / population)
+
+
+def numeric_key(value):
+    """Valor usado para distribuir em faixas (datas viram números)"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return value.toordinal()
+    return float(value)
+
+
+def bucket_label(key, kind):
+    """Rótulo do início de uma faixa de mesma largura"""
+    if kind == "datetime":
+        return datetime.fromtimestamp(key).isoformat(" ", "seconds")
+    if kind == "date":
+        return date.fromordinal(int(key)).isoformat()
+    return f"{key:.4g}"
+
+
+def sample_histogram(values, kind):
+    """Histograma de mesma largura (números/datas) ou de mesma altura (demais)"""
+    if not values:
+        return []
+    n = len(values)
+    if kind in NUMERIC_KINDS or kind in ("date", "datetime"):
+        keys = [numeric_key(v) for v in values]
+        low, high = min(keys), max(keys)
+        if low == high:
+            return [(str(values[0]), 1.0)]
+        width = (high - low) / HISTOGRAM_BUCKETS
+        counts = Counter(min(int((k - low) / width), HISTOGRAM_BUCKETS - 1) for k in keys)
+        return [(f"≥ {bucket_label(low + i * width, kind)}", counts[i] / n) for i in range(HISTOGRAM_BUCKETS)]
+    try:
+        ordered = sorted(values)
+    except TypeError:
+        ordered = sorted(map(str, values))
+    # Limites pelos quantis da amostra; valores repetidos unem faixas vizinhas
+    bounds = sorted(set(ordered[min(n - 1, i * n // HISTOGRAM_BUCKETS)] for i in range(HISTOGRAM_BUCKETS)))
+    if bounds[-1] != ordered[-1]:
+        bounds.append(ordered[-1])
+    histogram = []
+    for i, (low, high) in enumerate(zip(bounds, bounds[1:])):
+        start = bisect_left(ordered, low)
+        stop = bisect_right(ordered, high) if i == len(bounds) - 2 else bisect_left(ordered, high)
+        histogram.append((f"{low} – {high}", (stop - start) / n))
+    return histogram or [(str(ordered[0]), 1.0)]
+
+
+def sample_profile(engine, conn, table, schema, column_names, rows, truncated=()):
+    """Perfil calculado sobre uma amostra, sem varrer a tabela inteira"""
+    result = conn.execute(text(sample_query(engine, table, schema, column_names, rows, truncated)))
+    store = ResultStore.from_rows(list(result.keys()), result.fetchall())
+    profiles = {}
+    for column in store.columns:
+        values = [column.values[i] for i in column.non_null_rows()]
+        try:
+            counts = Counter(values)
+        except TypeError:
+            counts = Counter(map(repr, values))
+        profiles[column.name] = {
+            "source": f"amostra ({store.row_count} linhas)",
+            "null_frac": column.null_count / store.row_count if store.row_count else 0,
+            "distinct": estimate_distinct(counts, rows),
+            "common": [(v, c / store.row_count) for v, c in counts.most_common(MCV_COUNT) if c > 1],
+            "histogram": sample_histogram(values, column.kind),
+        }
+    return profiles
+
+
+def profile_table(engine, table, columns, schema=None):
+    """Perfil por coluna: catálogo quando disponível, senão uma única amostra"""
+    dialect_name = engine.dialect.name
+    with engine.connect() as conn:
+        # Estimativa do catálogo (sem COUNT(*)); -1 no PostgreSQL quando nunca analisada
+        rows = max(0, table_row_count(conn, dialect_name, table, schema))
+        reader = CATALOG_READERS.get(dialect_name)
+        try:
+            profiles = reader(conn, table, schema, rows) if reader else {}
+        except Exception:
+            # Sem permissão ou versão sem o catálogo: segue com a amostra
+            conn.rollback()
+            profiles = {}
+
+        # Binários e JSON/XML grandes não entram na amostra
+        missing = [c["name"] for c in columns
+                   if c["name"] not in profiles and lob_kind(c["type"]) in (None, "text")]
+        truncated = {c["name"] for c in columns if lob_kind(c["type"]) == "text"}
+        if missing:
+            profiles.update(sample_profile(engine, conn, table, schema, missing, rows, truncated))
+    for column in columns:
+        if column["name"] not in profiles:
+            profiles[column["name"]] = {"source": "LOB (não perfilado)", "null_frac": None,
+                                        "distinct": None, "common": [], "histogram": []}
+    return rows, profiles
+
+
+#######################################################################
+# PAINEL DE PERFIL
+#######################################################################
+
+class TableProfilePane(QWidget):
+    """Painel lateral do Explorador com o perfil das colunas da tabela"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.locale = QLocale()
+        self.worker = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        top_layout = QHBoxLayout()
+        self.title = QLabel("Perfil da tabela")
+        top_layout.addWidget(self.title, 1)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.hide)
+        top_layout.addWidget(close_btn)
+        layout.addLayout(top_layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Coluna / valor", "Nulos", "Distintos", "Fonte"])
+        self.tree.setColumnWidth(0, 220)
+        layout.addWidget(self.tree, 1)
+
+    def load(self, engine, table_name, columns):
+        """Lê o perfil da tabela numa thread de trabalho"""
+        if self.worker:
+            self.worker.cancel()
+        self.tree.clear()
+        self.title.setText(f"Perfil de {table_name}: carregando...")
+        self.show()
+        self.worker = start_worker(profile_table, engine, table_name, columns,
+                                   on_finished=lambda result: self.show_profile(table_name, columns, *result),
+                                   on_error=self.on_error)
+
+    def show_profile(self, table_name, columns, rows, profiles):
+        self.worker = None
+        self.title.setText(f"Perfil de {table_name} (~{self.locale.toString(int(rows or 0))} linhas)")
+        for column in columns:
+            profile = profiles.get(column["name"])
+            if profile is None:
+                continue
+            null_frac = "" if profile["null_frac"] is None else f"{profile['null_frac'] * 100:.1f}%"
+            distinct = "" if profile["distinct"] is None else self.locale.toString(int(round(profile["distinct"])))
+            item = QTreeWidgetItem([column["name"], null_frac, distinct, profile["source"]])
+            self.tree.addTopLevelItem(item)
+
+            if profile["common"]:
+                common = QTreeWidgetItem(["Mais comuns"])
+                item.addChild(common)
+                for value, frac in profile["common"]:
+                    label = "NULL" if value is None else format_value(value, kind_of(type(value)), self.locale)
+                    common.addChild(QTreeWidgetItem([f"{label}  ({frac * 100:.1f}%)"]))
+            if profile["histogram"]:
+                histogram = QTreeWidgetItem(["Histograma"])
+                item.addChild(histogram)
+                peak = max(frac for _, frac in profile["histogram"]) or 1
+                for label, frac in profile["histogram"]:
+                    bar = "█" * max(1, round(BAR_WIDTH * frac / peak)) if frac else ""
+                    histogram.addChild(QTreeWidgetItem([f"{bar} {frac * 100:.1f}%", "", "", str(label)]))
+
+    def on_error(self, error):
+        self.worker = None
+        self.title.setText(f"Erro ao calcular o perfil: {error}")
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import JSON, Column, Integer, MetaData, String, Table, create_engine, select
+from changeset import Changeset, column_kind, edit_text, parse_input
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT, qtd INTEGER)")
+        conn.exec_driver_sql("INSERT INTO itens VALUES (1, 'a', 1), (2, 'b', 2), (3, 'c', 3), (4, 'd', 4)")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def table():
+    return Table("itens", MetaData(), Column("id", Integer, primary_key=True), Column("nome", String),
+                 Column("qtd", Integer))
+
+
+def test_reverting_a_value_drops_the_update(table):
+    changeset = Changeset(table, ["id"])
+    changeset.set_value((1,), "nome", "x", "a")
+    assert len(changeset) == 1
+    changeset.set_value((1,), "nome", "a", "a")
+    assert len(changeset) == 0 and not changeset.updates
+
+
+def test_delete_discards_pending_updates(table):
+    changeset = Changeset(table, ["id"])
+    changeset.set_value((1,), "nome", "x", "a")
+    changeset.delete((1,))
+    assert not changeset.updates and list(changeset.deletes) == [(1,)]
+
+
+def test_statements_batch_by_changed_columns(table):
+    changeset = Changeset(table, ["id"])
+    changeset.delete((4,))
+    changeset.set_value((1,), "nome", "x", "a")
+    changeset.set_value((2,), "nome", "y", "b")
+    changeset.set_value((3,), "qtd", 30, 3)
+    changeset.inserts.append({"id": 5, "nome": "e", "qtd": None})
+    batches = changeset.statements()
+    kinds = [("delete" if s.is_delete else "update" if s.is_update else "insert", len(p)) for s, p in batches]
+    # DELETE, um UPDATE por conjunto de colunas e INSERT, nessa ordem
+    assert kinds == [("delete", 1), ("update", 2), ("update", 1), ("insert", 1)]
+
+
+def test_apply_writes_everything_in_one_transaction(engine, table):
+    changeset = Changeset(table, ["id"])
+    changeset.delete((4,))
+    changeset.set_value((1,), "nome", "x", "a")
+    changeset.set_value((2,), "qtd", 20, 2)
+    changeset.inserts.append({"id": 5, "nome": "e", "qtd": 5})
+    changeset.apply(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(select(table).order_by(table.c.id)).fetchall()
+    assert rows == [(1, "x", 1), (2, "b", 20), (3, "c", 3), (5, "e", 5)]
+
+
+def test_apply_rolls_back_when_a_row_disappeared(engine, table):
+    changeset = Changeset(table, ["id"])
+    changeset.set_value((1,), "nome", "x", "a")
+    changeset.set_value((99,), "nome", "y", "?")
+    with pytest.raises(ValueError):
+        changeset.apply(engine)
+    with engine.connect() as conn:
+        assert conn.execute(select(table.c.nome).where(table.c.id == 1)).scalar() == "a"
+
+
+def test_json_columns_store_the_parsed_object(engine):
+    table = Table("docs", MetaData(), Column("id", Integer, primary_key=True), Column("dados", JSON))
+    table.create(engine)
+    kind = column_kind(table.c.dados.type)
+    assert kind == "json"
+    assert edit_text({"a": [1, "ç"]}, kind) == '{"a": [1, "ç"]}'
+    with pytest.raises(ValueError):
+        parse_input("{a: 1}", kind)
+
+    changeset = Changeset(table, ["id"])
+    changeset.inserts.append({"id": 1, "dados": parse_input('{"a": 1}', kind)})
+    changeset.apply(engine)
+    with engine.connect() as conn:
+        # Gravado como objeto JSON, não como uma string JSON com o texto digitado
+        assert conn.exec_driver_sql("SELECT dados FROM docs").scalar() == '{"a": 1}'
+        assert conn.execute(select(table.c.dados)).scalar() == {"a": 1}
@@ -0,0 +1,43 @@
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication, QTableView
+from column_widths import MAX_WIDTH, ColumnWidthEstimator
+from result_model import ResultTableModel
+from result_store import ResultStore
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def view(app):
+    view = QTableView()
+    view.setModel(ResultTableModel(view))
+    return view
+
+
+def test_widths_grow_with_new_rows_up_to_the_limit(view):
+    model = view.model()
+    model.set_store(ResultStore.from_rows(["id", "nome"], [(1, "a")]))
+    widths = ColumnWidthEstimator(view)
+    widths.fit("SELECT 1")
+    before = list(widths.widths)
+    model.append_rows([(2, "x" * 1000)])
+    assert widths.widths[0] == before[0]
+    assert widths.widths[1] == MAX_WIDTH
+
+
+def test_cache_keeps_only_the_most_recently_used_keys(view):
+    view.model().set_store(ResultStore.from_rows(["id"], [(1,)]))
+    widths = ColumnWidthEstimator(view, cache_size=2)
+    for key in ("a", "b", "a", "c"):
+        widths.fit(key)
+    assert list(widths.cache) == ["a", "c"]
+    view.horizontalHeader().resizeSection(0, 123)
+    widths.fit("b")
+    widths.fit("c")
+    assert widths.cache["c"] == [123]
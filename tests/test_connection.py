@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+from connection import connection_url, dispose_after, is_read_only_sql, run_with_reconnect
+
+
+class Disconnect(Exception):
+    pass
+
+
+def dbapi_error(invalidated):
+    return DBAPIError("SELECT 1", None, Disconnect(), connection_invalidated=invalidated)
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM t",
+    "  (select 1)",
+    "WITH x AS (SELECT 1) SELECT * FROM x",
+    "EXPLAIN SELECT 1",
+    "SHOW TABLES",
+])
+def test_read_only_sql(sql):
+    assert is_read_only_sql(sql)
+
+
+@pytest.mark.parametrize("sql", [
+    "UPDATE t SET a = 1",
+    "SELECT * INTO copia FROM t",
+    "SELECT * FROM t FOR UPDATE",
+    "WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x",
+    "SELECT nextval('seq')",
+    "",
+])
+def test_writing_sql(sql):
+    assert not is_read_only_sql(sql)
+
+
+def test_run_with_reconnect_retries_read_only_after_disconnect():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            raise dbapi_error(invalidated=True)
+        return "ok"
+
+    assert run_with_reconnect(fn, retry=True) == ("ok", True)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("retry, invalidated", [(False, True), (True, False)])
+def test_run_with_reconnect_does_not_retry(retry, invalidated):
+    def fn():
+        raise dbapi_error(invalidated)
+
+    with pytest.raises(DBAPIError):
+        run_with_reconnect(fn, retry=retry)
+
+
+def test_connection_url_escapes_password():
+    url = connection_url("PostgreSQL", "host", "5432", "banco", "user", "p@ss:w/rd")
+    assert url.password == "p@ss:w/rd"
+    assert url.port == 5432
+    assert "p%40ss" in url.render_as_string(hide_password=False)
+
+
+def test_dispose_after_disposes_on_finish_and_cancel():
+    disposed = []
+
+    class Engine:
+        def dispose(self):
+            disposed.append(self)
+
+    def work():
+        yield 1
+        yield 2
+        return "fim"
+
+    generator = dispose_after(work(), Engine())
+    assert next(generator) == 1
+    generator.close()
+    assert len(disposed) == 1
+
+    generator = dispose_after(work(), Engine(), Engine())
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            next(generator)
+    assert stop.value.value == "fim"
+    assert len(disposed) == 3
@@ -0,0 +1,49 @@
+import json
+from types import SimpleNamespace
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects import mssql, postgresql
+from index_advisor import analyze_history, format_report_entry, key_columns, postgres_scans
+
+
+class PlanConnection:
+    """Conexão falsa que guarda o comando compilado e devolve um plano fixo"""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.compiled = None
+
+    def execute(self, statement):
+        self.compiled = statement.compile(dialect=postgresql.dialect())
+        return SimpleNamespace(scalar=lambda: json.dumps(self.plan))
+
+
+def test_postgres_explain_binds_parameter_values():
+    plan = [{"Plan": {"Node Type": "Seq Scan", "Schema": "public", "Relation Name": "pedidos",
+                      "Plan Rows": 500, "Filter": "(cliente = $1)", "Output": ["id", "cliente"]}}]
+    conn = PlanConnection(plan)
+    scans = postgres_scans(conn, "SELECT * FROM pedidos WHERE cliente = :cliente",
+                           {"cliente": (7, sqltypes.Integer())})
+    assert conn.compiled.params == {"cliente": 7}
+    assert conn.compiled.string.startswith("EXPLAIN (FORMAT JSON, VERBOSE) SELECT")
+    assert [(s["table"], s["kind"], s["rows"]) for s in scans] == [("pedidos", "Seq Scan", 500)]
+
+
+class NoConnection:
+    """Conexão que não deve ser usada (nenhuma consulta chega ao servidor)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_parameterized_queries_are_skipped_without_bind_support():
+    engine = SimpleNamespace(dialect=mssql.dialect(), connect=lambda: NoConnection())
+    entries = list(analyze_history(engine, [("SELECT * FROM t WHERE id = :id", {"id": (1, sqltypes.Integer())})]))
+    assert [e.get("skipped") is not None for e in entries] == [True]
+    assert "Ignorada" in format_report_entry(entries[0])
+
+
+def test_key_columns_put_equalities_first():
+    assert key_columns("((criado > now()) AND (cliente = 7))", ["id", "cliente", "criado"]) == ["cliente", "criado"]
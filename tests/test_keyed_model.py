@@ -0,0 +1,29 @@
+from keyed_model import KeyedTableModel, contiguous_runs
+from server_activity import blocking_chain
+
+
+def test_contiguous_runs_from_bottom_to_top():
+    assert contiguous_runs([1, 2, 3, 7, 9, 10]) == [[9, 10], [7, 7], [1, 3]]
+    assert contiguous_runs([]) == []
+
+
+def test_set_rows_emits_only_what_changed():
+    model = KeyedTableModel()
+    model.set_rows(["id", "estado"], [(1, "a"), (2, "b"), (3, "c"), (4, "d")])
+    events = []
+    model.rowsRemoved.connect(lambda _, first, last: events.append(("removed", first, last)))
+    model.rowsInserted.connect(lambda _, first, last: events.append(("inserted", first, last)))
+    model.dataChanged.connect(lambda top, bottom: events.append(("changed", top.row(), top.column())))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+
+    model.set_rows(["id", "estado"], [(1, "a"), (4, "x"), (5, "e")])
+    assert events == [("removed", 1, 2), ("changed", 1, 1), ("inserted", 2, 2)]
+    assert model.rows == [(1, "a"), (4, "x"), (5, "e")]
+    assert model.positions == {(1,): 0, (4,): 1, (5,): 2}
+
+
+def test_blocking_chain_follows_first_blocker_and_stops_on_cycles():
+    blockers = {"3": "2", "2": "1", "5": "6", "6": "5"}
+    assert blocking_chain(3, blockers) == "3 ← 2 ← 1"
+    assert blocking_chain(5, blockers) == "5 ← 6"
+    assert blocking_chain(1, blockers) == ""
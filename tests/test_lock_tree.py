@@ -0,0 +1,55 @@
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+from lock_tree import LockTreeTab, tree_parents
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def sessions(blockers):
+    """Leitura no formato de read_locks: sessão -> (bloqueador, colunas exibidas)"""
+    return {s: (b, (s, "", "", "", "0.0", "", "")) for s, b in blockers.items()}
+
+
+def tree_shape(tab):
+    """{sessão: sessão do pai} segundo os itens da árvore"""
+    shape = {}
+
+    def walk(item, parent):
+        shape[item.text(0)] = parent
+        for i in range(item.childCount()):
+            walk(item.child(i), item.text(0))
+
+    for i in range(tab.tree.topLevelItemCount()):
+        walk(tab.tree.topLevelItem(i), None)
+    return shape
+
+
+def test_tree_parents_turns_deadlocks_into_roots():
+    assert tree_parents(sessions({"1": None, "2": "1", "3": "2", "4": "5", "5": "4", "6": "9"})) == {
+        "1": None, "2": "1", "3": "2", "4": None, "5": None, "6": None}
+
+
+def test_reversed_chain_is_reparented_without_cycles(app):
+    tab = LockTreeTab()
+    tab.on_result(sessions({"A": None, "B": "A", "C": "B"}))
+    assert tree_shape(tab) == {"A": None, "B": "A", "C": "B"}
+    # A cadeia se inverte entre duas leituras: B passa a bloquear A (A vem
+    # antes na leitura, então é reposicionado enquanto B ainda é seu filho)
+    tab.on_result(sessions({"A": "B", "B": None, "C": "B"}))
+    assert tree_shape(tab) == {"B": None, "A": "B", "C": "B"}
+    tab.on_result(sessions({"B": "A", "A": "C", "C": None}))
+    assert tree_shape(tab) == {"C": None, "A": "C", "B": "A"}
+
+
+def test_finished_sessions_leave_and_their_children_move_up(app):
+    tab = LockTreeTab()
+    tab.on_result(sessions({"A": None, "B": "A", "C": "B"}))
+    tab.on_result(sessions({"A": None, "C": "A"}))
+    assert tree_shape(tab) == {"A": None, "C": "A"}
+    assert set(tab.items) == {"A", "C"}
@@ -0,0 +1,62 @@
+import pytest
+from pivot import MAX_PIVOT_COLUMNS, pivot_store
+from result_store import ResultStore
+
+NAMES = ["regiao", "produto", "valor"]
+ROWS = [
+    ("sul", "a", 10),
+    ("norte", "b", 5),
+    ("sul", "b", None),
+    ("sul", "a", 2),
+    (None, "a", 1),
+]
+
+
+def all_rows(store):
+    return [store.row(row) for row in range(store.row_count)]
+
+
+@pytest.fixture
+def store():
+    return ResultStore.from_rows(NAMES, ROWS)
+
+
+def test_count_rows_per_group_sorted_with_nulls_first(store):
+    result = pivot_store(store, [0], None, "count")
+    assert result.column_names == ["regiao", "Contagem((linhas))"]
+    assert all_rows(result) == [(None, 1), ("norte", 1), ("sul", 3)]
+
+
+@pytest.mark.parametrize("function, expected", [
+    ("count", [(None, 1), ("norte", 1), ("sul", 2)]),
+    ("sum", [(None, 1), ("norte", 5), ("sul", 12)]),
+    ("avg", [(None, 1.0), ("norte", 5.0), ("sul", 6.0)]),
+    ("min", [(None, 1), ("norte", 5), ("sul", 2)]),
+    ("max", [(None, 1), ("norte", 5), ("sul", 10)]),
+])
+def test_aggregates_ignore_nulls(store, function, expected):
+    assert all_rows(pivot_store(store, [0], 2, function)) == expected
+
+
+def test_pivot_column_values_become_columns(store):
+    result = pivot_store(store, [0], 2, "sum", pivot_column=1)
+    assert result.column_names == ["regiao", "a", "b"]
+    # Célula sem linhas fica nula; célula só com nulos também
+    assert all_rows(result) == [(None, 1, None), ("norte", None, 5), ("sul", 12, None)]
+    counts = pivot_store(store, [0], None, "count", pivot_column=1)
+    assert all_rows(counts) == [(None, 1, 0), ("norte", 0, 1), ("sul", 2, 1)]
+
+
+def test_without_groups_aggregates_everything(store):
+    assert all_rows(pivot_store(store, [], 2, "sum")) == [(18,)]
+
+
+def test_sum_of_text_is_rejected(store):
+    with pytest.raises(ValueError):
+        pivot_store(store, [0], 1, "sum")
+
+
+def test_too_many_pivot_values_is_rejected():
+    store = ResultStore.from_rows(["id"], [(i,) for i in range(MAX_PIVOT_COLUMNS + 1)])
+    with pytest.raises(ValueError):
+        pivot_store(store, [], None, "count", pivot_column=0)
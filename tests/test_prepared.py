@@ -0,0 +1,78 @@
+from decimal import Decimal
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy import types as sqltypes
+from sqlalchemy.exc import DBAPIError
+from prepared import (StatementCache, bound_args, driver_errors, execute_prepared, preparable, pyodbc_execute,
+                      statement_cache)
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1), (2), (3)")
+        yield conn
+    engine.dispose()
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT * FROM t WHERE id = :id", True),
+    ("  (SELECT 1)", True),
+    ("WITH x AS (SELECT 1) SELECT * FROM x;", True),
+    ("VALUES (1)", True),
+    ("SELECT 1; SELECT 2", False),
+    ("EXPLAIN SELECT 1", False),
+    ("SELECT * FROM t FOR UPDATE", False),
+    ("UPDATE t SET x = 1", False),
+])
+def test_preparable(sql, expected):
+    assert preparable(sql) is expected
+
+
+def test_statement_cache_evicts_least_recently_used():
+    cache = StatementCache(size=2)
+    assert cache.add("a", 1) == []
+    assert cache.add("b", 2) == []
+    cache.get("a")
+    assert cache.add("c", 3) == [2]
+    assert cache.get("b") is None and cache.get("a") == 1
+    assert cache.created == 3 and len(cache) == 2
+
+
+def test_buffering_driver_prepares_only_results_that_fit():
+    conn = SimpleNamespace(dialect=SimpleNamespace(driver="psycopg2"))
+    assert execute_prepared(conn, "SELECT 1", {}, fits_in_memory=False) is None
+
+
+def test_unsupported_driver_is_not_prepared(conn):
+    assert execute_prepared(conn, "SELECT x FROM t", {}) is None
+
+
+def test_bound_args_apply_type_processors(conn):
+    values = {"n": (Decimal("1.5"), sqltypes.Numeric()), "s": ("a", sqltypes.String())}
+    # O Numeric do SQLite converte Decimal para float antes de enviar
+    assert bound_args(conn.dialect, ["n", "s"], values) == [1.5, "a"]
+
+
+def test_cursor_is_kept_only_when_fully_read(conn):
+    values = {"n": (1, sqltypes.Integer())}
+    with pyodbc_execute(conn, "SELECT x FROM t WHERE x > :n ORDER BY x", values) as result:
+        assert result.keys() == ["x"]
+        assert result.fetchmany(1) == [(2,)]
+    # Lido em parte: o cursor foi fechado e saiu do cache
+    assert len(statement_cache(conn)) == 0
+
+    with pyodbc_execute(conn, "SELECT x FROM t WHERE x > :n ORDER BY x", values) as result:
+        assert result.fetchmany(10) == [(2,), (3,)]
+    assert len(statement_cache(conn)) == 1
+
+
+def test_driver_errors_are_wrapped(conn):
+    cursor = conn.connection.cursor()
+    with pytest.raises(DBAPIError) as error:
+        with driver_errors(conn, "SELEC", cursor=cursor):
+            cursor.execute("SELEC")
+    assert not error.value.connection_invalidated
@@ -0,0 +1,45 @@
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects import postgresql
+from query_params import bind_parameters, find_parameters
+
+
+def test_find_parameters_in_order_without_duplicates():
+    assert find_parameters("SELECT * FROM t WHERE a = :id AND b > :inicio OR a = :id") == ["id", "inicio"]
+
+
+def test_find_parameters_ignores_literals_comments_and_casts():
+    sql = """SELECT ':falso', x::int, y\\:z -- :comentario
+             FROM t /* :bloco */ WHERE d = :dia"""
+    assert find_parameters(sql) == ["dia"]
+
+
+def test_bind_parameters_keeps_sql_text_and_types():
+    values = {"dia": (date(2024, 1, 31), sqltypes.Date()), "n": (5, sqltypes.Integer())}
+    statement = bind_parameters("SELECT * FROM t WHERE d = :dia AND n > :n", values)
+    compiled = statement.compile(dialect=postgresql.dialect())
+    # O texto enviado não depende dos valores (o plano do servidor é reaproveitado)
+    assert compiled.string == "SELECT * FROM t WHERE d = %(dia)s AND n > %(n)s"
+    assert compiled.params == {"dia": date(2024, 1, 31), "n": 5}
+    assert isinstance(compiled.binds["dia"].type, sqltypes.Date)
+
+
+def test_bind_parameters_executes():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        result = conn.execute(bind_parameters("SELECT :a + :b, :t", {"a": (2, sqltypes.Integer()),
+                                                                   "b": (3, sqltypes.Integer()),
+                                                                   "t": ("x", sqltypes.String())}))
+        assert result.one() == (5, "x")
+    engine.dispose()
+
+
+def test_bind_parameters_ignores_colons_in_literals_and_comments():
+    sql = "SELECT ':falso', '10:30', :n /* :bloco */ -- a :b\n"
+    assert find_parameters(sql) == ["n"]
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        assert conn.execute(bind_parameters(sql, {"n": (1, sqltypes.Integer())})).one() == (":falso", "10:30", 1)
+        assert conn.execute(bind_parameters("SELECT ':x'", {})).scalar() == ":x"
+    engine.dispose()
@@ -0,0 +1,60 @@
+import math
+from datetime import date, datetime
+from result_chart import chart_data, histogram, line_series, lttb, visible_series
+from result_store import ResultStore
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    xs = list(range(1000))
+    ys = [math.sin(x / 20) for x in xs]
+    out_x, out_y = lttb(xs, ys, 100)
+    assert len(out_x) == len(out_y) == 100
+    assert (out_x[0], out_x[-1]) == (0, 999)
+    assert out_x == sorted(out_x)
+    assert all(ys[x] == y for x, y in zip(out_x, out_y))
+
+
+def test_lttb_keeps_a_single_peak():
+    xs = list(range(500))
+    ys = [0.0] * 500
+    ys[250] = 100.0
+    out_x, _ = lttb(xs, ys, 20)
+    assert 250 in out_x
+
+
+def test_lttb_returns_short_series_unchanged():
+    assert lttb([1, 2, 3], [4, 5, 6], 10) == ([1, 2, 3], [4, 5, 6])
+    assert lttb([1, 2, 3], [4, 5, 6], 2) == ([1, 2, 3], [4, 5, 6])
+
+
+def test_visible_series_includes_one_point_past_each_edge():
+    xs = list(range(100))
+    ys = [float(x) for x in xs]
+    out_x, _ = visible_series(xs, ys, 10.5, 20.5)
+    assert out_x == list(range(10, 22))
+    out_x, _ = visible_series(xs, ys, 10, 90, threshold=5)
+    assert len(out_x) == 5
+    assert (out_x[0], out_x[-1]) == (9, 91)
+
+
+def test_histogram_counts_every_value_including_the_maximum():
+    low, width, counts = histogram([0, 1, 2, 3, 4, 10], bins=5)
+    assert (low, width) == (0, 2.0)
+    assert counts == [2, 2, 1, 0, 1]
+    assert histogram([]) == (0.0, 1.0, [])
+    assert histogram([5, 5], bins=3)[2] == [2, 0, 0]
+
+
+def test_line_series_accepts_time_columns_on_both_axes():
+    store = ResultStore.from_rows(["n", "dia", "momento"], [
+        (2, date(2024, 1, 2), datetime(2024, 1, 2, 12)),
+        (1, date(2024, 1, 1), None),
+        (3, None, datetime(2024, 1, 3)),
+        (0, date(2023, 12, 31), datetime(2023, 12, 31, 6)),
+    ])
+    xs, ys = line_series(store, 1, 2)
+    # Ordenado por X, sem as linhas com algum nulo
+    assert list(xs) == [datetime(2023, 12, 31).timestamp(), datetime(2024, 1, 2).timestamp()]
+    assert list(ys) == [datetime(2023, 12, 31, 6).timestamp(), datetime(2024, 1, 2, 12).timestamp()]
+    data = chart_data(store, "Linha", 0, 2)
+    assert data["y_kind"] == "datetime" and len(data["xs"]) == 3
@@ -0,0 +1,47 @@
+from result_model import ResultTableModel, diff_key_columns, row_keys
+from result_store import ResultStore
+
+
+def store_of(rows, names=("id", "nome")):
+    return ResultStore.from_rows(list(names), rows)
+
+
+def displayed(model):
+    return [tuple(model.native_value(row, c) for c in range(model.columnCount()))
+            for row in range(model.rowCount())]
+
+
+def test_row_keys_number_repeated_keys():
+    store = store_of([(1, "a"), (1, "a"), (2, "b")])
+    assert row_keys(store, [0]) == [((1,), 0), ((1,), 1), ((2,), 0)]
+
+
+def test_diff_key_columns_uses_first_column_only_when_unique():
+    unique = store_of([(1, "a"), (2, "b")])
+    assert diff_key_columns(unique, store_of([(2, "x"), (3, "c")])) == [0]
+    assert diff_key_columns(unique, store_of([(2, "x"), (2, "y")])) == [0, 1]
+    assert diff_key_columns(store_of([(None, "a")]), unique) == [0, 1]
+
+
+def test_update_store_emits_only_the_differences():
+    model = ResultTableModel()
+    model.set_store(store_of([(1, "a"), (2, "b"), (3, "c"), (4, "d")]))
+    events = []
+    model.rowsRemoved.connect(lambda _, first, last: events.append(("removed", first, last)))
+    model.rowsInserted.connect(lambda _, first, last: events.append(("inserted", first, last)))
+    model.dataChanged.connect(lambda top, bottom: events.append(("changed", top.row(), top.column(), bottom.column())))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+
+    model.update_store(store_of([(5, "e"), (4, "x"), (1, "a")]))
+    assert events == [("removed", 1, 2), ("changed", 1, 1, 1), ("inserted", 2, 2)]
+    # As linhas que continuam mantêm a posição; as novas vão para o fim
+    assert displayed(model) == [(1, "a"), (4, "x"), (5, "e")]
+
+
+def test_update_store_resets_when_columns_change():
+    model = ResultTableModel()
+    model.set_store(store_of([(1, "a")]))
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.update_store(store_of([(1, "a")], names=("id", "outro")))
+    assert resets == [True]
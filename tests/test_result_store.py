@@ -0,0 +1,68 @@
+from array import array
+from datetime import date
+from decimal import Decimal
+from result_store import ResultStore, TypedColumn
+
+
+def test_numeric_column_uses_typed_array():
+    column = TypedColumn("n")
+    column.extend((1, None, 3))
+    assert column.kind == "int"
+    assert isinstance(column.values, array)
+    assert column.null_count == 1
+    assert [column.get(i) for i in range(3)] == [1, None, 3]
+
+
+def test_nulls_before_first_value_are_preserved():
+    column = TypedColumn("n")
+    column.extend((None, None))
+    column.extend((2.5,))
+    assert column.kind == "float"
+    assert [column.get(i) for i in range(3)] == [None, None, 2.5]
+
+
+def test_mixed_types_promote_to_object():
+    column = TypedColumn("n")
+    column.extend((1, 2))
+    column.extend(("x", None))
+    assert column.kind == "object"
+    assert [column.get(i) for i in range(4)] == [1, 2, "x", None]
+
+
+def test_int_overflow_promotes_to_object():
+    column = TypedColumn("n")
+    column.extend((1,))
+    column.extend((2 ** 70,))
+    assert column.kind == "object"
+    assert column.get(1) == 2 ** 70
+
+
+def test_set_updates_null_count_and_kind():
+    column = TypedColumn("n")
+    column.extend((1, None))
+    column.set(1, 5)
+    assert column.null_count == 0 and column.get(1) == 5
+    column.set(0, None)
+    assert column.null_count == 1 and column.get(0) is None
+    column.set(1, "texto")
+    assert column.kind == "object" and column.get(1) == "texto"
+
+
+def test_store_keeps_native_values():
+    rows = [(1, "a", Decimal("1.50"), date(2024, 1, 1)), (2, None, None, None)]
+    store = ResultStore.from_rows(["id", "nome", "preco", "dia"], rows)
+    assert store.row_count == 2
+    assert [store.kind(c) for c in range(4)] == ["int", "text", "decimal", "date"]
+    assert store.row(0) == rows[0]
+    assert store.row(1) == rows[1]
+
+
+def test_sorted_rows_puts_nulls_first_ascending_and_last_descending():
+    store = ResultStore.from_rows(["n"], [(3,), (None,), (1,), (2,)])
+    assert store.sorted_rows(0) == [1, 2, 3, 0]
+    assert store.sorted_rows(0, descending=True) == [0, 3, 2, 1]
+
+
+def test_sorted_rows_compares_mixed_column_as_text():
+    store = ResultStore.from_rows(["n"], [(10,), ("9",), (None,)])
+    assert store.sorted_rows(0) == [2, 0, 1]
@@ -0,0 +1,62 @@
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from schema_diff import CHANGED, ONLY_SOURCE, ONLY_TARGET, alter_script, compare_schemas, diff_objects
+
+
+def sqlite_engine(path, statements):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+    return engine
+
+
+def run_comparison(source, target):
+    generator = compare_schemas(source, target)
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def test_diff_objects_classifies_changes():
+    entries = []
+    diff_objects(entries, "t", "coluna", {"a": 1, "b": 2, "c": 3}, {"b": 2, "c": 4, "d": 5})
+    assert [(e["name"], e["change"]) for e in entries] == [("a", ONLY_SOURCE), ("c", CHANGED), ("d", ONLY_TARGET)]
+
+
+def test_compare_schemas_and_alter_script(tmp_path):
+    source = sqlite_engine(tmp_path / "origem.db", [
+        "CREATE TABLE clientes (id INTEGER PRIMARY KEY, nome VARCHAR(100) NOT NULL, email VARCHAR(200))",
+        "CREATE INDEX ix_clientes_email ON clientes (email)",
+        "CREATE TABLE pedidos (id INTEGER PRIMARY KEY, cliente_id INTEGER REFERENCES clientes (id))",
+    ])
+    target = sqlite_engine(tmp_path / "destino.db", [
+        "CREATE TABLE clientes (id INTEGER PRIMARY KEY, nome VARCHAR(50), antiga TEXT)",
+        "CREATE TABLE legado (id INTEGER PRIMARY KEY)",
+    ])
+    try:
+        entries, reflected = run_comparison(source, target)
+    finally:
+        source.dispose()
+        target.dispose()
+
+    changes = {(e["table"], e["kind"], str(e["name"])): e["change"] for e in entries}
+    assert changes[("clientes", "coluna", "nome")] == CHANGED
+    assert changes[("clientes", "coluna", "email")] == ONLY_SOURCE
+    assert changes[("clientes", "coluna", "antiga")] == ONLY_TARGET
+    assert changes[("clientes", "índice", "ix_clientes_email")] == ONLY_SOURCE
+    assert changes[("pedidos", "tabela", "pedidos")] == ONLY_SOURCE
+    assert changes[("legado", "tabela", "legado")] == ONLY_TARGET
+
+    script = alter_script(entries, reflected, postgresql.dialect())
+    assert "CREATE TABLE pedidos" in script
+    assert "ALTER TABLE clientes ADD email VARCHAR(200)" in script
+    assert "ALTER TABLE clientes ALTER COLUMN nome TYPE VARCHAR(100)" in script
+    assert "ALTER TABLE clientes ALTER COLUMN nome SET NOT NULL" in script
+    assert "CREATE INDEX ix_clientes_email ON clientes (email)" in script
+    assert "FOREIGN KEY(cliente_id) REFERENCES clientes (id)" in script
+    # Remoções com perda de dados saem comentadas
+    assert "-- DROP TABLE legado" in script
+    assert "-- ALTER TABLE clientes DROP COLUMN antiga" in script
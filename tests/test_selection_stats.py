@@ -0,0 +1,42 @@
+from decimal import Decimal
+from PyQt6.QtCore import QLocale, Qt
+from result_model import ResultTableModel
+from result_store import ResultStore
+from selection_stats import SelectionStats, compute_selection_stats, selection_snapshot
+
+
+def test_stats_combine_numeric_kinds():
+    stats = SelectionStats()
+    stats.add("int", [1, 2, 2], 1, 4)
+    stats.add("decimal", [Decimal("0.5")], 0, 1)
+    assert stats.cells == 5
+    assert stats.null_count == 1
+    assert len(stats.distinct) == 3
+    assert stats.total() == Decimal("5.5")
+    assert (stats.minimum, stats.maximum) == (Decimal("0.5"), 2)
+
+
+def test_numeric_extremes_take_priority_over_text():
+    stats = SelectionStats()
+    stats.add("text", ["b", "a"], 0, 2)
+    assert (stats.minimum, stats.maximum) == ("a", "b")
+    stats.add("int", [7, 3], 0, 2)
+    assert (stats.minimum, stats.maximum) == (3, 7)
+
+
+def test_unhashable_values_are_counted_as_distinct():
+    stats = SelectionStats()
+    stats.add("object", [{"a": 1}, {"a": 1}, [1]], 0, 3)
+    assert len(stats.distinct) == 2
+
+
+def test_snapshot_follows_sorted_order_and_ignores_later_rows():
+    model = ResultTableModel()
+    model.set_store(ResultStore.from_rows(["n"], [(i,) for i in range(10)]))
+    model.sort(0, Qt.SortOrder.DescendingOrder)
+    # Duas primeiras linhas exibidas: 9 e 8
+    selection = selection_snapshot(model, [(0, 1, 0, 0)])
+    model.append_rows([(100,)] * 5)
+    summary = list(compute_selection_stats(selection, QLocale.c(), chunk_rows=1))[-1]
+    assert "Contagem: 2" in summary
+    assert "Soma: 17" in summary
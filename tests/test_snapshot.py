@@ -0,0 +1,65 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import pytest
+from result_store import ResultStore
+from snapshot import COMPRESSORS, open_snapshot, save_snapshot
+
+ROWS = [
+    (1, 1.5, "azul", Decimal("10.25"), date(2024, 1, 31), datetime(2024, 1, 31, 12, 30), timedelta(hours=2),
+     b"\x00\x01", True),
+    (2, None, "verde", None, None, None, None, None, False),
+    (3, -2.0, "azul", Decimal("-0.5"), date(2023, 12, 1), datetime(2023, 12, 1, 8), timedelta(0), b"", None),
+    (None, 0.0, "azul", Decimal("7"), date(2020, 2, 29), datetime(2020, 2, 29), timedelta(days=-1, seconds=5),
+     b"\xff" * 300, True),
+]
+NAMES = ["id", "valor", "cor", "preco", "dia", "momento", "duracao", "dados", "ativo"]
+
+
+def save(store, path, compression="zlib"):
+    """Esgota o gerador de gravação e retorna as linhas gravadas"""
+    progress = save_snapshot(store, str(path), compression)
+    while True:
+        try:
+            next(progress)
+        except StopIteration as done:
+            return done.value
+
+
+def all_rows(store):
+    return [store.row(row) for row in range(store.row_count)]
+
+
+@pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+def test_round_trip_keeps_types_and_nulls(tmp_path, compression):
+    store = ResultStore.from_rows(NAMES, ROWS)
+    path = tmp_path / "resultado.asnap"
+    assert save(store, path, compression) == len(ROWS)
+
+    opened = open_snapshot(str(path))
+    assert opened.column_names == NAMES
+    assert [opened.kind(c) for c in range(len(NAMES))] == [store.kind(c) for c in range(len(NAMES))]
+    assert all_rows(opened) == ROWS
+    assert [c.null_count for c in opened.columns] == [c.null_count for c in store.columns]
+
+
+def test_repeated_text_uses_dictionary_encoding(tmp_path):
+    store = ResultStore.from_rows(["cor"], [("azul",), ("verde",), (None,)] * 1000)
+    path = tmp_path / "cores.asnap"
+    save(store, path)
+    opened = open_snapshot(str(path))
+    assert opened.reader.footer["columns"][0]["encoding"] == "dict"
+    assert all_rows(opened) == all_rows(store)
+
+
+def test_mixed_column_comes_back_as_text(tmp_path):
+    store = ResultStore.from_rows(["misto"], [(1,), ({"a": 1},), (None,)])
+    path = tmp_path / "misto.asnap"
+    save(store, path)
+    assert all_rows(open_snapshot(str(path))) == [("1",), ("{'a': 1}",), (None,)]
+
+
+def test_opened_snapshot_is_read_only(tmp_path):
+    path = tmp_path / "vazio.asnap"
+    save(ResultStore.from_rows(["id"], [(1,)]), path)
+    with pytest.raises(TypeError):
+        open_snapshot(str(path)).append_rows([(2,)])
@@ -0,0 +1,115 @@
+import threading
+import uuid
+import pytest
+import spill
+from spill import SpillingStore
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Blocos pequenos para despejar com poucas linhas
+    monkeypatch.setattr(spill, "SPILL_BLOCK_ROWS", 100)
+
+
+def make_rows(count):
+    rows = []
+    for i in range(count):
+        mixed = {"i": i} if i % 3 == 0 else uuid.UUID(int=i) if i % 3 == 1 else i
+        rows.append((i, None if i % 7 == 0 else f"linha {i}", None if i % 5 == 0 else i / 2, mixed))
+    return rows
+
+
+def filled_store(rows, budget=1):
+    store = SpillingStore(["id", "texto", "valor", "misto"], budget)
+    for start in range(0, len(rows), 150):
+        store.append_rows(rows[start:start + 150])
+        store.spill_excess()
+    return store
+
+
+def test_spilled_rows_read_back_unchanged():
+    rows = make_rows(1000)
+    store = filled_store(rows)
+    assert store.spilled_rows > 0
+    assert store.spilled_bytes > 0
+    assert store.row_count == len(rows)
+    assert [store.row(row) for row in range(store.row_count)] == rows
+    # Colunas mistas voltam com os objetos nativos, não como texto
+    assert store.columns[3].get(1) == uuid.UUID(int=1)
+    assert store.columns[3].get(3) == {"i": 3}
+
+
+def test_slices_cross_blocks_and_memory():
+    rows = make_rows(1000)
+    store = filled_store(rows)
+    column = store.columns[0]
+    offset = column.offset
+    assert list(column.values[50:offset + 20]) == list(range(50, offset + 20))
+    assert store.columns[1].nulls[0:10] == bytes(1 if i % 7 == 0 else 0 for i in range(10))
+    values = store.columns[2].values[offset - 1:offset + 2]
+    assert (values[0], values[2]) == ((offset - 1) / 2, (offset + 1) / 2)
+
+
+def test_sorted_rows_with_spilled_blocks():
+    rows = make_rows(600)
+    store = filled_store(rows)
+    assert store.sorted_rows(0, descending=True) == list(range(599, -1, -1))
+
+
+def test_append_only_accounts_memory_until_spill_excess():
+    store = SpillingStore(["id"], 1)
+    store.append_rows([(i,) for i in range(350)])
+    assert store.spilled_rows == 0 and store.needs_spill()
+    assert store.spill_excess() == 3
+    # Fica em memória no máximo um bloco acima do orçamento (despejo em blocos inteiros)
+    assert store.spilled_rows == 300 and not store.needs_spill() and store.over_budget
+
+
+def test_spilling_in_a_thread_while_rows_arrive():
+    rows = make_rows(3000)
+    store = SpillingStore(["id", "texto", "valor", "misto"], 1)
+    stop = threading.Event()
+
+    def spill_loop():
+        while not stop.is_set():
+            store.spill_excess()
+
+    worker = threading.Thread(target=spill_loop)
+    worker.start()
+    try:
+        for start in range(0, len(rows), 50):
+            store.append_rows(rows[start:start + 50])
+            # A interface continua lendo enquanto os blocos são gravados
+            assert store.row(start) == rows[start]
+    finally:
+        stop.set()
+        worker.join()
+    store.spill_excess()
+    assert store.spilled_rows >= 2800
+    assert [store.row(row) for row in range(store.row_count)] == rows
+
+
+def test_within_budget_nothing_is_spilled():
+    store = filled_store(make_rows(300), budget=10 ** 9)
+    assert store.spilled_rows == 0
+    assert store.spill_file is None
+
+
+def test_spilled_rows_are_read_only():
+    store = filled_store(make_rows(300))
+    with pytest.raises(TypeError):
+        store.columns[0].set(0, 1)
+
+
+def test_unpicklable_objects_stay_in_memory():
+    lock = threading.Lock()
+    store = SpillingStore(["misto"], 1)
+    store.append_rows([(lock,), (1,)] * 150)
+    store.spill_excess()
+    column = store.columns[0]
+    assert store.spilled_rows > 0
+    assert column.blocks[0][2] == "memory"
+    # Os blocos mantidos em memória continuam contando no orçamento
+    assert store.kept_bytes > 0 and store.over_budget
+    assert column.get(0) is lock
+    assert column.get(1) == 1
@@ -0,0 +1,36 @@
+from sql_completion import CompletionIndex, PrefixIndex, completion_context, statement_tables
+
+
+def test_prefix_index_is_case_insensitive_and_limited():
+    index = PrefixIndex(["Clientes", "cidades", "Contas", "pedidos", "clientes_log"])
+    assert index.search("cli") == ["Clientes", "clientes_log"]
+    assert index.search("C", limit=2) == ["cidades", "Clientes"]
+    assert index.search("x") == []
+    assert len(index) == 5
+
+
+def test_statement_tables_maps_aliases():
+    scope = statement_tables('SELECT * FROM clientes c, contas JOIN "Pedidos" AS p ON p.id = c.id')
+    assert scope == {"clientes": "clientes", "c": "clientes", "pedidos": "Pedidos", "p": "Pedidos",
+                     "contas": "contas"}
+
+
+def test_completion_context():
+    assert completion_context("SELECT c.no") == ("no", "c", False)
+    assert completion_context("SELECT * FROM cli") == ("cli", None, True)
+    assert completion_context("SELECT * FROM a WHERE x") == ("x", None, False)
+
+
+def test_suggest_uses_tables_of_the_statement():
+    index = CompletionIndex({"clientes": ["id", "nome"], "pedidos": ["id", "numero", "cliente_id"]})
+    statement = "SELECT n FROM pedidos p"
+    suggestions, prefix = index.suggest("SELECT n", statement)
+    assert prefix == "n"
+    assert ("numero", "column") in suggestions
+    assert ("nome", "column") not in suggestions
+
+    suggestions, _ = index.suggest("SELECT p.", "SELECT p. FROM pedidos p")
+    assert [name for name, kind in suggestions] == ["cliente_id", "id", "numero"]
+
+    suggestions, _ = index.suggest("SELECT * FROM pe", "SELECT * FROM pe")
+    assert suggestions == [("pedidos", "table")]
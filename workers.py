@@ -0,0 +1,64 @@
+from types import GeneratorType
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Sinais emitidos pela thread de trabalho para a interface"""
+    progress = pyqtSignal(object)   # Cada item produzido por funções geradoras
+    finished = pyqtSignal(object)   # Valor de retorno da função
+    error = pyqtSignal(object)      # Exceção levantada
+
+
+class Worker(QRunnable):
+    """Executa uma função fora da thread da interface.
+
+    Se a função for geradora, cada item produzido é emitido em `progress`,
+    o cancelamento é verificado entre os itens e o valor do `return` do
+    gerador é emitido em `finished`.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """Solicita o cancelamento; nenhum sinal é emitido depois disso"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+            if isinstance(result, GeneratorType):
+                generator = result
+                while True:
+                    try:
+                        item = next(generator)
+                    except StopIteration as stop:
+                        result = stop.value
+                        break
+                    if self.cancelled:
+                        generator.close()
+                        return
+                    self.signals.progress.emit(item)
+            if not self.cancelled:
+                self.signals.finished.emit(result)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(e)
+
+
+def start_worker(fn, *args, on_finished=None, on_error=None, on_progress=None, pool=None, **kwargs):
+    """Cria e inicia um Worker conectando os callbacks informados"""
+    worker = Worker(fn, *args, **kwargs)
+    if on_finished:
+        worker.signals.finished.connect(on_finished)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    if on_progress:
+        worker.signals.progress.connect(on_progress)
+    (pool or QThreadPool.globalInstance()).start(worker)
+    return worker
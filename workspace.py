@@ -0,0 +1,902 @@
+from collections import OrderedDict, deque
+from datetime import datetime
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QTableView, QMessageBox, QTabWidget, QDialog, QMenu, QFileDialog, QSplitter,
+                             QInputDialog, QSpinBox)
+from PyQt6.QtCore import Qt, QThreadPool, QTimer
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+from connection import ConnectionKeepAlive, is_read_only_sql, run_with_reconnect
+from result_model import ResultTableModel
+from changeset import Changeset, EditableTableModel, ChangesetPreviewDialog
+from column_widths import ColumnWidthEstimator
+from instrumentation import QueryProfiler
+from server_activity import ServerActivityTab
+from lock_tree import LockTreeTab
+from index_advisor import IndexAdvisorDialog
+from table_profile import TableProfilePane
+from data_diff import DataDiffDialog
+from ddl_export import DIALECTS, DIALECT_NAMES, TableDdlDialog, write_schema_ddl
+from workers import start_worker
+from sql_editor import SqlEditor
+from sql_completion import build_completion_index
+from query_params import ParameterPanel, find_parameters, bind_parameters
+from prepared import execute_prepared
+from pivot import PivotDialog
+from result_chart import ChartDialog
+from spill import MEMORY_BUDGET_MB, SpillingStore
+from snapshot import COMPRESSORS, SNAPSHOT_FILTER, open_snapshot, save_snapshot
+from lob_viewer import LobViewerDialog, build_preview_query, build_table, store_from_preview
+
+# Pausa na digitação antes de procurar os parâmetros :nome no editor (ms)
+PARAMETER_SCAN_MS = 300
+# Intervalo padrão de reexecução da consulta fixada (segundos)
+PIN_INTERVAL = 5
+# Linhas do primeiro lote (a grade aparece logo) e dos lotes seguintes
+FIRST_CHUNK_ROWS = 500
+FETCH_CHUNK_ROWS = 10000
+
+
+class Workspace(QWidget):
+    """Área de trabalho de uma conexão: engine, abas de consulta e exploração,
+    cache do esquema e histórico próprios.
+
+    As consultas de cada área rodam numa thread de trabalho exclusiva, então
+    consultas em conexões diferentes executam ao mesmo tempo.
+    """
+
+    def __init__(self, engine, db_type, favorites, crypto, slow_log_path=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.db_type = db_type
+        self.favorites = favorites
+        self.crypto = crypto
+        self.schema_cache = {}  # Tabela -> colunas e chave primária refletidas
+        self.query_history = deque(maxlen=200)  # (SQL, parâmetros) das consultas SELECT da aba de consulta
+        self.query_runs = OrderedDict()  # Consulta já executada -> o resultado coube no orçamento de memória
+        self.current_table = None
+        self.current_lob_columns = {}
+        self.ddl_worker = None
+        self.query_worker = None
+        self.completion_worker = None
+        self.snapshot_worker = None
+        
+        # Tempo por fase de cada consulta desta conexão
+        self.profiler = QueryProfiler(slow_log_path, parent=self)
+        self.profiler.attach(engine)
+        
+        # Uma thread por conexão: consultas desta área ficam em fila, as de outras não esperam
+        self.query_pool = QThreadPool(self)
+        self.query_pool.setMaxThreadCount(1)
+        
+        # Mantém as conexões ociosas vivas atrás de firewalls
+        self.keep_alive = ConnectionKeepAlive(parent=self)
+        self.keep_alive.failed.connect(self.on_keep_alive_failed)
+        self.keep_alive.restored.connect(self.on_keep_alive_restored)
+        self.keep_alive.set_engine(engine)
+        
+        layout = QVBoxLayout(self)
+        self.connection_status = QLabel()
+        layout.addWidget(self.connection_status)
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+        
+        self.setup_query_tab()        # Aba para execução de queries
+        self.setup_explorer_tab()     # Aba para explorar tabelas
+        self.setup_locks_tab()        # Aba da árvore de bloqueios
+        self.setup_activity_tab()     # Aba de atividade do servidor
+        self.on_keep_alive_restored()
+
+    @property
+    def title(self):
+        """Nome da conexão exibido na aba"""
+        return f"{self.db_type} - {self.engine.url.database}"
+
+    def close_workspace(self):
+        """Libera a conexão (pergunta antes se houver alterações pendentes)"""
+        if not self.confirm_discard_changes():
+            return False
+        self.pin_timer.stop()
+        for worker in (self.query_worker, self.ddl_worker, self.completion_worker, self.snapshot_worker):
+            if worker is not None:
+                worker.cancel()
+        self.keep_alive.set_engine(None)
+        self.locks_tab.set_engine(None)
+        self.activity_tab.set_engine(None)
+        self.profiler.detach(self.engine)
+        self.engine.dispose()
+        return True
+
+    def on_keep_alive_failed(self, error):
+        """Conexão inativa: o pool reconecta sozinho na próxima consulta"""
+        self.connection_status.setText(f"Conexão inativa (será refeita na próxima consulta): {str(error)}")
+        self.connection_status.setStyleSheet("color: orange;")
+
+    def on_keep_alive_restored(self):
+        self.connection_status.setText(f"Conectado a {self.title}")
+        self.connection_status.setStyleSheet("color: green;")
+
+    #######################################################################
+    # SEÇÃO: ABA DE CONSULTA SQL
+    #######################################################################
+    
+    def setup_query_tab(self):
+        """Configura a aba para execução de consultas SQL"""
+        query_tab = QWidget()
+        layout = QVBoxLayout(query_tab)
+        
+        # Editor de texto para escrever queries
+        self.sql_editor = SqlEditor(placeholderText="Digite sua consulta SQL aqui...")
+        self.sql_editor.set_dialect(self.engine.dialect)
+        layout.addWidget(self.sql_editor)
+        
+        # Campos tipados dos parâmetros :nome (atualizados após uma pausa na digitação)
+        self.param_panel = ParameterPanel()
+        layout.addWidget(self.param_panel)
+        self.param_timer = QTimer(self, singleShot=True, interval=PARAMETER_SCAN_MS)
+        self.param_timer.timeout.connect(self.update_parameters)
+        self.sql_editor.textChanged.connect(self.param_timer.start)
+        
+        # Botões para executar a consulta e exportar os tempos medidos
+        btn_layout = QHBoxLayout()
+        self.execute_btn = QPushButton("Executar Consulta")
+        self.execute_btn.clicked.connect(self.execute_query)
+        btn_layout.addWidget(self.execute_btn, 1)
+        
+        # Consulta fixada: reexecutada periodicamente, com a grade atualizada por diferença
+        self.pin_btn = QPushButton("Fixar")
+        self.pin_btn.setCheckable(True)
+        self.pin_btn.setToolTip("Reexecuta a consulta atual a cada intervalo")
+        self.pin_btn.toggled.connect(self.toggle_pinned_query)
+        btn_layout.addWidget(self.pin_btn)
+        self.pin_interval = QSpinBox(minimum=1, maximum=3600, value=PIN_INTERVAL, suffix=" s")
+        self.pin_interval.valueChanged.connect(lambda value: self.pin_timer.setInterval(value * 1000))
+        btn_layout.addWidget(self.pin_interval)
+        self.pin_timer = QTimer(self)
+        self.pin_timer.timeout.connect(self.refresh_pinned_query)
+        self.pinned_query = None
+        
+        # Acima do orçamento, as linhas mais antigas do resultado vão para disco
+        btn_layout.addWidget(QLabel("Memória:"))
+        self.memory_budget = QSpinBox(minimum=16, maximum=1024 * 1024, value=MEMORY_BUDGET_MB, suffix=" MB")
+        self.memory_budget.setToolTip("Memória máxima do resultado; o excedente é guardado num arquivo temporário")
+        btn_layout.addWidget(self.memory_budget)
+        
+        export_trace_btn = QPushButton("Exportar Trace")
+        export_trace_btn.clicked.connect(self.export_trace)
+        btn_layout.addWidget(export_trace_btn)
+        
+        advisor_btn = QPushButton("Sugerir Índices")
+        advisor_btn.clicked.connect(self.show_index_advisor)
+        btn_layout.addWidget(advisor_btn)
+        
+        save_result_btn = QPushButton("Salvar Resultado")
+        save_result_btn.clicked.connect(self.save_result)
+        btn_layout.addWidget(save_result_btn)
+        
+        open_result_btn = QPushButton("Abrir Resultado")
+        open_result_btn.clicked.connect(self.open_result)
+        btn_layout.addWidget(open_result_btn)
+        
+        pivot_btn = QPushButton("Agrupar / Pivô")
+        pivot_btn.clicked.connect(self.show_pivot)
+        btn_layout.addWidget(pivot_btn)
+        
+        chart_btn = QPushButton("Gráfico")
+        chart_btn.clicked.connect(self.show_chart)
+        btn_layout.addWidget(chart_btn)
+        layout.addLayout(btn_layout)
+        
+        # Tabela para exibir resultados (valores nativos, formatados na exibição)
+        self.results_model = ResultTableModel(self)
+        self.results_query = None  # (SQL, parâmetros) do resultado exibido; None se aberto de arquivo
+        self.loading_store = None  # Resultado recebendo os lotes da consulta em andamento
+        self.spill_worker = None  # Despejo em disco em andamento (um por vez)
+        self.result_status = ""  # Linha de status do resultado exibido, sem a parte do despejo
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.results_table.setSortingEnabled(True)
+        self.results_widths = ColumnWidthEstimator(self.results_table)
+        layout.addWidget(self.results_table)
+        
+        # Label para status da consulta
+        self.query_status = QLabel("")
+        layout.addWidget(self.query_status)
+        
+        self.tabs.addTab(query_tab, "Consulta SQL")
+
+    def execute_query(self):
+        """Executa a consulta SQL numa thread de trabalho e exibe os resultados"""
+        if self.query_worker is not None:
+            QMessageBox.information(self, "Aviso", "Já existe uma consulta em execução nesta conexão.")
+            return
+        
+        prepared = self.editor_query()
+        if prepared is not None:
+            self.start_query(*prepared)
+
+    def editor_query(self):
+        """Consulta do editor e valores dos parâmetros, ou None (com aviso) se inválidos"""
+        query = self.sql_editor.toPlainText().strip()
+        
+        # Verifica se o usuário digitou algo
+        if not query:
+            QMessageBox.warning(self, "Aviso", "Digite uma consulta SQL!")
+            return None
+        
+        # Valores ligados como parâmetros: o servidor reaproveita o plano entre execuções
+        self.param_panel.set_names(find_parameters(query))
+        try:
+            return query, self.param_panel.values()
+        except ValueError as e:
+            QMessageBox.warning(self, "Parâmetro inválido", str(e))
+            return None
+
+    def start_query(self, query, values, refresh=False):
+        # Cada fase (pool, servidor, rede, conversão, interface) é cronometrada
+        trace = self.profiler.begin(query)
+        self.execute_btn.setEnabled(False)
+        if not refresh:
+            self.query_status.setText("Executando...")
+        self.loading_store = None
+        self.result_status = ""
+        self.query_worker = start_worker(
+            self.fetch_query, query, values, trace, self.query_runs.get(query), pool=self.query_pool,
+            on_progress=lambda chunk: self.show_query_rows(query, trace, *chunk, refresh=refresh),
+            on_finished=lambda reconnected: self.show_query_result(query, values, trace, reconnected, refresh=refresh),
+            on_error=lambda error: self.show_query_error(trace, error, refresh=refresh))
+
+    def toggle_pinned_query(self, checked):
+        """Fixa a consulta atual (só leitura) para reexecução periódica"""
+        if not checked:
+            self.pin_timer.stop()
+            self.pinned_query = None
+            return
+        prepared = self.editor_query()
+        if prepared is not None and not is_read_only_sql(prepared[0]):
+            QMessageBox.warning(self, "Aviso", "Só consultas de leitura podem ser fixadas.")
+            prepared = None
+        if prepared is None:
+            self.pin_btn.blockSignals(True)
+            self.pin_btn.setChecked(False)
+            self.pin_btn.blockSignals(False)
+            return
+        self.pinned_query = prepared
+        self.pin_timer.start(self.pin_interval.value() * 1000)
+        if self.query_worker is None:
+            self.start_query(*prepared)
+
+    def refresh_pinned_query(self):
+        # Uma leitura por vez: se a anterior não terminou, espera o próximo ciclo
+        if self.pinned_query is not None and self.query_worker is None:
+            self.start_query(*self.pinned_query, refresh=True)
+
+    def update_parameters(self):
+        self.param_panel.set_names(find_parameters(self.sql_editor.toPlainText()))
+
+    def fetch_query(self, query, values, trace, fits_in_memory=None):
+        """Executa a consulta (thread de trabalho) e lê as linhas em lotes.
+
+        Gerador: produz (colunas, linhas) por lote, o primeiro pequeno para a
+        grade aparecer logo (nada é produzido para comandos que não são
+        SELECT); retorna se reconectou. fits_in_memory é None na primeira
+        execução do comando e, nas repetições, se a anterior coube no
+        orçamento de memória.
+        """
+        statement = bind_parameters(query, values)
+        selecting = query.lower().startswith("select")
+        with self.profiler.bind(trace):
+            def run():
+                with trace.span("checkout"):
+                    conn = self.engine.connect()
+                result = None
+                try:
+                    # Só execuções repetidas reaproveitam o statement preparado da conexão
+                    if fits_in_memory is not None:
+                        result = execute_prepared(conn, query, values, fits_in_memory)
+                    if result is None and selecting:
+                        # Cursor no servidor: as linhas chegam conforme os lotes são lidos
+                        result = conn.execute(statement.execution_options(stream_results=True))
+                    elif result is None:
+                        result = conn.execute(statement)
+                    
+                    # Processa resultados para consultas SELECT
+                    if not selecting:
+                        conn.close()
+                        return None
+                    with trace.span("fetch"):
+                        return conn, result, result.fetchmany(FIRST_CHUNK_ROWS)
+                except BaseException:
+                    if result is not None:
+                        result.close()
+                    conn.close()
+                    raise
+            
+            # Consultas somente leitura são repetidas se a conexão caiu enquanto ociosa
+            opened, reconnected = run_with_reconnect(run, retry=is_read_only_sql(query))
+            if opened is None:
+                return reconnected
+            
+            conn, result, rows = opened
+            # Fechar o resultado descarta as linhas não lidas (consulta cancelada)
+            with conn, result:
+                columns = list(result.keys())
+                yield columns, rows
+                while rows:
+                    with trace.span("fetch"):
+                        rows = result.fetchmany(FETCH_CHUNK_ROWS)
+                    if rows:
+                        yield columns, rows
+            return reconnected
+
+    def show_query_rows(self, query, trace, columns, rows, refresh=False):
+        """Recebe um lote da consulta: o primeiro já aparece na grade e os
+        seguintes entram no fim (a interface continua respondendo entre eles)"""
+        if self.loading_store is None:
+            # Guarda os valores nativos (a formatação ocorre só na exibição), dentro do orçamento de memória
+            with trace.span("convert"):
+                self.loading_store = SpillingStore(columns, self.memory_budget.value() * 1024 * 1024)
+                self.loading_store.append_rows(rows)
+            if not refresh:
+                with trace.span("populate"):
+                    self.results_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+                    self.results_model.set_store(self.loading_store)
+                    self.results_widths.fit(query)
+        elif refresh:
+            # A consulta fixada só troca a grade quando terminar de ler
+            with trace.span("convert"):
+                self.loading_store.append_rows(rows)
+        else:
+            with trace.span("populate"):
+                self.results_model.append_rows(rows)
+            self.query_status.setText(f"{self.loading_store.row_count} linhas carregadas...{self.spill_status()}")
+        self.spill_excess(self.loading_store)
+
+    def show_query_result(self, query, values, trace, reconnected, refresh=False):
+        self.query_worker = None
+        self.execute_btn.setEnabled(True)
+        store, self.loading_store = self.loading_store, None
+        if store is not None:
+            self.remember_query_run(query, store)
+        if store is not None and refresh:
+            # Reexecução da consulta fixada: só o que mudou chega à grade
+            with trace.span("populate"):
+                self.results_model.update_store(store)
+            trace.row_count = store.row_count
+        elif store is not None:
+            # Linhas que chegaram depois de ordenar entram na ordem
+            sort_column, sort_order = self.results_model.sort_key
+            if sort_column >= 0:
+                with trace.span("populate"):
+                    self.results_model.sort(sort_column, sort_order)
+            self.results_query = (query, values)
+            trace.row_count = store.row_count
+            
+            # Guarda no histórico usado pelo assistente de índices
+            for entry in [e for e in self.query_history if e[0] == query]:
+                self.query_history.remove(entry)
+            self.query_history.append((query, values))
+        self.profiler.finish(trace)
+        
+        suffix = " (reconectado)" if reconnected else ""
+        if refresh:
+            self.result_status = (f"{trace.row_count} linhas — atualizado às {datetime.now():%H:%M:%S} "
+                                  f"— {trace.summary()}{suffix}")
+            self.query_status.setText(self.result_status + self.spill_status())
+        elif trace.row_count is not None:
+            self.result_status = f"{trace.row_count} linhas retornadas — {trace.summary()}{suffix}"
+            self.query_status.setText(self.result_status + self.spill_status())
+        else:
+            # Para outros tipos de comando (INSERT, UPDATE, etc)
+            self.query_status.setText(f"Comando executado com sucesso — {trace.summary()}{suffix}")
+
+    def remember_query_run(self, query, store):
+        """Marca a consulta como repetida (próximas execuções podem ser preparadas)
+        e se o resultado coube no orçamento de memória"""
+        self.query_runs.pop(query, None)
+        self.query_runs[query] = not store.spilled_rows and not store.over_budget
+        while len(self.query_runs) > self.query_history.maxlen:
+            self.query_runs.popitem(last=False)
+
+    def spill_excess(self, store):
+        """Despeja o que passou do orçamento numa thread de trabalho (um despejo por vez)"""
+        if self.spill_worker is not None or not store.needs_spill():
+            return
+        self.spill_worker = start_worker(store.spill_excess,
+                                         on_finished=lambda _: self.spill_finished(store),
+                                         on_error=lambda _: self.spill_finished(store))
+
+    def spill_finished(self, store):
+        self.spill_worker = None
+        # Lotes que chegaram durante o despejo (deste resultado ou do seguinte)
+        for current in (self.loading_store, self.results_model.store):
+            if isinstance(current, SpillingStore):
+                self.spill_excess(current)
+        if store is self.results_model.store and self.loading_store is None and self.result_status:
+            self.query_status.setText(self.result_status + self.spill_status())
+
+    def spill_status(self):
+        """Parte da linha de status sobre as linhas guardadas em disco"""
+        store = self.loading_store or self.results_model.store
+        if not isinstance(store, SpillingStore):
+            return ""
+        parts = []
+        if store.spilled_rows:
+            parts.append(f"{store.spilled_rows} em disco, {store.spilled_bytes / 1024 / 1024:.0f} MB")
+        if store.kept_bytes:
+            parts.append(f"{store.kept_bytes / 1024 / 1024:.0f} MB não serializáveis mantidos em memória")
+        if store.spill_error is not None:
+            parts.append(f"falha ao gravar em disco: {store.spill_error}")
+        elif store.over_budget and self.spill_worker is None:
+            parts.append("acima do orçamento de memória")
+        return f" ({'; '.join(parts)})" if parts else ""
+
+    def show_query_error(self, trace, error, refresh=False):
+        # Tratamento de erros na consulta
+        self.query_worker = None
+        self.loading_store = None
+        self.execute_btn.setEnabled(True)
+        self.profiler.finish(trace)
+        self.query_status.setText(f"Erro na consulta: {str(error)}")
+        if refresh or self.pin_btn.isChecked():
+            # A consulta fixada para de ser reexecutada até ser fixada de novo
+            self.pin_btn.setChecked(False)
+            return
+        QMessageBox.critical(self, "Erro na Consulta", f"Erro ao executar a consulta:\n{str(error)}")
+
+    def show_index_advisor(self):
+        """Analisa os planos das consultas do histórico e sugere índices"""
+        if not self.query_history:
+            QMessageBox.information(self, "Sugestão de Índices", "Execute algumas consultas SELECT primeiro.")
+            return
+        dialog = IndexAdvisorDialog(self.engine, list(self.query_history), self)
+        dialog.exec()
+
+    def export_trace(self):
+        """Exporta os tempos das consultas no formato de trace do Chrome"""
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar Trace", "trace.json", "Trace JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.profiler.export_chrome_trace(path)
+            self.query_status.setText(f"Trace exportado para {path} (abra em chrome://tracing ou Perfetto)")
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível exportar o trace:\n{str(e)}")
+
+    def save_result(self):
+        """Grava o resultado exibido num arquivo colunar compacto, em segundo plano"""
+        store = self.results_model.store
+        if store is None or not store.column_count:
+            QMessageBox.information(self, "Salvar Resultado", "Não há resultado para salvar.")
+            return
+        if self.snapshot_worker is not None:
+            QMessageBox.information(self, "Salvar Resultado", "Já existe um resultado sendo salvo.")
+            return
+        names = list(COMPRESSORS)
+        compression, ok = QInputDialog.getItem(self, "Salvar Resultado", "Compressão:", names, names.index("zlib"), False)
+        if not ok:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar Resultado", "resultado.asnap", SNAPSHOT_FILTER)
+        if not path:
+            return
+        
+        def finished(row_count):
+            self.snapshot_worker = None
+            self.query_status.setText(f"Resultado salvo em {path} ({row_count} linhas)")
+        
+        def failed(error):
+            self.snapshot_worker = None
+            QMessageBox.critical(self, "Erro", f"Não foi possível salvar o resultado:\n{str(error)}")
+        
+        self.snapshot_worker = start_worker(
+            save_snapshot, store, path, compression,
+            on_progress=lambda progress: self.query_status.setText(f"Salvando resultado: {progress[0]}/{progress[1]} colunas"),
+            on_finished=finished, on_error=failed)
+
+    def open_result(self):
+        """Abre um resultado salvo; o arquivo é mapeado em memória e lido conforme exibido"""
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir Resultado", "", SNAPSHOT_FILTER)
+        if not path:
+            return
+        try:
+            store = open_snapshot(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível abrir o resultado:\n{str(e)}")
+            return
+        # O resultado do arquivo não deve ser sobrescrito pela consulta fixada
+        self.pin_btn.setChecked(False)
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.results_model.set_store(store)
+        self.results_query = None
+        self.results_widths.fit(path)
+        self.query_status.setText(f"{store.row_count} linhas abertas de {path}")
+
+    def show_pivot(self):
+        """Agrupa o resultado carregado (contagem, soma, média...) sem reexecutar a consulta"""
+        store = self.results_model.store
+        if store is None or not store.row_count:
+            QMessageBox.information(self, "Agrupar / Pivô", "Execute uma consulta SELECT primeiro.")
+            return
+        dialog = PivotDialog(store, self)
+        dialog.exec()
+
+    def show_chart(self):
+        """Gráfico das colunas do resultado, reduzido a alguns milhares de pontos"""
+        store = self.results_model.store
+        if store is None or not store.row_count:
+            QMessageBox.information(self, "Gráfico", "Execute uma consulta SELECT primeiro.")
+            return
+        dialog = ChartDialog(store, self.engine, self.results_query, self)
+        dialog.exec()
+
+    #######################################################################
+    # SEÇÃO: ABA DE EXPLORAÇÃO DE TABELAS
+    #######################################################################
+    
+    def setup_explorer_tab(self):
+        """Configura a aba para explorar tabelas do banco"""
+        explorer_tab = QWidget()
+        layout = QVBoxLayout(explorer_tab)
+        
+        # Layout superior com combobox e botão de atualização
+        top_layout = QHBoxLayout()
+        
+        self.tables_list = QComboBox()
+        self.tables_list.currentTextChanged.connect(self.load_table_data)
+        top_layout.addWidget(QLabel("Tabelas:"))
+        top_layout.addWidget(self.tables_list, 1)  # Stretch factor 1
+        
+        refresh_btn = QPushButton("Atualizar")
+        refresh_btn.clicked.connect(self.load_tables_list)
+        top_layout.addWidget(refresh_btn)
+        
+        profile_btn = QPushButton("Perfil")
+        profile_btn.clicked.connect(self.show_table_profile)
+        top_layout.addWidget(profile_btn)
+        
+        data_diff_btn = QPushButton("Comparar Dados")
+        data_diff_btn.clicked.connect(self.show_data_diff)
+        top_layout.addWidget(data_diff_btn)
+        
+        ddl_btn = QPushButton("Gerar DDL")
+        ddl_menu = QMenu(ddl_btn)
+        ddl_menu.addAction("Tabela como CREATE", self.show_table_ddl)
+        ddl_menu.addAction("Banco como CREATE...", self.export_schema_ddl)
+        ddl_btn.setMenu(ddl_menu)
+        top_layout.addWidget(ddl_btn)
+        
+        layout.addLayout(top_layout)
+        
+        # Modo de edição: alterações ficam pendentes até serem salvas
+        edit_layout = QHBoxLayout()
+        self.edit_toggle = QPushButton("Editar")
+        self.edit_toggle.setCheckable(True)
+        self.edit_toggle.toggled.connect(self.toggle_table_editing)
+        edit_layout.addWidget(self.edit_toggle)
+        
+        self.add_row_btn = QPushButton("Nova Linha")
+        self.add_row_btn.clicked.connect(self.add_table_row)
+        edit_layout.addWidget(self.add_row_btn)
+        
+        self.delete_rows_btn = QPushButton("Excluir Linhas")
+        self.delete_rows_btn.clicked.connect(self.delete_table_rows)
+        edit_layout.addWidget(self.delete_rows_btn)
+        
+        self.save_changes_btn = QPushButton("Salvar Alterações")
+        self.save_changes_btn.clicked.connect(self.save_table_changes)
+        edit_layout.addWidget(self.save_changes_btn)
+        
+        self.discard_changes_btn = QPushButton("Descartar")
+        self.discard_changes_btn.clicked.connect(self.discard_table_changes)
+        edit_layout.addWidget(self.discard_changes_btn)
+        
+        self.pending_label = QLabel("")
+        edit_layout.addWidget(self.pending_label, 1)
+        layout.addLayout(edit_layout)
+        
+        # Tabela para exibir os dados
+        self.table_model = EditableTableModel(self)
+        self.table_model.changed.connect(self.update_edit_buttons)
+        self.table_model.edit_error.connect(lambda message: self.window().statusBar().showMessage(message, 5000))
+        self.table_data = QTableView()
+        self.table_data.setModel(self.table_model)
+        self.table_data.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table_data.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table_data.setSortingEnabled(True)
+        self.table_data.doubleClicked.connect(self.open_table_cell)
+        self.table_widths = ColumnWidthEstimator(self.table_data)
+        
+        # Painel de perfil das colunas ao lado dos dados (oculto até ser pedido)
+        self.table_profile = TableProfilePane()
+        self.table_profile.hide()
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.table_data)
+        splitter.addWidget(self.table_profile)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter, 1)  # Stretch factor 1
+        self.update_edit_buttons()
+        
+        self.tabs.addTab(explorer_tab, "Explorar")
+
+    def load_tables_list(self):
+        """Carrega a lista de tabelas do banco conectado"""
+        try:
+            inspector = inspect(self.engine)
+            tables = inspector.get_table_names()
+            self.schema_cache.clear()  # Atualizar também descarta a reflexão anterior
+            
+            # Atualiza o combobox de tabelas
+            self.tables_list.blockSignals(True)  # Evita eventos durante atualização
+            self.tables_list.clear()
+            
+            if not tables:
+                self.tables_list.addItem("Nenhuma tabela encontrada")
+            else:
+                self.tables_list.addItems(tables)
+                if tables:
+                    self.load_table_data(tables[0])  # Carrega dados da primeira tabela
+            
+            self.tables_list.blockSignals(False)
+            self.load_completions(tables)
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Falha ao carregar tabelas:\n{str(e)}")
+            self.tables_list.clear()
+            self.tables_list.addItem("Erro ao carregar tabelas")
+
+    def load_completions(self, tables):
+        """Lê as colunas do catálogo em segundo plano e monta o índice do autocompletar"""
+        if self.completion_worker is not None:
+            self.completion_worker.cancel()
+        
+        def finished(index):
+            self.completion_worker = None
+            self.sql_editor.set_index(index)
+        
+        def failed(error):
+            self.completion_worker = None
+            self.window().statusBar().showMessage(f"Autocompletar sem colunas: {str(error)}", 10000)
+        
+        self.completion_worker = start_worker(build_completion_index, self.engine, tables,
+                                              on_finished=finished, on_error=failed)
+
+    def load_table_data(self, table_name):
+        """Carrega os dados de uma tabela específica"""
+        # Verifica se há uma tabela válida selecionada
+        if (not table_name or 
+            table_name in ["Nenhuma tabela encontrada", "Erro ao carregar tabelas"]):
+            self.table_model.set_store(None)
+            return
+        
+        if not self.confirm_discard_changes():
+            # Mantém a tabela com alterações pendentes selecionada
+            self.tables_list.blockSignals(True)
+            self.tables_list.setCurrentText(self.current_table.name)
+            self.tables_list.blockSignals(False)
+            return
+        
+        try:
+            info = self.get_table_info(table_name)
+            table = build_table(table_name, info["columns"], info["primary_key"])
+            
+            # Limita a 100 registros; colunas LOB vêm truncadas com o tamanho total
+            query, lob_columns = build_preview_query(self.engine.dialect.name, table, info["columns"], 100)
+            with self.profiler.trace(f"Explorar {table_name}") as trace:
+                with trace.span("checkout"):
+                    conn = self.engine.connect()
+                with conn:
+                    result = conn.execute(query)
+                    with trace.span("fetch"):
+                        rows = result.fetchall()
+                
+                columns = [c["name"] for c in info["columns"]]
+                self.current_table = table
+                self.current_lob_columns = dict(lob_columns)
+                
+                # Preenche o modelo com os valores nativos (somente leitura)
+                with trace.span("convert"):
+                    store = store_from_preview(columns, rows, lob_columns)
+                with trace.span("populate"):
+                    self.table_data.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+                    self.table_model.set_store(store)
+                    if self.edit_toggle.isChecked():
+                        self.start_table_editing()
+                    
+                    # Ajusta o tamanho das colunas por amostragem (larguras em cache por tabela)
+                    self.table_widths.fit(table_name, [c["type"] for c in info["columns"]])
+                trace.row_count = len(rows)
+            self.window().statusBar().showMessage(f"{table_name}: {len(rows)} linhas — {trace.summary()}", 10000)
+            if self.table_profile.isVisible():
+                self.show_table_profile()  # Mantém o perfil da tabela selecionada
+                
+        except SQLAlchemyError as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao carregar dados da tabela {table_name}:\n{str(e)}")
+            self.table_model.set_store(None)
+
+    def toggle_table_editing(self, checked):
+        """Liga/desliga o modo de edição da tabela exibida"""
+        if checked:
+            self.start_table_editing()
+        elif self.confirm_discard_changes():
+            self.table_model.stop_editing()
+            self.table_data.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+            self.table_data.setSortingEnabled(True)
+        else:
+            self.edit_toggle.blockSignals(True)
+            self.edit_toggle.setChecked(True)
+            self.edit_toggle.blockSignals(False)
+
+    def start_table_editing(self):
+        """Entra no modo de edição (exige chave primária para identificar as linhas)"""
+        if self.current_table is None or self.table_model.store is None:
+            self.edit_toggle.setChecked(False)
+            return
+        info = self.get_table_info(self.current_table.name)
+        if not info["primary_key"]:
+            QMessageBox.warning(self, "Aviso", "A tabela não possui chave primária: não é possível editá-la.")
+            self.edit_toggle.setChecked(False)
+            return
+        
+        # Ordenação desligada para as linhas novas ficarem no fim
+        self.table_data.setSortingEnabled(False)
+        self.table_data.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table_model.sort(-1)
+        
+        # Células LOB truncadas na pré-visualização ficam somente leitura
+        changeset = Changeset(self.current_table, info["primary_key"])
+        self.table_model.start_editing(changeset, info["columns"])
+        self.table_data.setEditTriggers(QTableView.EditTrigger.DoubleClicked |
+                                        QTableView.EditTrigger.EditKeyPressed |
+                                        QTableView.EditTrigger.AnyKeyPressed)
+
+    def update_edit_buttons(self):
+        """Habilita os botões de edição e mostra o total de alterações pendentes"""
+        changeset = self.table_model.changeset
+        editing = changeset is not None
+        for button in (self.add_row_btn, self.delete_rows_btn):
+            button.setEnabled(editing)
+        for button in (self.save_changes_btn, self.discard_changes_btn):
+            button.setEnabled(editing and len(changeset) > 0)
+        self.pending_label.setText(f"{len(changeset)} alterações pendentes" if editing and len(changeset) else "")
+
+    def confirm_discard_changes(self):
+        """Pergunta antes de descartar alterações pendentes"""
+        changeset = self.table_model.changeset
+        if changeset is None or not len(changeset):
+            return True
+        answer = QMessageBox.question(self, "Alterações pendentes",
+                                      f"Descartar {len(changeset)} alterações não salvas?")
+        return answer == QMessageBox.StandardButton.Yes
+
+    def add_table_row(self):
+        row = self.table_model.insert_row()
+        self.table_data.scrollToBottom()
+        self.table_data.setCurrentIndex(self.table_model.index(row, 0))
+
+    def delete_table_rows(self):
+        rows = [index.row() for index in self.table_data.selectionModel().selectedIndexes()]
+        if rows:
+            self.table_model.delete_rows(rows)
+
+    def discard_table_changes(self):
+        if self.confirm_discard_changes():
+            self.start_table_editing()
+
+    def save_table_changes(self):
+        """Mostra o SQL gerado e grava as alterações numa única transação"""
+        changeset = self.table_model.changeset
+        if changeset is None or not len(changeset):
+            return
+        dialog = ChangesetPreviewDialog(changeset.preview(self.engine.dialect), len(changeset), self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        try:
+            with self.profiler.trace(f"Salvar alterações em {self.current_table.name}"):
+                changeset.apply(self.engine)
+        except (SQLAlchemyError, ValueError) as e:
+            QMessageBox.critical(self, "Erro", f"Nenhuma alteração foi gravada:\n{str(e)}")
+            return
+        self.window().statusBar().showMessage(f"{len(changeset)} alterações gravadas", 5000)
+        self.table_model.changeset = None  # Já gravadas: recarrega sem perguntar
+        self.load_table_data(self.current_table.name)
+
+    def get_table_info(self, table_name):
+        """Retorna colunas e chave primária da tabela, refletindo só na primeira vez"""
+        if table_name not in self.schema_cache:
+            inspector = inspect(self.engine)
+            self.schema_cache[table_name] = {
+                "columns": inspector.get_columns(table_name),
+                "primary_key": inspector.get_pk_constraint(table_name).get("constrained_columns") or [],
+            }
+        return self.schema_cache[table_name]
+
+    def show_table_profile(self):
+        """Abre o perfil das colunas da tabela selecionada"""
+        if self.current_table is None:
+            QMessageBox.warning(self, "Aviso", "Selecione uma tabela primeiro!")
+            return
+        table_name = self.current_table.name
+        self.table_profile.load(self.engine, table_name, self.get_table_info(table_name)["columns"])
+
+    def show_data_diff(self):
+        """Compara os dados da tabela selecionada com a mesma tabela de um favorito"""
+        if self.current_table is None:
+            QMessageBox.warning(self, "Aviso", "Selecione uma tabela primeiro!")
+            return
+        dialog = DataDiffDialog(self.engine, self.current_table.name, self.favorites, self.crypto, self)
+        dialog.exec()
+
+    def show_table_ddl(self):
+        """Mostra o script CREATE da tabela selecionada"""
+        if self.current_table is None:
+            QMessageBox.warning(self, "Aviso", "Selecione uma tabela primeiro!")
+            return
+        dialog = TableDdlDialog(self.engine, self.current_table.name, self)
+        dialog.exec()
+
+    def export_schema_ddl(self):
+        """Grava o DDL de todas as tabelas num arquivo, em segundo plano"""
+        if self.ddl_worker is not None:
+            QMessageBox.information(self, "Gerar DDL", "Já existe uma exportação em andamento.")
+            return
+        names = list(DIALECTS)
+        current = names.index(DIALECT_NAMES.get(self.engine.dialect.name, names[0]))
+        dialect_name, ok = QInputDialog.getItem(self, "Gerar DDL", "Dialeto:", names, current, False)
+        if not ok:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar DDL", "schema.sql", "SQL (*.sql)")
+        if not path:
+            return
+        
+        def finished(written):
+            self.ddl_worker = None
+            self.window().statusBar().showMessage(f"DDL de {written} tabelas salvo em {path}", 10000)
+        
+        def failed(error):
+            self.ddl_worker = None
+            QMessageBox.critical(self, "Erro", f"Falha ao gerar o DDL:\n{str(error)}")
+        
+        self.ddl_worker = start_worker(
+            write_schema_ddl, self.engine, path, DIALECTS[dialect_name](),
+            on_progress=lambda progress: self.window().statusBar().showMessage(f"Gerando DDL: {progress[0]}/{progress[1]} tabelas"),
+            on_finished=finished, on_error=failed)
+
+    def open_table_cell(self, index):
+        """Abre o valor completo de uma célula LOB, lido sob demanda"""
+        kind = self.current_lob_columns.get(index.column())
+        if kind is None or self.table_model.is_inserted(index.row()) or self.table_model.native_value(index.row(), index.column()) is None:
+            return
+        
+        primary_key = [c.name for c in self.current_table.primary_key.columns]
+        if not primary_key:
+            QMessageBox.warning(self, "Aviso", "A tabela não possui chave primária: não é possível carregar o valor completo.")
+            return
+        
+        # Identifica a linha pelos valores da chave primária
+        names = self.table_model.store.column_names
+        key = {name: self.table_model.native_value(index.row(), names.index(name)) for name in primary_key}
+        column_name = names[index.column()]
+        dialog = LobViewerDialog(self.engine, self.current_table, column_name, kind, key, self)
+        dialog.exec()
+
+    #######################################################################
+    # SEÇÃO: ABA DE BLOQUEIOS
+    #######################################################################
+    
+    def setup_locks_tab(self):
+        """Configura a aba com a árvore de sessões bloqueadas/bloqueadoras"""
+        self.locks_tab = LockTreeTab()
+        self.locks_tab.set_engine(self.engine)
+        self.tabs.addTab(self.locks_tab, "Bloqueios")
+
+    #######################################################################
+    # SEÇÃO: ABA DE ATIVIDADE DO SERVIDOR
+    #######################################################################
+    
+    def setup_activity_tab(self):
+        """Configura a aba de sessões ativas e consultas lentas"""
+        self.activity_tab = ServerActivityTab(self.profiler)
+        self.activity_tab.set_engine(self.engine)
+        self.tabs.addTab(self.activity_tab, "Atividade do Servidor")